@@ -4,12 +4,15 @@ Core agent definitions for the Laravel HR system
 """
 
 from crewai import Agent
-from langchain_openai import ChatOpenAI
 from typing import List, Dict, Any
 import logging
+import threading
 
 from config.agent_config import config, AGENT_ROLES
 from tools.agent_tools import AGENT_TOOLS
+from tools.query_registry import get_query
+from tools.lazy_registry import LazyRegistry
+from src.executors import cpu_bound
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, config.agent_log_level))
@@ -19,12 +22,24 @@ class BaseAgentFactory:
     """Base factory class for creating agents"""
     
     def __init__(self, llm_model: str = None):
-        self.llm = ChatOpenAI(
-            model=llm_model or config.default_llm_model,
-            temperature=config.temperature,
-            max_tokens=config.max_tokens,
-            api_key=config.openai_api_key
-        )
+        self.llm_model = llm_model or config.default_llm_model
+        self._llm = None
+        self._llm_lock = threading.Lock()
+    
+    @property
+    def llm(self):
+        """Shared chat model, created when the first agent is built"""
+        if self._llm is None:
+            with self._llm_lock:
+                if self._llm is None:
+                    from langchain_openai import ChatOpenAI
+                    self._llm = ChatOpenAI(
+                        model=self.llm_model,
+                        temperature=config.temperature,
+                        max_tokens=config.max_tokens,
+                        api_key=config.openai_api_key
+                    )
+        return self._llm
     
     def create_agent(self, agent_type: str, tools: List = None) -> Agent:
         """Create an agent with specified type and tools"""
@@ -123,9 +138,8 @@ class HRManagementAgent:
         """Process employee leave request with automated approval workflow"""
         try:
             # Get employee information
-            employee_query = "SELECT * FROM employees WHERE id = :employee_id"
-            employee_result = AGENT_TOOLS["database_query"]._run(
-                employee_query, {"employee_id": leave_data.get("employee_id")}
+            employee_result = AGENT_TOOLS["database_query"].run_named(
+                "employees.by_id", {"employee_id": leave_data.get("employee_id")}
             )
             
             if not employee_result["success"] or not employee_result["data"]:
@@ -188,38 +202,19 @@ class ProjectManagementAgent:
         """Optimize resource allocation for a project"""
         try:
             # Get project data
-            project_query = """
-                SELECT p.*, t.name as task_name, t.status, t.assigned_to, t.estimated_hours
-                FROM projects p
-                LEFT JOIN tasks t ON p.id = t.project_id
-                WHERE p.id = :project_id
-            """
-            
-            project_result = AGENT_TOOLS["database_query"]._run(
-                project_query, {"project_id": project_id}
-            )
+            project_params = {"project_id": project_id}
+            project_result = AGENT_TOOLS["database_query"].run_named("projects.with_tasks", project_params)
             
             if not project_result["success"]:
                 return project_result
             
             # Analyze resource utilization
             analysis_result = AGENT_TOOLS["data_analyzer"]._run(
-                project_query.replace(":project_id", str(project_id)), "summary"
+                get_query("projects.with_tasks").sql, "summary", params=project_params
             )
             
             # Get team member availability
-            team_query = """
-                SELECT u.id, u.name, u.email,
-                       COUNT(t.id) as active_tasks,
-                       SUM(t.estimated_hours) as total_workload
-                FROM users u
-                LEFT JOIN tasks t ON u.id = t.assigned_to AND t.status IN ('in_progress', 'pending')
-                WHERE u.active = true
-                GROUP BY u.id, u.name, u.email
-                ORDER BY total_workload ASC
-            """
-            
-            team_result = AGENT_TOOLS["database_query"]._run(team_query)
+            team_result = AGENT_TOOLS["database_query"].run_named("users.active_workload")
             
             if team_result["success"] and team_result["data"]:
                 # Find team members with lowest workload for new assignments  
@@ -268,41 +263,25 @@ class AnalyticsAgent:
         
         return self.factory.create_agent("analytics_agent", tools)
     
+    @cpu_bound
     def generate_employee_analytics(self, time_period: str = "last_30_days") -> Dict[str, Any]:
         """Generate comprehensive employee analytics report"""
         try:
-            # Define time period filter
-            time_filters = {
-                "last_7_days": "created_at >= NOW() - INTERVAL '7 days'",
-                "last_30_days": "created_at >= NOW() - INTERVAL '30 days'",
-                "last_90_days": "created_at >= NOW() - INTERVAL '90 days'",
-                "year_to_date": "EXTRACT(YEAR FROM created_at) = EXTRACT(YEAR FROM NOW())"
+            # Define time period filter, None meaning year to date
+            time_periods = {
+                "last_7_days": 7,
+                "last_30_days": 30,
+                "last_90_days": 90,
+                "year_to_date": None
             }
             
-            time_filter = time_filters.get(time_period, time_filters["last_30_days"])
-            
-            # Employee statistics query
-            employee_stats_query = f"""
-                SELECT 
-                    COUNT(*) as total_employees,
-                    COUNT(CASE WHEN active = true THEN 1 END) as active_employees,
-                    COUNT(CASE WHEN {time_filter} THEN 1 END) as new_employees,
-                    ROUND(AVG(CASE WHEN salary > 0 THEN salary END), 2) as avg_salary
-                FROM employees
-            """
+            stats_params = {"since_days": time_periods.get(time_period, time_periods["last_30_days"])}
             
-            stats_result = AGENT_TOOLS["database_query"]._run(employee_stats_query)
+            # Employee statistics (org-wide aggregates are cached by the registry)
+            stats_result = AGENT_TOOLS["database_query"].run_named("employees.statistics", stats_params)
             
             # Department distribution
-            dept_query = f"""
-                SELECT d.name as department, COUNT(e.id) as employee_count
-                FROM departments d
-                LEFT JOIN employees e ON d.id = e.department_id
-                GROUP BY d.id, d.name
-                ORDER BY employee_count DESC
-            """
-            
-            dept_result = AGENT_TOOLS["database_query"]._run(dept_query)
+            dept_result = AGENT_TOOLS["database_query"].run_named("departments.headcount")
             
             # Generate report
             report_data = {
@@ -317,7 +296,7 @@ class AnalyticsAgent:
             }
             
             report_result = AGENT_TOOLS["report_generator"]._run(
-                "employee_summary", employee_stats_query, "json"
+                "employee_summary", get_query("employees.statistics").sql, "json", params=stats_params
             )
             
             return {
@@ -333,18 +312,13 @@ class AnalyticsAgent:
 # Agent Factory Instance
 agent_factory = BaseAgentFactory()
 
-# Agent Instances
-hr_agent = HRManagementAgent(agent_factory)
-project_agent = ProjectManagementAgent(agent_factory)
-analytics_agent = AnalyticsAgent(agent_factory)
-
-# Agent Registry
-AGENTS = {
-    "hr_agent": hr_agent,
-    "project_agent": project_agent, 
-    "analytics_agent": analytics_agent
-}
+# Agent Registry; each agent is built on first use
+AGENTS = LazyRegistry({
+    "hr_agent": lambda: HRManagementAgent(agent_factory),
+    "project_agent": lambda: ProjectManagementAgent(agent_factory),
+    "analytics_agent": lambda: AnalyticsAgent(agent_factory)
+})
 
 def get_agent(agent_type: str):
     """Get agent instance by type"""
-    return AGENTS.get(agent_type)
\ No newline at end of file
+    return AGENTS.get(agent_type)
@@ -3,6 +3,8 @@ Specialized AI Agents for HR System
 Extended agent implementations for comprehensive HR automation
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
 from crewai import Agent
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
@@ -10,9 +12,19 @@ import logging
 
 from config.agent_config import config
 from tools.agent_tools import AGENT_TOOLS
+from tools.lazy_registry import LazyRegistry
 
 logger = logging.getLogger(__name__)
 
+# Column types for the VALUES list of bulk payroll adjustments
+PAYROLL_ADJUSTMENT_TYPES = {
+    "employee_id": "bigint",
+    "payroll_period": "text",
+    "gross_pay": "numeric",
+    "net_pay": "numeric",
+    "adjustment_reason": "text"
+}
+
 class ITSupportAgent:
     """IT Support Agent for system provisioning and technical tasks"""
     
@@ -38,63 +50,37 @@ class ITSupportAgent:
         try:
             employee_id = employee_data.get('employee_id')
             name = employee_data.get('name')
-            email = employee_data.get('email')
-            department = employee_data.get('department')
-            position = employee_data.get('position')
             
             # Create user account
+            account_request = self._account_request(employee_data)
             account_result = AGENT_TOOLS["laravel_api"]._run(
-                "users",
-                "POST",
-                {
-                    "name": name,
-                    "email": email,
-                    "employee_id": employee_id,
-                    "department": department,
-                    "position": position,
-                    "status": "active"
-                }
+                account_request["endpoint"],
+                account_request["method"],
+                account_request["data"]
             )
             
             if not account_result.get("success"):
                 return {"success": False, "error": "Failed to create user account"}
             
-            # Generate temporary password
-            temp_password = f"Welcome{employee_id}!"
+            user_id = account_result['data']['id']
             
             # Set up system permissions based on department and role
-            permissions = self._determine_permissions(department, position)
+            permissions = self._determine_permissions(employee_data.get('department'), employee_data.get('position'))
             
-            permission_result = AGENT_TOOLS["laravel_api"]._run(
-                f"users/{account_result['data']['id']}/permissions",
-                "POST",
-                {"permissions": permissions}
-            )
-            
-            # Send account details to employee
-            email_body = f"""
-            Welcome to our company, {name}!
-            
-            Your system accounts have been provisioned:
-            - Username: {email}
-            - Temporary Password: {temp_password}
-            
-            Please log in and change your password at: {config.laravel_api_url}/login
-            
-            Your access includes:
-            {chr(10).join([f"- {perm}" for perm in permissions])}
-            
-            If you have any technical issues, please contact IT support.
-            
-            Best regards,
-            IT Support Team
-            """
-            
-            AGENT_TOOLS["email_sender"]._run(
-                email,
-                "Your System Account Has Been Created",
-                email_body
-            )
+            # Granting permissions and sending the account details are independent, so run them together
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                permission_future = pool.submit(
+                    AGENT_TOOLS["laravel_api"]._run,
+                    f"users/{user_id}/permissions",
+                    "POST",
+                    {"permissions": permissions}
+                )
+                email_future = pool.submit(
+                    AGENT_TOOLS["email_sender"].send_many,
+                    [self._build_account_email(employee_data, permissions)]
+                )
+                permission_result = permission_future.result()
+                email_future.result()
             
             # Store account provisioning details
             AGENT_TOOLS["memory_store"]._run(
@@ -102,7 +88,7 @@ class ITSupportAgent:
                 f"it_provisioning_{employee_id}",
                 {
                     "employee_id": employee_id,
-                    "user_id": account_result['data']['id'],
+                    "user_id": user_id,
                     "permissions": permissions,
                     "provisioned_at": datetime.now().isoformat(),
                     "status": "completed"
@@ -112,8 +98,9 @@ class ITSupportAgent:
             
             return {
                 "success": True,
-                "user_id": account_result['data']['id'],
+                "user_id": user_id,
                 "permissions": permissions,
+                "permissions_granted": permission_result.get("success", False),
                 "message": f"System accounts provisioned for {name}"
             }
             
@@ -121,6 +108,51 @@ class ITSupportAgent:
             logger.error(f"Error in IT provisioning: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    @staticmethod
+    def _account_request(employee_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Laravel request that creates an employee's user account"""
+        return {
+            "endpoint": "users",
+            "method": "POST",
+            "data": {
+                "name": employee_data.get('name'),
+                "email": employee_data.get('email'),
+                "employee_id": employee_data.get('employee_id'),
+                "department": employee_data.get('department'),
+                "position": employee_data.get('position'),
+                "status": "active"
+            }
+        }
+    
+    def _build_account_email(self, employee_data: Dict[str, Any], permissions: List[str]) -> Dict[str, Any]:
+        """Build the account details email for a new employee"""
+        # Generate temporary password
+        temp_password = f"Welcome{employee_data.get('employee_id')}!"
+        
+        email_body = f"""
+            Welcome to our company, {employee_data.get('name')}!
+            
+            Your system accounts have been provisioned:
+            - Username: {employee_data.get('email')}
+            - Temporary Password: {temp_password}
+            
+            Please log in and change your password at: {config.laravel_api_url}/login
+            
+            Your access includes:
+            {chr(10).join([f"- {perm}" for perm in permissions])}
+            
+            If you have any technical issues, please contact IT support.
+            
+            Best regards,
+            IT Support Team
+            """
+        
+        return {
+            "to_email": employee_data.get('email'),
+            "subject": "Your System Account Has Been Created",
+            "body": email_body
+        }
+    
     def _determine_permissions(self, department: str, position: str) -> List[str]:
         """Determine system permissions based on department and position"""
         base_permissions = ["read_profile", "update_profile", "view_company_directory"]
@@ -166,81 +198,123 @@ class ComplianceAgent:
     
     def verify_employee_documents(self, employee_data: Dict[str, Any]) -> Dict[str, Any]:
         """Verify employee documents for compliance"""
+        batch_result = self.verify_documents_batch([employee_data])
+        if "results" not in batch_result:
+            return batch_result
+        
+        result = batch_result["results"][0]
+        return {
+            "success": batch_result["success"],
+            "compliance_status": result["compliance_status"],
+            "verification_results": result["verification_results"],
+            "missing_documents": result["missing_documents"],
+            "message": f"Document verification completed for employee {result['employee_id']}"
+        }
+    
+    def verify_documents_batch(self, employees: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Verify documents for many employees with one read and one status write"""
         try:
-            employee_id = employee_data.get('employee_id')
+            employee_ids = [employee.get('employee_id') for employee in employees]
             
-            # Get employee documents
-            docs_result = AGENT_TOOLS["database_query"]._run(
-                "SELECT * FROM employee_documents WHERE employee_id = :employee_id",
-                {"employee_id": employee_id}
+            docs_result = AGENT_TOOLS["database_query"].run_named(
+                "employee_documents.by_employees", {"employee_ids": employee_ids}
             )
             
             if not docs_result.get("success"):
                 return {"success": False, "error": "Failed to retrieve employee documents"}
             
-            documents = docs_result.get("data", [])
+            documents_by_employee: Dict[Any, List[Dict[str, Any]]] = {}
+            for document in docs_result.get("data", []):
+                documents_by_employee.setdefault(str(document['employee_id']), []).append(document)
             
-            # Define required documents
-            required_docs = [
-                "government_id",
-                "tax_form",
-                "emergency_contact",
-                "bank_details",
-                "employment_contract"
-            ]
+            verified_at = datetime.now().isoformat()
+            status_rows = []
+            notices = []
+            results = []
             
-            verification_results = {}
-            missing_documents = []
-            
-            for doc_type in required_docs:
-                doc = next((d for d in documents if d['document_type'] == doc_type), None)
+            for employee in employees:
+                employee_id = employee.get('employee_id')
+                verification_results, missing_documents = self._evaluate_documents(
+                    documents_by_employee.get(str(employee_id), [])
+                )
+                compliance_status = "compliant" if not missing_documents else "pending"
                 
-                if not doc:
-                    missing_documents.append(doc_type)
-                    verification_results[doc_type] = {"status": "missing", "verified": False}
-                else:
-                    # Perform document verification
-                    verification = self._verify_document(doc)
-                    verification_results[doc_type] = verification
-            
-            # Update compliance status
-            compliance_status = "compliant" if not missing_documents else "pending"
-            
-            AGENT_TOOLS["database_query"]._run(
-                "UPDATE employees SET compliance_status = :status WHERE id = :employee_id",
-                {"status": compliance_status, "employee_id": employee_id}
-            )
-            
-            # Store verification results
-            AGENT_TOOLS["memory_store"]._run(
-                "set",
-                f"compliance_verification_{employee_id}",
-                {
+                status_rows.append({"id": employee_id, "compliance_status": compliance_status})
+                if missing_documents:
+                    notices.append(self._build_missing_documents_notice(employee, missing_documents))
+                
+                AGENT_TOOLS["memory_store"]._run(
+                    "set",
+                    f"compliance_verification_{employee_id}",
+                    {
+                        "employee_id": employee_id,
+                        "verification_results": verification_results,
+                        "missing_documents": missing_documents,
+                        "compliance_status": compliance_status,
+                        "verified_at": verified_at
+                    },
+                    ttl=86400
+                )
+                
+                results.append({
                     "employee_id": employee_id,
-                    "verification_results": verification_results,
-                    "missing_documents": missing_documents,
                     "compliance_status": compliance_status,
-                    "verified_at": datetime.now().isoformat()
-                },
-                ttl=86400
+                    "verification_results": verification_results,
+                    "missing_documents": missing_documents
+                })
+            
+            # Update every employee's compliance status in one transaction
+            update_result = AGENT_TOOLS["database_query"].bulk_update(
+                "employees",
+                key_columns=["id"],
+                set_columns=["compliance_status"],
+                rows=status_rows,
+                column_types={"id": "bigint", "compliance_status": "text"}
             )
             
-            # Send notification if documents are missing
-            if missing_documents:
-                self._send_missing_documents_notification(employee_data, missing_documents)
+            for result, outcome in zip(results, update_result["results"]):
+                result["status_updated"] = outcome["success"]
+            
+            notification_result = AGENT_TOOLS["email_sender"].send_many(notices) if notices else None
             
             return {
-                "success": True,
-                "compliance_status": compliance_status,
-                "verification_results": verification_results,
-                "missing_documents": missing_documents,
-                "message": f"Document verification completed for employee {employee_id}"
+                "success": update_result["success"],
+                "employees_verified": len(results),
+                "compliant": sum(1 for result in results if result["compliance_status"] == "compliant"),
+                "results": results,
+                "notifications": notification_result
             }
             
         except Exception as e:
-            logger.error(f"Error in compliance verification: {str(e)}")
+            logger.error(f"Error in batch compliance verification: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _evaluate_documents(self, documents: List[Dict[str, Any]]):
+        """Check an employee's documents against the required set"""
+        required_docs = [
+            "government_id",
+            "tax_form",
+            "emergency_contact",
+            "bank_details",
+            "employment_contract"
+        ]
+        
+        verification_results = {}
+        missing_documents = []
+        
+        for doc_type in required_docs:
+            doc = next((d for d in documents if d['document_type'] == doc_type), None)
+            
+            if not doc:
+                missing_documents.append(doc_type)
+                verification_results[doc_type] = {"status": "missing", "verified": False}
+            else:
+                # Perform document verification
+                verification = self._verify_document(doc)
+                verification_results[doc_type] = verification
+        
+        return verification_results, missing_documents
+    
     def _verify_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """Verify individual document"""
         # Basic document verification logic
@@ -267,8 +341,8 @@ class ComplianceAgent:
         
         return verification
     
-    def _send_missing_documents_notification(self, employee_data: Dict[str, Any], missing_docs: List[str]):
-        """Send notification about missing documents"""
+    def _build_missing_documents_notice(self, employee_data: Dict[str, Any], missing_docs: List[str]) -> Dict[str, Any]:
+        """Build the missing documents email for an employee"""
         email_body = f"""
         Dear {employee_data.get('name')},
         
@@ -284,11 +358,11 @@ class ComplianceAgent:
         HR Compliance Team
         """
         
-        AGENT_TOOLS["email_sender"]._run(
-            employee_data.get('email'),
-            "Missing Employment Documents",
-            email_body
-        )
+        return {
+            "to_email": employee_data.get('email'),
+            "subject": "Missing Employment Documents",
+            "body": email_body
+        }
 
 class TrainingAgent:
     """Training Agent for employee training and development"""
@@ -315,50 +389,14 @@ class TrainingAgent:
         try:
             employee_id = employee_data.get('employee_id')
             name = employee_data.get('name')
-            department = employee_data.get('department')
-            position = employee_data.get('position')
-            start_date = employee_data.get('start_date', datetime.now().date())
-            
-            # Determine required training modules
-            training_modules = self._get_required_training(department, position)
-            
-            # Schedule training sessions
-            training_schedule = []
-            current_date = datetime.strptime(str(start_date), "%Y-%m-%d") + timedelta(days=1)
-            
-            for module in training_modules:
-                session = {
-                    "module_name": module["name"],
-                    "module_type": module["type"],
-                    "duration": module["duration"],
-                    "scheduled_date": current_date.strftime("%Y-%m-%d"),
-                    "scheduled_time": "09:00:00",
-                    "trainer": module.get("trainer", "HR Training Team"),
-                    "location": module.get("location", "Training Room A"),
-                    "status": "scheduled"
-                }
-                
-                # Create training session in database
-                session_result = AGENT_TOOLS["laravel_api"]._run(
-                    "training-sessions",
-                    "POST",
-                    {
-                        "employee_id": employee_id,
-                        "module_name": session["module_name"],
-                        "scheduled_date": session["scheduled_date"],
-                        "scheduled_time": session["scheduled_time"],
-                        "duration": session["duration"],
-                        "trainer": session["trainer"],
-                        "location": session["location"],
-                        "status": "scheduled"
-                    }
-                )
-                
-                if session_result.get("success"):
-                    session["session_id"] = session_result["data"]["id"]
-                
-                training_schedule.append(session)
-                current_date += timedelta(days=1)
+            
+            training_schedule, estimated_completion = self._plan_training_sessions(employee_data)
+            
+            # Create every training session concurrently
+            sessions_result = AGENT_TOOLS["laravel_api"].batch(
+                [self._training_session_request(employee_id, session) for session in training_schedule]
+            )
+            self._attach_session_ids(training_schedule, sessions_result["results"])
             
             # Send training schedule to employee
             self._send_training_schedule_email(employee_data, training_schedule)
@@ -370,8 +408,8 @@ class TrainingAgent:
                 {
                     "employee_id": employee_id,
                     "training_schedule": training_schedule,
-                    "total_modules": len(training_modules),
-                    "estimated_completion": (current_date - timedelta(days=1)).strftime("%Y-%m-%d"),
+                    "total_modules": len(training_schedule),
+                    "estimated_completion": estimated_completion,
                     "created_at": datetime.now().isoformat()
                 },
                 ttl=86400
@@ -380,8 +418,8 @@ class TrainingAgent:
             return {
                 "success": True,
                 "training_schedule": training_schedule,
-                "total_modules": len(training_modules),
-                "estimated_completion": (current_date - timedelta(days=1)).strftime("%Y-%m-%d"),
+                "total_modules": len(training_schedule),
+                "estimated_completion": estimated_completion,
                 "message": f"Training schedule created for {name}"
             }
             
@@ -389,6 +427,54 @@ class TrainingAgent:
             logger.error(f"Error in training scheduling: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _plan_training_sessions(self, employee_data: Dict[str, Any]):
+        """Lay out one session per required module on consecutive days, returning (sessions, completion date)"""
+        start_date = employee_data.get('start_date', datetime.now().date())
+        training_modules = self._get_required_training(employee_data.get('department'), employee_data.get('position'))
+        
+        training_schedule = []
+        current_date = datetime.strptime(str(start_date), "%Y-%m-%d") + timedelta(days=1)
+        
+        for module in training_modules:
+            training_schedule.append({
+                "module_name": module["name"],
+                "module_type": module["type"],
+                "duration": module["duration"],
+                "scheduled_date": current_date.strftime("%Y-%m-%d"),
+                "scheduled_time": "09:00:00",
+                "trainer": module.get("trainer", "HR Training Team"),
+                "location": module.get("location", "Training Room A"),
+                "status": "scheduled"
+            })
+            current_date += timedelta(days=1)
+        
+        return training_schedule, (current_date - timedelta(days=1)).strftime("%Y-%m-%d")
+    
+    @staticmethod
+    def _training_session_request(employee_id: Any, session: Dict[str, Any]) -> Dict[str, Any]:
+        """Laravel request that creates one training session"""
+        return {
+            "endpoint": "training-sessions",
+            "method": "POST",
+            "data": {
+                "employee_id": employee_id,
+                "module_name": session["module_name"],
+                "scheduled_date": session["scheduled_date"],
+                "scheduled_time": session["scheduled_time"],
+                "duration": session["duration"],
+                "trainer": session["trainer"],
+                "location": session["location"],
+                "status": "scheduled"
+            }
+        }
+    
+    @staticmethod
+    def _attach_session_ids(training_schedule: List[Dict[str, Any]], session_results: List[Dict[str, Any]]):
+        """Record the Laravel id of every session that was created"""
+        for session, result in zip(training_schedule, session_results):
+            if result.get("success") and isinstance(result.get("data"), dict):
+                session["session_id"] = result["data"].get("id")
+    
     def _get_required_training(self, department: str, position: str) -> List[Dict[str, Any]]:
         """Get required training modules based on department and position"""
         base_training = [
@@ -451,6 +537,12 @@ class TrainingAgent:
     
     def _send_training_schedule_email(self, employee_data: Dict[str, Any], schedule: List[Dict[str, Any]]):
         """Send training schedule email to employee"""
+        AGENT_TOOLS["email_sender"].send_many([
+            self._build_training_schedule_email(employee_data, schedule)
+        ])
+    
+    def _build_training_schedule_email(self, employee_data: Dict[str, Any], schedule: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the training schedule email for an employee"""
         schedule_text = "\n".join([
             f"- {session['module_name']}: {session['scheduled_date']} at {session['scheduled_time']} ({session['duration']} hours)"
             for session in schedule
@@ -475,11 +567,11 @@ class TrainingAgent:
         Training Team
         """
         
-        AGENT_TOOLS["email_sender"]._run(
-            employee_data.get('email'),
-            "Your Training Schedule",
-            email_body
-        )
+        return {
+            "to_email": employee_data.get('email'),
+            "subject": "Your Training Schedule",
+            "body": email_body
+        }
 
 class PayrollAgent:
     """Payroll Agent for payroll setup and processing"""
@@ -619,56 +711,21 @@ class PayrollAgent:
         try:
             payroll_period = payroll_data.get('payroll_period')
             
-            # Query payroll data for anomaly detection
-            payroll_query = """
-            SELECT e.id, e.name, e.salary, e.hourly_rate,
-                   p.gross_pay, p.net_pay, p.hours_worked, p.overtime_hours,
-                   p.deductions, p.bonuses, p.commissions
-            FROM employees e
-            JOIN payroll_records p ON e.id = p.employee_id
-            WHERE p.payroll_period = :period
-            """
-            
-            payroll_result = AGENT_TOOLS["database_query"]._run(
-                payroll_query, {"period": payroll_period}
-            )
-            
-            if not payroll_result.get("success"):
-                return {"success": False, "error": "Failed to retrieve payroll data"}
+            max_exceptions = payroll_data.get('max_exceptions')
             
+            # Stream the period in batches instead of loading it all at once
             exceptions = []
-            for record in payroll_result["data"]:
-                # Check for salary vs gross pay discrepancies
-                expected_gross = record["salary"] / 26 if record["salary"] else record["hourly_rate"] * record["hours_worked"]
-                if abs(record["gross_pay"] - expected_gross) > 50:  # $50 threshold
-                    exceptions.append({
-                        "employee_id": record["id"],
-                        "employee_name": record["name"],
-                        "exception_type": "gross_pay_discrepancy",
-                        "expected": expected_gross,
-                        "actual": record["gross_pay"],
-                        "variance": record["gross_pay"] - expected_gross
-                    })
-                
-                # Check for excessive overtime
-                if record["overtime_hours"] > 20:
-                    exceptions.append({
-                        "employee_id": record["id"],
-                        "employee_name": record["name"],
-                        "exception_type": "excessive_overtime",
-                        "overtime_hours": record["overtime_hours"],
-                        "requires_approval": True
-                    })
-                
-                # Check for unusual deductions
-                if record["deductions"] > record["gross_pay"] * 0.5:
-                    exceptions.append({
-                        "employee_id": record["id"],
-                        "employee_name": record["name"],
-                        "exception_type": "excessive_deductions",
-                        "deduction_amount": record["deductions"],
-                        "gross_pay": record["gross_pay"]
-                    })
+            batches = AGENT_TOOLS["database_query"].aiter_named(
+                "payroll_records.by_period", {"period": payroll_period}
+            )
+            async with aclosing(batches):
+                async for batch in batches:
+                    for record in batch:
+                        exceptions.extend(self._check_payroll_record(record))
+                    
+                    if max_exceptions and len(exceptions) >= max_exceptions:
+                        exceptions = exceptions[:max_exceptions]
+                        break
             
             return {
                 "success": True,
@@ -681,46 +738,91 @@ class PayrollAgent:
             logger.error(f"Error detecting payroll exceptions: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _check_payroll_record(self, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Find the exceptions in a single payroll record"""
+        exceptions = []
+        
+        # Check for salary vs gross pay discrepancies
+        expected_gross = record["salary"] / 26 if record["salary"] else record["hourly_rate"] * record["hours_worked"]
+        if abs(record["gross_pay"] - expected_gross) > 50:  # $50 threshold
+            exceptions.append({
+                "employee_id": record["id"],
+                "employee_name": record["name"],
+                "exception_type": "gross_pay_discrepancy",
+                "expected": expected_gross,
+                "actual": record["gross_pay"],
+                "variance": record["gross_pay"] - expected_gross
+            })
+        
+        # Check for excessive overtime
+        if record["overtime_hours"] > 20:
+            exceptions.append({
+                "employee_id": record["id"],
+                "employee_name": record["name"],
+                "exception_type": "excessive_overtime",
+                "overtime_hours": record["overtime_hours"],
+                "requires_approval": True
+            })
+        
+        # Check for unusual deductions
+        if record["deductions"] > record["gross_pay"] * 0.5:
+            exceptions.append({
+                "employee_id": record["id"],
+                "employee_name": record["name"],
+                "exception_type": "excessive_deductions",
+                "deduction_amount": record["deductions"],
+                "gross_pay": record["gross_pay"]
+            })
+        
+        return exceptions
+    
     async def apply_payroll_adjustments(self, adjustment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Apply approved payroll adjustments"""
         try:
             approved_resolutions = adjustment_data.get('approved_resolutions', [])
             payroll_period = adjustment_data.get('payroll_period')
             
-            adjustments_applied = []
+            approved = [resolution for resolution in approved_resolutions if resolution.get('approved')]
             
-            for resolution in approved_resolutions:
-                if resolution.get('approved'):
-                    # Apply the adjustment to payroll record
-                    update_query = """
-                    UPDATE payroll_records 
-                    SET gross_pay = :new_gross_pay,
-                        net_pay = :new_net_pay,
-                        adjustment_reason = :reason,
-                        adjusted_at = NOW()
-                    WHERE employee_id = :employee_id AND payroll_period = :period
-                    """
-                    
-                    adjustment_result = AGENT_TOOLS["database_query"]._run(
-                        update_query,
-                        {
-                            "new_gross_pay": resolution.get('adjusted_gross_pay'),
-                            "new_net_pay": resolution.get('adjusted_net_pay'),
-                            "reason": resolution.get('adjustment_reason'),
-                            "employee_id": resolution.get('employee_id'),
-                            "period": payroll_period
-                        }
-                    )
-                    
-                    adjustments_applied.append({
+            # Apply every adjustment to the payroll records in one transaction
+            adjustment_result = await AGENT_TOOLS["database_query"].abulk_update(
+                "payroll_records",
+                key_columns=["employee_id", "payroll_period"],
+                set_columns=["gross_pay", "net_pay", "adjustment_reason"],
+                rows=[
+                    {
                         "employee_id": resolution.get('employee_id'),
-                        "adjustment_type": resolution.get('exception_type'),
-                        "success": adjustment_result.get('success')
-                    })
+                        "payroll_period": payroll_period,
+                        "gross_pay": resolution.get('adjusted_gross_pay'),
+                        "net_pay": resolution.get('adjusted_net_pay'),
+                        "adjustment_reason": resolution.get('adjustment_reason')
+                    }
+                    for resolution in approved
+                ],
+                column_types=PAYROLL_ADJUSTMENT_TYPES,
+                extra_set={"adjusted_at": "NOW()"}
+            )
+            
+            adjustments_applied = []
+            for resolution, outcome in zip(approved, adjustment_result["results"]):
+                adjustments_applied.append({
+                    "employee_id": resolution.get('employee_id'),
+                    "adjustment_type": resolution.get('exception_type'),
+                    "success": outcome["success"]
+                })
+            
+            if not adjustment_result["success"]:
+                return {
+                    "success": False,
+                    "error": adjustment_result["error"],
+                    "details": adjustments_applied
+                }
             
+            # Rows that matched no payroll record stay in details but are not counted as applied
             return {
                 "success": True,
-                "adjustments_applied": len(adjustments_applied),
+                "adjustments_applied": adjustment_result["rows_affected"],
+                "adjustments_not_found": adjustment_result["not_found"],
                 "details": adjustments_applied
             }
             
@@ -783,15 +885,8 @@ class LeaveProcessingAgent:
         leave_type = leave_data.get("leave_type")
         
         # Get employee leave balance
-        balance_query = """
-        SELECT lb.*, e.hire_date, e.employment_status
-        FROM leave_balances lb
-        JOIN employees e ON lb.employee_id = e.id
-        WHERE lb.employee_id = :employee_id AND lb.leave_type = :leave_type
-        """
-        
-        balance_result = AGENT_TOOLS["database_query"]._run(
-            balance_query, {"employee_id": employee_id, "leave_type": leave_type}
+        balance_result = await AGENT_TOOLS["database_query"].arun_named(
+            "leave_balances.by_type", {"employee_id": employee_id, "leave_type": leave_type}
         )
         
         if balance_result.get("success") and balance_result.get("data"):
@@ -817,16 +912,8 @@ class LeaveProcessingAgent:
         end_date = leave_data.get("end_date")
         
         # Check for project deadlines during leave period
-        project_query = """
-        SELECT p.id, p.name, p.deadline, t.name as task_name, t.deadline as task_deadline
-        FROM projects p
-        JOIN tasks t ON p.id = t.project_id
-        WHERE t.assigned_to = :employee_id
-        AND (t.deadline BETWEEN :start_date AND :end_date)
-        """
-        
-        project_result = AGENT_TOOLS["database_query"]._run(
-            project_query,
+        project_result = await AGENT_TOOLS["database_query"].arun_named(
+            "tasks.due_during_period",
             {"employee_id": employee_id, "start_date": start_date, "end_date": end_date}
         )
         
@@ -865,25 +952,8 @@ class CoverageAgent:
             required_skills = coverage_request.get("required_skills", [])
             
             # Find available team members with matching skills
-            coverage_query = """
-            SELECT e.id, e.name, e.email, e.skills, e.current_workload,
-                   d.name as department_name
-            FROM employees e
-            JOIN departments d ON e.department_id = d.id
-            WHERE e.id != :employee_id
-            AND e.active = true
-            AND e.current_workload < 90
-            AND NOT EXISTS (
-                SELECT 1 FROM leave_requests lr
-                WHERE lr.employee_id = e.id
-                AND lr.status = 'approved'
-                AND (lr.start_date <= :end_date AND lr.end_date >= :start_date)
-            )
-            ORDER BY e.current_workload ASC, e.experience_level DESC
-            """
-            
-            coverage_result = AGENT_TOOLS["database_query"]._run(
-                coverage_query,
+            coverage_result = await AGENT_TOOLS["database_query"].arun_named(
+                "employees.coverage_candidates",
                 {"employee_id": employee_id, "start_date": start_date, "end_date": end_date}
             )
             
@@ -937,12 +1007,12 @@ class CoverageAgent:
         matches = sum(1 for skill in required_skills if skill in candidate_skills)
         return (matches / len(required_skills)) * 100
 
-# Extended agent registry with all specialized agents
-SPECIALIZED_AGENTS = {
-    "it_support_agent": ITSupportAgent(),
-    "compliance_agent": ComplianceAgent(),
-    "training_agent": TrainingAgent(),
-    "payroll_agent": PayrollAgent(),
-    "leave_processing_agent": LeaveProcessingAgent(),
-    "coverage_agent": CoverageAgent()
-}
\ No newline at end of file
+# Extended agent registry with all specialized agents, each built on first use
+SPECIALIZED_AGENTS = LazyRegistry({
+    "it_support_agent": ITSupportAgent,
+    "compliance_agent": ComplianceAgent,
+    "training_agent": TrainingAgent,
+    "payroll_agent": PayrollAgent,
+    "leave_processing_agent": LeaveProcessingAgent,
+    "coverage_agent": CoverageAgent
+})
\ No newline at end of file
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures cold import time, first request latency and first-use construction cost of tools and agents
+"""
+
+import argparse
+import importlib
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+# Imported in the order a uvicorn worker loads them
+MODULES = [
+    "config.agent_config",
+    "tools.agent_tools",
+    "agents.core_agents",
+    "agents.specialized_agents",
+    "src.agent_server"
+]
+
+# Requests served without building any agent
+FIRST_REQUESTS = ["/health", "/agents/status"]
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+def measure_once(construct: bool) -> Dict[str, Any]:
+    """Measure one cold start in the current, freshly started interpreter"""
+    results: Dict[str, Any] = {"imports": {}, "requests": {}, "first_use": {}}
+
+    total_started = time.perf_counter()
+    for module in MODULES:
+        started = time.perf_counter()
+        importlib.import_module(module)
+        results["imports"][module] = _elapsed_ms(started)
+    results["import_total"] = _elapsed_ms(total_started)
+
+    from fastapi.testclient import TestClient
+    from src.agent_server import app
+
+    client = TestClient(app)
+    for path in FIRST_REQUESTS:
+        started = time.perf_counter()
+        response = client.get(path)
+        results["requests"][path] = {"ms": _elapsed_ms(started), "status": response.status_code}
+
+    if construct:
+        from tools.agent_tools import AGENT_TOOLS
+        from agents.core_agents import AGENTS
+        from agents.specialized_agents import SPECIALIZED_AGENTS
+
+        for registry in (AGENT_TOOLS, AGENTS, SPECIALIZED_AGENTS):
+            for name in registry:
+                started = time.perf_counter()
+                try:
+                    registry[name]
+                    results["first_use"][name] = _elapsed_ms(started)
+                except Exception as e:
+                    results["first_use"][name] = f"error: {e}"
+
+    return results
+
+def _median(samples: List[float]) -> float:
+    return statistics.median(samples) if samples else 0.0
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of every measurement across runs"""
+    first = runs[0]
+    return {
+        "runs": len(runs),
+        "imports": {module: _median([run["imports"][module] for run in runs]) for module in first["imports"]},
+        "import_total": _median([run["import_total"] for run in runs]),
+        "requests": {path: _median([run["requests"][path]["ms"] for run in runs]) for path in first["requests"]},
+        "first_use": {
+            name: _median([run["first_use"][name] for run in runs if isinstance(run["first_use"][name], float)])
+            if isinstance(value, float) else value
+            for name, value in first["first_use"].items()
+        }
+    }
+
+def print_report(summary: Dict[str, Any]):
+    """Human readable report"""
+    print(f"\nStartup benchmark (median of {summary['runs']} cold runs)")
+    print("=" * 60)
+    print("Import time")
+    for module, ms in summary["imports"].items():
+        print(f"  {module:<40} {ms:>10.1f} ms")
+    print(f"  {'total':<40} {summary['import_total']:>10.1f} ms")
+
+    print("First request latency")
+    for path, ms in summary["requests"].items():
+        print(f"  GET {path:<36} {ms:>10.1f} ms")
+
+    if summary["first_use"]:
+        print("First use construction")
+        for name, value in summary["first_use"].items():
+            formatted = f"{value:>10.1f} ms" if isinstance(value, float) else value
+            print(f"  {name:<40} {formatted}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agent system cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold interpreter runs")
+    parser.add_argument("--no-construct", action="store_true", help="Skip building tools and agents")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(measure_once(construct=not args.no_construct)))
+        return
+
+    # Every run needs a fresh interpreter, otherwise imports are already cached
+    command = [sys.executable, __file__, "--single"]
+    if args.no_construct:
+        command.append("--no-construct")
+
+    runs = []
+    for _ in range(max(args.runs, 1)):
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    summary = summarize(runs)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+
+if __name__ == "__main__":
+    main()
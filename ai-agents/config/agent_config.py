@@ -30,32 +30,178 @@ class AgentConfig(BaseSettings):
     db_user: str = Field(default="postgres", env="DB_USERNAME")
     db_password: str = Field(default="", env="DB_PASSWORD")
     
+    # Database Connection Pool
+    db_pool_size: int = Field(default=10, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, env="DB_MAX_OVERFLOW")
+    db_pool_timeout: int = Field(default=30, env="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    db_prepared_statement_cache_size: int = Field(default=256, env="DB_PREPARED_STATEMENT_CACHE_SIZE")
+    db_bulk_chunk_size: int = Field(default=1000, env="DB_BULK_CHUNK_SIZE")
+    db_stream_batch_size: int = Field(default=1000, env="DB_STREAM_BATCH_SIZE")
+    
+    # Database Query Result Cache
+    query_cache_enabled: bool = Field(default=True, env="QUERY_CACHE_ENABLED")
+    query_cache_size: int = Field(default=512, env="QUERY_CACHE_SIZE")
+    query_cache_channel: str = Field(default="db-query-cache:invalidate", env="QUERY_CACHE_CHANNEL")
+    
     # Redis Configuration
     redis_host: str = Field(default="localhost", env="REDIS_HOST")
     redis_port: int = Field(default=6379, env="REDIS_PORT")
     redis_password: str = Field(default="", env="REDIS_PASSWORD")
     redis_db: int = Field(default=1, env="REDIS_DB")
     
+    # Agent Memory Serialization
+    memory_codec: str = Field(default="msgpack", env="MEMORY_CODEC")
+    memory_compression: str = Field(default="zstd", env="MEMORY_COMPRESSION")
+    memory_compression_threshold: int = Field(default=1024, env="MEMORY_COMPRESSION_THRESHOLD")
+    
+    # Agent Memory Local Cache
+    memory_local_cache_enabled: bool = Field(default=False, env="MEMORY_LOCAL_CACHE_ENABLED")
+    memory_local_cache_size: int = Field(default=1024, env="MEMORY_LOCAL_CACHE_SIZE")
+    memory_local_cache_ttl: float = Field(default=30.0, env="MEMORY_LOCAL_CACHE_TTL")
+    memory_local_cache_channel: str = Field(default="agent-memory:invalidate", env="MEMORY_LOCAL_CACHE_CHANNEL")
+    
     # Laravel Integration
     laravel_api_url: str = Field(default="http://localhost:8000", env="LARAVEL_API_URL")
     laravel_api_token: str = Field(default="", env="LARAVEL_API_TOKEN")
     laravel_app_key: str = Field(default="", env="LARAVEL_APP_KEY")
+    laravel_api_timeout: float = Field(default=10.0, env="LARAVEL_API_TIMEOUT")
+    laravel_get_coalescing_enabled: bool = Field(default=True, env="LARAVEL_GET_COALESCING_ENABLED")
+    laravel_conditional_cache_enabled: bool = Field(default=True, env="LARAVEL_CONDITIONAL_CACHE_ENABLED")
+    laravel_response_cache_size: int = Field(default=1024, env="LARAVEL_RESPONSE_CACHE_SIZE")
+    laravel_batch_concurrency: int = Field(default=10, env="LARAVEL_BATCH_CONCURRENCY")
+    
+    # Outbound HTTP Connection Pool
+    http_pool_hosts: int = Field(default=10, env="HTTP_POOL_HOSTS")
+    http_pool_maxsize_per_host: int = Field(default=20, env="HTTP_POOL_MAXSIZE_PER_HOST")
+    http_keepalive_expiry: float = Field(default=30.0, env="HTTP_KEEPALIVE_EXPIRY")
     
     # Agent System Settings
     agent_memory_backend: str = Field(default="redis", env="AGENT_MEMORY_BACKEND")
     agent_log_level: str = Field(default="INFO", env="AGENT_LOG_LEVEL")
     agent_max_iterations: int = Field(default=10, env="AGENT_MAX_ITERATIONS")
     agent_execution_timeout: int = Field(default=300, env="AGENT_EXECUTION_TIMEOUT")
+    tool_metrics_payload_sizes: bool = Field(default=False, env="TOOL_METRICS_PAYLOAD_SIZES")
+    tool_metrics_payload_sample_rate: float = Field(default=0.01, env="TOOL_METRICS_PAYLOAD_SAMPLE_RATE")
+    agent_warm_up_on_startup: bool = Field(default=False, env="AGENT_WARM_UP_ON_STARTUP")
+    
+    # Agent Task Queue
+    task_queue_backend: str = Field(default="redis", env="TASK_QUEUE_BACKEND")
+    task_queue_stream: str = Field(default="agent-tasks", env="TASK_QUEUE_STREAM")
+    task_queue_group: str = Field(default="agent-workers", env="TASK_QUEUE_GROUP")
+    task_queue_visibility_timeout: float = Field(default=300.0, env="TASK_QUEUE_VISIBILITY_TIMEOUT")
+    task_queue_max_attempts: int = Field(default=3, env="TASK_QUEUE_MAX_ATTEMPTS")
+    task_queue_dead_letter_length: int = Field(default=10000, env="TASK_QUEUE_DEAD_LETTER_LENGTH")
+    task_batch_limit: int = Field(default=1000, env="TASK_BATCH_LIMIT")
+    task_worker_processes: int = Field(default=4, env="TASK_WORKER_PROCESSES")
+    task_worker_poll_interval: float = Field(default=1.0, env="TASK_WORKER_POLL_INTERVAL")
+    task_worker_metrics_port: int = Field(default=9092, env="TASK_WORKER_METRICS_PORT")
+    task_scheduler_prefetch: int = Field(default=8, env="TASK_SCHEDULER_PREFETCH")
+    task_scheduler_aging_interval: float = Field(default=60.0, env="TASK_SCHEDULER_AGING_INTERVAL")
+    task_scheduler_tenant_weights: str = Field(default="", env="TASK_SCHEDULER_TENANT_WEIGHTS")
+    
+    # Agent Task State
+    task_state_prefix: str = Field(default="agent-task", env="TASK_STATE_PREFIX")
+    task_state_ttl: int = Field(default=3600, env="TASK_STATE_TTL")
+    task_status_batch_limit: int = Field(default=1000, env="TASK_STATUS_BATCH_LIMIT")
+    
+    # Task and Workflow Progress Events
+    progress_events_enabled: bool = Field(default=True, env="PROGRESS_EVENTS_ENABLED")
+    progress_channel_prefix: str = Field(default="agent-progress", env="PROGRESS_CHANNEL_PREFIX")
+    progress_history_length: int = Field(default=50, env="PROGRESS_HISTORY_LENGTH")
+    progress_history_ttl: int = Field(default=86400, env="PROGRESS_HISTORY_TTL")
+    progress_keepalive_interval: float = Field(default=15.0, env="PROGRESS_KEEPALIVE_INTERVAL")
+    progress_subscriber_buffer: int = Field(default=100, env="PROGRESS_SUBSCRIBER_BUFFER")
+    
+    # Blocking Agent Call Executors
+    executor_io_workers: int = Field(default=32, env="EXECUTOR_IO_WORKERS")
+    executor_io_max_queue: int = Field(default=100, env="EXECUTOR_IO_MAX_QUEUE")
+    executor_cpu_workers: int = Field(default=4, env="EXECUTOR_CPU_WORKERS")
+    executor_cpu_max_queue: int = Field(default=20, env="EXECUTOR_CPU_MAX_QUEUE")
+    
+    # API Responses
+    response_compression_enabled: bool = Field(default=True, env="RESPONSE_COMPRESSION_ENABLED")
+    response_compression_minimum_size: int = Field(default=1024, env="RESPONSE_COMPRESSION_MINIMUM_SIZE")
+    response_gzip_level: int = Field(default=6, env="RESPONSE_GZIP_LEVEL")
+    response_brotli_quality: int = Field(default=4, env="RESPONSE_BROTLI_QUALITY")
+    
+    # Idempotent Requests
+    idempotency_enabled: bool = Field(default=True, env="IDEMPOTENCY_ENABLED")
+    idempotency_key_prefix: str = Field(default="idempotency", env="IDEMPOTENCY_KEY_PREFIX")
+    idempotency_ttl: int = Field(default=86400, env="IDEMPOTENCY_TTL")
+    idempotency_lock_ttl: int = Field(default=300, env="IDEMPOTENCY_LOCK_TTL")
+    idempotency_wait_timeout: float = Field(default=30.0, env="IDEMPOTENCY_WAIT_TIMEOUT")
+    
+    # Admission Control
+    admission_control_enabled: bool = Field(default=True, env="ADMISSION_CONTROL_ENABLED")
+    admission_max_in_flight: int = Field(default=200, env="ADMISSION_MAX_IN_FLIGHT")
+    admission_max_loop_lag: float = Field(default=0.5, env="ADMISSION_MAX_LOOP_LAG")
+    admission_max_executor_saturation: float = Field(default=0.8, env="ADMISSION_MAX_EXECUTOR_SATURATION")
+    admission_low_priority_ratio: float = Field(default=0.5, env="ADMISSION_LOW_PRIORITY_RATIO")
+    admission_loop_lag_interval: float = Field(default=0.1, env="ADMISSION_LOOP_LAG_INTERVAL")
+    admission_retry_after: int = Field(default=2, env="ADMISSION_RETRY_AFTER")
+    admission_exempt_paths: str = Field(default="/health,/events/*,/webhooks/*", env="ADMISSION_EXEMPT_PATHS")
+    admission_route_priorities: str = Field(
+        default="/tasks/*=high,/hr/process-leave-request=high,/analytics/*=low,/tools/*=low,/database/query=low",
+        env="ADMISSION_ROUTE_PRIORITIES"
+    )
+    admission_route_limits: str = Field(default="/analytics/employee-report=8", env="ADMISSION_ROUTE_LIMITS")
+    
+    # Data Analysis
+    analyzer_stream_chunk_size: int = Field(default=5000, env="ANALYZER_STREAM_CHUNK_SIZE")
+    analyzer_quantile_sample_size: int = Field(default=10000, env="ANALYZER_QUANTILE_SAMPLE_SIZE")
     
     # External Services
     twilio_account_sid: str = Field(default="", env="TWILIO_ACCOUNT_SID")
     twilio_auth_token: str = Field(default="", env="TWILIO_AUTH_TOKEN")
     twilio_phone_number: str = Field(default="", env="TWILIO_PHONE_NUMBER")
+    twilio_timeout: float = Field(default=10.0, env="TWILIO_TIMEOUT")
     
     smtp_host: str = Field(default="smtp.gmail.com", env="SMTP_HOST")
     smtp_port: int = Field(default=587, env="SMTP_PORT")
     smtp_username: str = Field(default="", env="SMTP_USERNAME")
     smtp_password: str = Field(default="", env="SMTP_PASSWORD")
+    smtp_use_tls: bool = Field(default=True, env="SMTP_USE_TLS")
+    smtp_timeout: float = Field(default=30.0, env="SMTP_TIMEOUT")
+    smtp_pool_size: int = Field(default=4, env="SMTP_POOL_SIZE")
+    smtp_pool_idle_timeout: float = Field(default=60.0, env="SMTP_POOL_IDLE_TIMEOUT")
+    
+    # SMS Dispatch Queue
+    sms_provider: str = Field(default="twilio", env="SMS_PROVIDER")
+    sms_dispatcher_enabled: bool = Field(default=True, env="SMS_DISPATCHER_ENABLED")
+    sms_key_prefix: str = Field(default="sms-dispatch", env="SMS_KEY_PREFIX")
+    sms_rate_per_second: float = Field(default=1.0, env="SMS_RATE_PER_SECOND")
+    sms_burst: int = Field(default=5, env="SMS_BURST")
+    sms_consumers_per_worker: int = Field(default=2, env="SMS_CONSUMERS_PER_WORKER")
+    sms_max_attempts: int = Field(default=5, env="SMS_MAX_ATTEMPTS")
+    sms_retry_base_delay: float = Field(default=2.0, env="SMS_RETRY_BASE_DELAY")
+    sms_retry_max_delay: float = Field(default=300.0, env="SMS_RETRY_MAX_DELAY")
+    sms_status_ttl: int = Field(default=604800, env="SMS_STATUS_TTL")
+    sms_status_flush_interval: float = Field(default=1.0, env="SMS_STATUS_FLUSH_INTERVAL")
+    sms_status_batch_size: int = Field(default=100, env="SMS_STATUS_BATCH_SIZE")
+    sms_status_callback_url: str = Field(default="", env="SMS_STATUS_CALLBACK_URL")
+    sms_consumer_lease: float = Field(default=30.0, env="SMS_CONSUMER_LEASE")
+    
+    # Outbound Dependency Bulkheads and Circuit Breakers (each *_MAX_CONCURRENCY is shared by sync and async calls)
+    bulkhead_queue_timeout: float = Field(default=5.0, env="BULKHEAD_QUEUE_TIMEOUT")
+    circuit_half_open_max_calls: int = Field(default=1, env="CIRCUIT_HALF_OPEN_MAX_CALLS")
+    laravel_max_concurrency: int = Field(default=20, env="LARAVEL_MAX_CONCURRENCY")
+    laravel_max_queue: int = Field(default=50, env="LARAVEL_MAX_QUEUE")
+    laravel_circuit_failure_threshold: int = Field(default=5, env="LARAVEL_CIRCUIT_FAILURE_THRESHOLD")
+    laravel_circuit_recovery_timeout: float = Field(default=30.0, env="LARAVEL_CIRCUIT_RECOVERY_TIMEOUT")
+    smtp_max_concurrency: int = Field(default=4, env="SMTP_MAX_CONCURRENCY")
+    smtp_max_queue: int = Field(default=20, env="SMTP_MAX_QUEUE")
+    smtp_circuit_failure_threshold: int = Field(default=3, env="SMTP_CIRCUIT_FAILURE_THRESHOLD")
+    smtp_circuit_recovery_timeout: float = Field(default=60.0, env="SMTP_CIRCUIT_RECOVERY_TIMEOUT")
+    twilio_max_concurrency: int = Field(default=10, env="TWILIO_MAX_CONCURRENCY")
+    twilio_max_queue: int = Field(default=50, env="TWILIO_MAX_QUEUE")
+    twilio_circuit_failure_threshold: int = Field(default=5, env="TWILIO_CIRCUIT_FAILURE_THRESHOLD")
+    twilio_circuit_recovery_timeout: float = Field(default=30.0, env="TWILIO_CIRCUIT_RECOVERY_TIMEOUT")
+    frappe_max_concurrency: int = Field(default=5, env="FRAPPE_MAX_CONCURRENCY")
+    frappe_max_queue: int = Field(default=20, env="FRAPPE_MAX_QUEUE")
+    frappe_circuit_failure_threshold: int = Field(default=5, env="FRAPPE_CIRCUIT_FAILURE_THRESHOLD")
+    frappe_circuit_recovery_timeout: float = Field(default=60.0, env="FRAPPE_CIRCUIT_RECOVERY_TIMEOUT")
     
     # Development Settings
     debug: bool = Field(default=True, env="DEBUG")
@@ -67,6 +213,11 @@ class AgentConfig(BaseSettings):
         """Generate database URL from components"""
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
+    @property
+    def async_database_url(self) -> str:
+        """Generate asyncpg database URL from components"""
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+    
     @property
     def redis_url(self) -> str:
         """Generate Redis URL from components"""
@@ -21,9 +21,13 @@ from workflows.compliance_monitoring import compliance_system
 from agents.core_agents import AGENTS
 from agents.specialized_agents import SPECIALIZED_AGENTS
 from tools.agent_tools import AGENT_TOOLS
+from src.progress import publish_workflow_event
 
 logger = logging.getLogger(__name__)
 
+# Workflows that publish their own step-by-step progress events
+PROGRESS_REPORTING_WORKFLOWS = ("leave_request", "payroll_exceptions")
+
 class HRWorkflowIntegrationSystem:
     """Master orchestrator for all HR workflows and agent coordination"""
     
@@ -41,7 +45,9 @@ class HRWorkflowIntegrationSystem:
         
     async def initiate_workflow(self, workflow_type: str, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
         """Initiate any HR workflow through unified interface"""
-        workflow_id = f"{workflow_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Callers may choose the ID so they can subscribe to /events/workflows/{id} first
+        workflow_id = workflow_data.get("workflow_id") or f"{workflow_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        workflow_data = {**workflow_data, "workflow_id": workflow_id}
         
         try:
             logger.info(f"Initiating {workflow_type} workflow: {workflow_id}")
@@ -67,6 +73,14 @@ class HRWorkflowIntegrationSystem:
                     "error": f"Unknown workflow type: {workflow_type}"
                 }
             
+            # Workflows without step events still tell subscribers when they finish
+            if workflow_type not in PROGRESS_REPORTING_WORKFLOWS:
+                await publish_workflow_event(
+                    workflow_id,
+                    "completed" if result.get("success") else "failed",
+                    error=result.get("error")
+                )
+            
             # Track active workflow
             if result.get("success"):
                 self.active_workflows[workflow_id] = {
@@ -85,6 +99,8 @@ class HRWorkflowIntegrationSystem:
             
         except Exception as e:
             logger.error(f"Error initiating {workflow_type} workflow: {str(e)}")
+            if workflow_type not in PROGRESS_REPORTING_WORKFLOWS:
+                await publish_workflow_event(workflow_id, "failed", error=str(e))
             return {
                 "success": False,
                 "workflow_id": workflow_id,
@@ -15,7 +15,20 @@ from src.agent_server import app
 from src.monitoring import start_prometheus_server, system_health_monitor, get_monitoring_summary
 from config.agent_config import config
 from agents.core_agents import AGENTS
+from agents.specialized_agents import SPECIALIZED_AGENTS
+from tools.agent_tools import AGENT_TOOLS
 from workflows.collaborative_workflows import WORKFLOWS
+from tools.db_engine import dispose_engines
+from tools.http_client import close_http_clients
+from tools.smtp_pool import close_smtp_pool
+from tools.memory_cache import close_memory_cache
+from tools.query_cache import close_query_cache
+from tools.sms_dispatch import start_sms_dispatcher, stop_sms_dispatcher
+from src.task_worker import start_local_worker, stop_local_worker
+from src.progress import start_progress_hub, stop_progress_hub
+from src.executors import shutdown_executors
+from src.idempotency import close_idempotency_store
+from src.admission import start_admission_control, stop_admission_control
 
 # Configure logging
 logging.basicConfig(
@@ -54,16 +67,35 @@ class AgentSystemManager:
             if config.environment == 'production':
                 start_prometheus_server(9090)
             
-            # Initialize agents
-            logger.info("Initializing agents...")
-            for agent_type, agent_instance in AGENTS.items():
-                logger.info(f"Agent {agent_type} initialized successfully")
+            # Agents and tools are built on first use unless warm-up is enabled
+            logger.info("Registering agents...")
+            for agent_type in AGENTS:
+                logger.info(f"Agent {agent_type} registered")
+            
+            if config.agent_warm_up_on_startup:
+                await asyncio.to_thread(self.warm_up)
             
             # Initialize workflows
             logger.info("Initializing workflows...")
             for workflow_type in WORKFLOWS.keys():
                 logger.info(f"Workflow {workflow_type} ready")
             
+            # Start this worker's share of SMS queue consumers
+            if config.sms_dispatcher_enabled:
+                await start_sms_dispatcher()
+            
+            # Serve progress event subscribers from this worker
+            if config.progress_events_enabled:
+                await start_progress_hub()
+            
+            # Without Redis, queued agent tasks run on threads in this process
+            if config.task_queue_backend == "local":
+                start_local_worker()
+            
+            # Shed low-priority requests when this worker is overloaded
+            if config.admission_control_enabled:
+                await start_admission_control()
+            
             # Start periodic health checks
             self.health_check_task = asyncio.create_task(self.periodic_health_check())
             
@@ -74,6 +106,13 @@ class AgentSystemManager:
             logger.error(f"Failed to start agent system: {str(e)}")
             raise
     
+    def warm_up(self):
+        """Construct every tool and agent ahead of the first request"""
+        for registry in (AGENT_TOOLS, AGENTS, SPECIALIZED_AGENTS):
+            timings = registry.warm_up()
+            for name, seconds in timings.items():
+                logger.info(f"Warmed up {name} in {seconds * 1000:.1f}ms")
+    
     async def shutdown(self):
         """Gracefully shutdown the agent system"""
         logger.info("Shutting down CrewAI Agent System...")
@@ -95,6 +134,72 @@ class AgentSystemManager:
         except Exception as e:
             logger.error(f"Error getting final status: {str(e)}")
         
+        # Stop measuring event loop lag
+        try:
+            await stop_admission_control()
+        except Exception as e:
+            logger.error(f"Error stopping admission control: {str(e)}")
+        
+        # Let locally queued agent tasks finish
+        try:
+            await asyncio.to_thread(stop_local_worker, config.task_queue_visibility_timeout)
+        except Exception as e:
+            logger.error(f"Error stopping task worker: {str(e)}")
+        
+        # Let running agent calls finish and drop queued ones
+        try:
+            await asyncio.to_thread(shutdown_executors)
+        except Exception as e:
+            logger.error(f"Error shutting down executors: {str(e)}")
+        
+        # Close progress event subscriptions
+        try:
+            await stop_progress_hub()
+        except Exception as e:
+            logger.error(f"Error stopping progress hub: {str(e)}")
+        
+        # Close the idempotency key connection
+        try:
+            await close_idempotency_store()
+        except Exception as e:
+            logger.error(f"Error closing idempotency store: {str(e)}")
+        
+        # Finish in-flight SMS sends and flush their statuses
+        try:
+            await stop_sms_dispatcher()
+        except Exception as e:
+            logger.error(f"Error stopping SMS dispatcher: {str(e)}")
+        
+        # Release pooled database connections
+        try:
+            await dispose_engines()
+        except Exception as e:
+            logger.error(f"Error disposing database engines: {str(e)}")
+        
+        # Close keep-alive HTTP connections
+        try:
+            await close_http_clients()
+        except Exception as e:
+            logger.error(f"Error closing HTTP clients: {str(e)}")
+        
+        # Close pooled SMTP sessions
+        try:
+            close_smtp_pool()
+        except Exception as e:
+            logger.error(f"Error closing SMTP pool: {str(e)}")
+        
+        # Stop the local memory cache listener
+        try:
+            close_memory_cache()
+        except Exception as e:
+            logger.error(f"Error closing memory cache: {str(e)}")
+        
+        # Stop the query cache listener
+        try:
+            close_query_cache()
+        except Exception as e:
+            logger.error(f"Error closing query cache: {str(e)}")
+        
         logger.info("CrewAI Agent System shutdown completed")
     
     async def periodic_health_check(self):
@@ -0,0 +1,199 @@
+"""
+Admission Control
+Sheds low-priority requests with 503 while the worker is overloaded, so latency stays bounded
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+from config.agent_config import config
+from src.executors import executor_saturation
+from src.monitoring import admission_in_flight, admission_loop_lag, admission_rejections
+from src.scheduler import normalize_priority
+
+logger = logging.getLogger(__name__)
+
+# Priorities that load signals never shed; only their route limits apply
+PROTECTED_PRIORITIES = ("urgent", "high")
+
+def parse_routes(spec: str) -> List[Tuple[str, str]]:
+    """Parse "/tasks/*=high,/health" into (pattern, value) pairs; a missing value is empty"""
+    routes = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        pattern, _, value = part.partition("=")
+        routes.append((pattern.strip(), value.strip()))
+    return routes
+
+def match_route(path: str, routes: List[Tuple[str, str]]) -> Optional[Tuple[str, str]]:
+    """First (pattern, value) whose pattern equals the path, or prefixes it when ending in *"""
+    for pattern, value in routes:
+        if pattern.endswith("*"):
+            if path.startswith(pattern[:-1]):
+                return pattern, value
+        elif path == pattern:
+            return pattern, value
+    return None
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes from short sleeps, smoothed"""
+
+    def __init__(self, interval: float = 0.1, smoothing: float = 0.3):
+        self.interval = interval
+        self.smoothing = smoothing
+        self.lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            sample = max(loop.time() - started - self.interval, 0.0)
+            self.lag += self.smoothing * (sample - self.lag)
+            admission_loop_lag.set(self.lag)
+
+class AdmissionController:
+    """Decides whether a request may start, from in-flight count, loop lag and executor queues
+
+    Normal-priority requests are shed once any signal reaches its limit and
+    low-priority ones at `low_priority_ratio` of it, so background traffic
+    backs off first. High and urgent routes, and exempt paths such as /health,
+    are not shed for load. Per-route in-flight limits apply to every priority.
+    """
+
+    def __init__(self, max_in_flight: int = 200, max_loop_lag: float = 0.5,
+                 max_executor_saturation: float = 0.8, low_priority_ratio: float = 0.5,
+                 exempt_paths: str = "", route_priorities: str = "", route_limits: str = "",
+                 lag_monitor: Optional[LoopLagMonitor] = None):
+        self.max_in_flight = max_in_flight
+        self.max_loop_lag = max_loop_lag
+        self.max_executor_saturation = max_executor_saturation
+        self.low_priority_ratio = low_priority_ratio
+        self.exempt_paths = parse_routes(exempt_paths)
+        self.route_priorities = parse_routes(route_priorities)
+        self.route_limits = [(pattern, int(limit)) for pattern, limit in parse_routes(route_limits)]
+        self.lag_monitor = lag_monitor
+        self.in_flight = 0
+        self._route_in_flight: Dict[str, int] = {}
+
+    def is_exempt(self, path: str) -> bool:
+        return match_route(path, self.exempt_paths) is not None
+
+    def priority(self, path: str) -> str:
+        matched = match_route(path, self.route_priorities)
+        return normalize_priority(matched[1]) if matched else "normal"
+
+    def overload(self, priority: str) -> Optional[str]:
+        """Name of the first limit the worker is over for this priority, or None"""
+        if priority in PROTECTED_PRIORITIES:
+            return None
+        scale = self.low_priority_ratio if priority == "low" else 1.0
+        if self.in_flight >= self.max_in_flight * scale:
+            return "in_flight"
+        if self.lag_monitor and self.lag_monitor.lag >= self.max_loop_lag * scale:
+            return "loop_lag"
+        if executor_saturation() >= self.max_executor_saturation * scale:
+            return "executor_queue"
+        return None
+
+    def admit(self, path: str) -> Tuple[Optional[str], Optional[str], str]:
+        """Returns (rejection reason, route limit pattern, priority); admitted requests must be released"""
+        priority = self.priority(path)
+        reason = self.overload(priority)
+        if reason:
+            return reason, None, priority
+
+        limit = match_route(path, self.route_limits)
+        pattern = None
+        if limit is not None:
+            pattern, max_route = limit
+            if self._route_in_flight.get(pattern, 0) >= max_route:
+                return "route_limit", None, priority
+            self._route_in_flight[pattern] = self._route_in_flight.get(pattern, 0) + 1
+
+        self.in_flight += 1
+        admission_in_flight.set(self.in_flight)
+        return None, pattern, priority
+
+    def release(self, pattern: Optional[str]):
+        self.in_flight -= 1
+        admission_in_flight.set(self.in_flight)
+        if pattern is not None:
+            self._route_in_flight[pattern] -= 1
+
+class AdmissionMiddleware:
+    """Rejects requests the worker cannot serve promptly with 503 and Retry-After"""
+
+    def __init__(self, app, retry_after: int = 2):
+        self.app = app
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        controller = get_admission_controller()
+        if scope["type"] != "http" or controller is None or controller.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        reason, pattern, priority = controller.admit(scope["path"])
+        if reason:
+            admission_rejections.labels(priority=priority, reason=reason).inc()
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later", "reason": reason},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(pattern)
+
+_controller: Optional[AdmissionController] = None
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """The controller running in this worker, if any"""
+    return _controller
+
+async def start_admission_control() -> AdmissionController:
+    """Start measuring loop lag and admitting requests against the configured limits"""
+    global _controller
+    if _controller is None:
+        monitor = LoopLagMonitor(interval=config.admission_loop_lag_interval)
+        monitor.start()
+        _controller = AdmissionController(
+            max_in_flight=config.admission_max_in_flight,
+            max_loop_lag=config.admission_max_loop_lag,
+            max_executor_saturation=config.admission_max_executor_saturation,
+            low_priority_ratio=config.admission_low_priority_ratio,
+            exempt_paths=config.admission_exempt_paths,
+            route_priorities=config.admission_route_priorities,
+            route_limits=config.admission_route_limits,
+            lag_monitor=monitor
+        )
+    return _controller
+
+async def stop_admission_control():
+    """Stop the loop lag monitor; requests are admitted unconditionally afterwards"""
+    global _controller
+    if _controller is not None:
+        controller, _controller = _controller, None
+        await controller.lag_monitor.stop()
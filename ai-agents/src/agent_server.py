@@ -3,18 +3,28 @@ FastAPI Server for CrewAI Agent System
 Provides REST API endpoints for Laravel to communicate with AI agents
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
 import logging
 import uvicorn
 from datetime import datetime
 import asyncio
+import uuid
 
 from agents.core_agents import AGENTS, get_agent
-from config.agent_config import config
+from config.agent_config import config, AGENT_ROLES
 from tools.agent_tools import AGENT_TOOLS
+from tools.sms_dispatch import get_sms_dispatcher, verify_twilio_signature
+from src.task_queue import submit_tasks
+from src.task_state import get_task_state_store
+from src.progress import channel_name, get_progress_hub
+from src.executors import ExecutorSaturated, run_blocking
+from src.responses import CompressionMiddleware, FastJSONResponse, FieldSelectionMiddleware
+from src.idempotency import IdempotencyMiddleware
+from src.admission import AdmissionMiddleware
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, config.agent_log_level))
@@ -24,7 +34,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="CrewAI Agent System API",
     description="REST API for Laravel HR system AI agents",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -36,12 +47,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ?fields=a,b.c trims any JSON response to the listed paths
+app.add_middleware(FieldSelectionMiddleware)
+
+# Retried requests with the same Idempotency-Key get the first response instead of rerunning
+if config.idempotency_enabled:
+    app.add_middleware(IdempotencyMiddleware, wait_timeout=config.idempotency_wait_timeout)
+
+if config.response_compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config.response_compression_minimum_size,
+        gzip_level=config.response_gzip_level,
+        brotli_quality=config.response_brotli_quality
+    )
+
+# Outermost, so shed requests cost as little as possible
+if config.admission_control_enabled:
+    app.add_middleware(AdmissionMiddleware, retry_after=config.admission_retry_after)
+
 # Pydantic models for API requests
 class AgentTaskRequest(BaseModel):
     agent_type: str
     task: str
     data: Dict[str, Any] = {}
     priority: str = "normal"
+    tenant: Optional[str] = None
+    
+class TaskStatusBatchRequest(BaseModel):
+    task_ids: List[str]
     
 class EmployeeOnboardingRequest(BaseModel):
     employee_id: int
@@ -84,105 +118,162 @@ async def health_check():
 async def agents_status():
     """Get status of all agents"""
     status = {}
-    for agent_type, agent_instance in AGENTS.items():
+    for agent_type in AGENTS:
+        # Report from the role definitions so a status check does not build every agent
+        role_config = AGENT_ROLES.get(agent_type, {})
         status[agent_type] = {
             "available": True,
-            "role": agent_instance.agent.role,
-            "goal": agent_instance.agent.goal
+            "loaded": AGENTS.is_loaded(agent_type),
+            "role": role_config.get("role"),
+            "goal": role_config.get("goal")
         }
     
     return {"agents": status}
 
+def _new_task_id(agent_type: str) -> str:
+    return f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{agent_type}_{uuid.uuid4().hex[:8]}"
+
+def _task_payload(request: AgentTaskRequest) -> Dict[str, Any]:
+    """Queue payload for a task request, with a fresh task ID"""
+    return {
+        "task_id": _new_task_id(request.agent_type),
+        "agent_type": request.agent_type,
+        "task": request.task,
+        "data": request.data,
+        "priority": request.priority,
+        # Worker slots are shared fairly between tenants, falling back to the department
+        "tenant": request.tenant or request.data.get("department")
+    }
+
 # Generic agent task endpoint
 @app.post("/agents/execute-task")
-async def execute_agent_task(
-    request: AgentTaskRequest,
-    background_tasks: BackgroundTasks
-):
-    """Execute a task using specified agent"""
+async def execute_agent_task(request: AgentTaskRequest):
+    """Queue a task for the specified agent"""
     try:
-        agent = get_agent(request.agent_type)
-        if not agent:
+        if request.agent_type not in AGENTS:
             raise HTTPException(status_code=404, detail=f"Agent {request.agent_type} not found")
         
-        # Store task in memory for tracking
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{request.agent_type}"
-        task_data = {
-            "task_id": task_id,
-            "agent_type": request.agent_type,
-            "task": request.task,
-            "data": request.data,
-            "status": "initiated",
-            "created_at": datetime.now().isoformat()
-        }
-        
-        AGENT_TOOLS["memory_store"]._run("set", task_id, task_data, ttl=3600)
-        
-        # Execute task in background
-        background_tasks.add_task(execute_task_background, task_id, agent, request.task, request.data)
+        # Record the task and hand it to the workers; the queue survives restarts of this process
+        payload = _task_payload(request)
+        await asyncio.to_thread(submit_tasks, [payload])
         
         return {
             "success": True,
-            "task_id": task_id,
-            "message": f"Task initiated for {request.agent_type}",
-            "status": "processing"
+            "task_id": payload["task_id"],
+            "message": f"Task queued for {request.agent_type}",
+            "status": "queued"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error executing agent task: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-async def execute_task_background(task_id: str, agent, task: str, data: Dict[str, Any]):
-    """Execute agent task in background"""
+@app.post("/agents/execute-batch")
+async def execute_agent_task_batch(requests: List[AgentTaskRequest]):
+    """Queue many tasks at once; task IDs are returned in request order"""
+    if not requests:
+        raise HTTPException(status_code=400, detail="No tasks given")
+    if len(requests) > config.task_batch_limit:
+        raise HTTPException(status_code=400, detail=f"At most {config.task_batch_limit} tasks per batch")
+    
+    unknown = sorted({request.agent_type for request in requests if request.agent_type not in AGENTS})
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Agents not found: {', '.join(unknown)}")
+    
     try:
-        # Update task status
-        task_data = {
-            "task_id": task_id,
-            "status": "processing",
-            "started_at": datetime.now().isoformat()
-        }
-        AGENT_TOOLS["memory_store"]._run("set", f"{task_id}_status", task_data, ttl=3600)
+        # All records and queue entries are written in pipelined round trips
+        payloads = [_task_payload(request) for request in requests]
+        task_ids = await asyncio.to_thread(submit_tasks, payloads)
         
-        # Execute the task using the agent
-        # This is a simplified execution - in practice, you'd use CrewAI's task execution
-        result = {"success": True, "message": f"Task '{task}' completed", "data": data}
-        
-        # Update final status
-        final_data = {
-            "task_id": task_id,
-            "status": "completed",
-            "result": result,
-            "completed_at": datetime.now().isoformat()
+        return {
+            "success": True,
+            "task_ids": task_ids,
+            "queued": len(task_ids),
+            "status": "queued"
         }
-        AGENT_TOOLS["memory_store"]._run("set", f"{task_id}_result", final_data, ttl=3600)
         
     except Exception as e:
-        error_data = {
-            "task_id": task_id,
-            "status": "failed",
-            "error": str(e),
-            "failed_at": datetime.now().isoformat()
-        }
-        AGENT_TOOLS["memory_store"]._run("set", f"{task_id}_result", error_data, ttl=3600)
+        logger.error(f"Error executing agent task batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
 # Get task status
 @app.get("/tasks/{task_id}/status")
 async def get_task_status(task_id: str):
     """Get status of a specific task"""
     try:
-        result = AGENT_TOOLS["memory_store"]._run("get", f"{task_id}_result")
-        if result["success"]:
-            return result["data"]
-        
-        status_result = AGENT_TOOLS["memory_store"]._run("get", f"{task_id}_status") 
-        if status_result["success"]:
-            return status_result["data"]
+        state = await asyncio.to_thread(get_task_state_store().get, task_id)
+        return FastJSONResponse(state or {"task_id": task_id, "status": "not_found"})
         
-        return {"task_id": task_id, "status": "not_found"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/tasks/status")
+async def get_task_statuses(request: TaskStatusBatchRequest):
+    """Get the status of many tasks in one call"""
+    if len(request.task_ids) > config.task_status_batch_limit:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {config.task_status_batch_limit} task IDs per request"
+        )
+    
+    try:
+        states = await asyncio.to_thread(get_task_state_store().get_many, request.task_ids)
+        return FastJSONResponse({
+            "tasks": {
+                task_id: state or {"task_id": task_id, "status": "not_found"}
+                for task_id, state in states.items()
+            }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Progress event streams
+async def _event_stream(channel: str, request: Request, load_snapshot=None) -> StreamingResponse:
+    """Serve a progress channel as server-sent events, resuming after Last-Event-ID"""
+    hub = get_progress_hub()
+    if hub is None:
+        raise HTTPException(status_code=503, detail="Progress events are not enabled")
+    
+    last_event_id = request.headers.get("last-event-id", "")
+    last_seq = int(last_event_id) if last_event_id.isdigit() else 0
+    
+    snapshot = None
+    if load_snapshot is not None:
+        # Read the sequence first: every event up to it is already reflected in the snapshot
+        snapshot_seq = await hub.latest_seq(channel)
+        snapshot = {**await load_snapshot(), "seq": snapshot_seq}
+        last_seq = max(last_seq, snapshot_seq)
+    
+    return StreamingResponse(
+        hub.stream(channel, last_seq=last_seq, snapshot=snapshot, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/events/tasks/{task_id}")
+async def stream_task_events(task_id: str, request: Request):
+    """Stream a task's status changes until it completes or fails"""
+    async def load_state() -> Dict[str, Any]:
+        state = await asyncio.to_thread(get_task_state_store().get, task_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+        return {**state, "event": "state"}
+    
+    return await _event_stream(channel_name("task", task_id), request, load_snapshot=load_state)
+
+@app.get("/events/workflows/{workflow_id}")
+async def stream_workflow_events(workflow_id: str, request: Request):
+    """Stream a workflow's steps as they complete; may be opened before the workflow starts"""
+    return await _event_stream(channel_name("workflow", workflow_id), request)
+
+# Blocking agent calls run on the managed executors so the event loop stays free
+def _busy(error: ExecutorSaturated) -> HTTPException:
+    """503 for a call rejected because its executor queue is full"""
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "1"})
+
 # HR Agent Endpoints
 @app.post("/hr/onboard-employee")
 async def onboard_employee(request: EmployeeOnboardingRequest):
@@ -192,9 +283,13 @@ async def onboard_employee(request: EmployeeOnboardingRequest):
         if not hr_agent:
             raise HTTPException(status_code=404, detail="HR agent not available")
         
-        result = hr_agent.process_employee_onboarding(request.dict())
-        return result
+        result = await run_blocking(hr_agent.process_employee_onboarding, request.dict())
+        return FastJSONResponse(result)
         
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise _busy(e)
     except Exception as e:
         logger.error(f"Error in employee onboarding: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -207,9 +302,13 @@ async def process_leave_request(request: LeaveRequestData):
         if not hr_agent:
             raise HTTPException(status_code=404, detail="HR agent not available")
         
-        result = hr_agent.process_leave_request(request.dict())
-        return result
+        result = await run_blocking(hr_agent.process_leave_request, request.dict())
+        return FastJSONResponse(result)
         
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise _busy(e)
     except Exception as e:
         logger.error(f"Error processing leave request: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -223,9 +322,13 @@ async def optimize_project_resources(request: ProjectOptimizationRequest):
         if not project_agent:
             raise HTTPException(status_code=404, detail="Project agent not available")
         
-        result = project_agent.optimize_resource_allocation(request.project_id)
-        return result
+        result = await run_blocking(project_agent.optimize_resource_allocation, request.project_id)
+        return FastJSONResponse(result)
         
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise _busy(e)
     except Exception as e:
         logger.error(f"Error optimizing resources: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -239,9 +342,13 @@ async def generate_employee_analytics(request: AnalyticsRequest):
         if not analytics_agent:
             raise HTTPException(status_code=404, detail="Analytics agent not available")
         
-        result = analytics_agent.generate_employee_analytics(request.time_period)
-        return result
+        result = await run_blocking(analytics_agent.generate_employee_analytics, request.time_period)
+        return FastJSONResponse(result)
         
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise _busy(e)
     except Exception as e:
         logger.error(f"Error generating analytics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -255,9 +362,13 @@ async def execute_tool(tool_name: str, params: Dict[str, Any]):
             raise HTTPException(status_code=404, detail=f"Tool {tool_name} not found")
         
         tool = AGENT_TOOLS[tool_name]
-        result = tool._run(**params)
-        return result
+        result = await run_blocking(tool._run, **params)
+        return FastJSONResponse(result)
         
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise _busy(e)
     except Exception as e:
         logger.error(f"Error executing tool {tool_name}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -267,13 +378,48 @@ async def execute_tool(tool_name: str, params: Dict[str, Any]):
 async def execute_database_query(query: str, params: Dict[str, Any] = {}):
     """Execute database query"""
     try:
-        result = AGENT_TOOLS["database_query"]._run(query, params)
+        result = await AGENT_TOOLS["database_query"]._arun(query, params)
         return result
         
     except Exception as e:
         logger.error(f"Error executing database query: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# SMS delivery status
+@app.get("/sms/{message_id}/status")
+async def get_sms_delivery_status(message_id: str):
+    """Get the delivery status of a queued SMS"""
+    result = await asyncio.to_thread(AGENT_TOOLS["sms_sender"].status, message_id)
+    if not result["success"]:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result["data"]
+
+@app.post("/webhooks/sms/status")
+async def sms_status_callback(request: Request, message_id: str):
+    """Receive a provider delivery receipt for a queued SMS"""
+    params = dict(await request.form())
+    
+    if config.sms_provider == "twilio":
+        url = f"{config.sms_status_callback_url}?message_id={message_id}"
+        if not verify_twilio_signature(url, params, request.headers.get("X-Twilio-Signature", "")):
+            raise HTTPException(status_code=403, detail="Invalid signature")
+    
+    receipt = {
+        "delivery_status": params.get("MessageStatus"),
+        "delivery_error_code": params.get("ErrorCode")
+    }
+    
+    dispatcher = get_sms_dispatcher()
+    if dispatcher is not None:
+        # Buffered with the dispatcher's own status writes and flushed in batches
+        dispatcher.record_status(message_id, **receipt)
+        return {"received": True}
+    
+    result = await asyncio.to_thread(AGENT_TOOLS["sms_sender"].record_status, message_id, **receipt)
+    if not result["success"]:
+        raise HTTPException(status_code=503, detail=result["error"])
+    return {"received": True}
+
 if __name__ == "__main__":
     uvicorn.run(
         "agent_server:app",
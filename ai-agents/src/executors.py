@@ -0,0 +1,150 @@
+"""
+Managed Executors
+Bounded thread pools that keep blocking agent calls off the event loop, sized separately for I/O and CPU work
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config.agent_config import config
+from src.monitoring import (
+    executor_active, executor_queued, executor_rejections,
+    executor_wait_time, executor_run_time
+)
+
+logger = logging.getLogger(__name__)
+
+# Pools configured by prefix in AgentConfig
+POOLS = ("io", "cpu")
+
+DEFAULT_POOL = "io"
+
+class ExecutorSaturated(Exception):
+    """Raised when a pool's queue is full and the call is rejected"""
+
+def cpu_bound(func: Callable) -> Callable:
+    """Mark a blocking function to run on the CPU pool rather than the I/O pool"""
+    func.executor_pool = "cpu"
+    return func
+
+def pool_for(func: Callable) -> str:
+    """Pool a blocking function runs on; works for bound methods of marked functions"""
+    return getattr(func, "executor_pool", DEFAULT_POOL)
+
+class ManagedExecutor:
+    """A thread pool that rejects work once `max_queue` calls are waiting for a thread
+
+    The CPU pool is kept small so long analytical work cannot take every thread
+    needed by quick I/O-bound calls. Agents hold LLM clients and connections
+    that cannot be pickled, so both pools use threads rather than processes.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"agent-{name}")
+        self._submitted = 0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    def saturation(self) -> float:
+        """Fraction of the wait queue in use"""
+        with self._lock:
+            queued = self._submitted - self._running
+        return queued / self.max_queue if self.max_queue else float(queued > 0)
+
+    def _admit(self):
+        with self._lock:
+            if self._submitted >= self.max_workers + self.max_queue:
+                executor_rejections.labels(pool=self.name).inc()
+                raise ExecutorSaturated(f"Too many calls waiting for the {self.name} pool")
+            self._submitted += 1
+        executor_queued.labels(pool=self.name).inc()
+
+    def _call(self, submitted_at: float, func: Callable, *args, **kwargs) -> Any:
+        """Runs on a pool thread"""
+        started = time.monotonic()
+        with self._lock:
+            self._running += 1
+        executor_queued.labels(pool=self.name).dec()
+        executor_active.labels(pool=self.name).inc()
+        executor_wait_time.labels(pool=self.name).observe(started - submitted_at)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            executor_run_time.labels(pool=self.name).observe(time.monotonic() - started)
+            executor_active.labels(pool=self.name).dec()
+            with self._lock:
+                self._running -= 1
+                self._submitted -= 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on this pool and await its result; raises ExecutorSaturated when full"""
+        self._admit()
+        # Carry context variables into the thread, as asyncio.to_thread does
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, time.monotonic(), func, *args, **kwargs)
+        try:
+            future = self._pool.submit(call)
+        except Exception:
+            self._withdraw()
+            raise
+        future.add_done_callback(self._cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _withdraw(self):
+        """Forget a queued call that will never start"""
+        with self._lock:
+            self._submitted -= 1
+        executor_queued.labels(pool=self.name).dec()
+
+    def _cancelled(self, future):
+        # A caller that goes away before its call starts frees the queue slot
+        if future.cancelled():
+            self._withdraw()
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+_executors: Dict[str, ManagedExecutor] = {}
+_executors_lock = threading.Lock()
+
+def get_executor(name: str) -> ManagedExecutor:
+    """Get a named pool, creating it from AgentConfig on first use"""
+    if name not in POOLS:
+        raise ValueError(f"Unknown executor pool: {name}")
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ManagedExecutor(
+                    name,
+                    max_workers=getattr(config, f"executor_{name}_workers"),
+                    max_queue=getattr(config, f"executor_{name}_max_queue")
+                )
+                _executors[name] = executor
+    return executor
+
+async def run_blocking(func: Callable, *args, pool: Optional[str] = None, **kwargs) -> Any:
+    """Run a blocking call off the event loop, on the pool it is marked for"""
+    return await get_executor(pool or pool_for(func)).run(func, *args, **kwargs)
+
+def executor_saturation() -> float:
+    """Highest queue saturation among the pools created so far"""
+    return max((executor.saturation() for executor in list(_executors.values())), default=0.0)
+
+def shutdown_executors(wait: bool = True):
+    """Stop every pool, letting running calls finish and dropping queued ones"""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
@@ -0,0 +1,324 @@
+"""
+Idempotent Requests
+Replays the stored response for retried mutating requests that carry an Idempotency-Key header
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from fastapi.responses import JSONResponse
+
+from config.agent_config import config
+from src.monitoring import idempotent_requests
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"idempotency-key"
+
+MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# Claims a key for the first request. KEYS: record. ARGV: fingerprint, owner token, lock TTL.
+ACQUIRE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'state', 'in_progress', 'fingerprint', ARGV[1], 'owner', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# Stores the response, unless the claim expired and another request took the key.
+# KEYS: record. ARGV: owner token, TTL, then field/value pairs.
+COMPLETE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'state', 'done', unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Drops a claim so a retry can run the request again. KEYS: record. ARGV: owner token.
+RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'owner') == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class StoredResponse:
+    """A completed response kept for replay"""
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def encode(self) -> Dict[str, str]:
+        return {
+            "status": str(self.status),
+            "headers": json.dumps([[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers]),
+            "body": base64.b64encode(self.body).decode("ascii")
+        }
+
+    @classmethod
+    def decode(cls, record: Dict[str, str]) -> "StoredResponse":
+        return cls(
+            int(record["status"]),
+            [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(record["headers"])],
+            base64.b64decode(record["body"])
+        )
+
+class IdempotencyStore:
+    """Claims idempotency keys and keeps the first response for each, in Redis"""
+
+    def __init__(self, redis_url: str, prefix: str = "idempotency", ttl: int = 86400, lock_ttl: int = 300):
+        self.client = aioredis.from_url(redis_url, decode_responses=True)
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self._acquire = self.client.register_script(ACQUIRE_SCRIPT)
+        self._complete = self.client.register_script(COMPLETE_SCRIPT)
+        self._release = self.client.register_script(RELEASE_SCRIPT)
+
+    def key(self, method: str, path: str, idempotency_key: str) -> str:
+        return f"{self.prefix}:{method}:{path}:{idempotency_key}"
+
+    async def acquire(self, key: str, fingerprint: str) -> Optional[str]:
+        """Claim a key for this request; returns the owner token, or None if already claimed"""
+        owner = uuid.uuid4().hex
+        if await self._acquire(keys=[key], args=[fingerprint, owner, self.lock_ttl]):
+            return owner
+        return None
+
+    async def get(self, key: str) -> Dict[str, str]:
+        return await self.client.hgetall(key)
+
+    async def complete(self, key: str, owner: str, response: StoredResponse) -> bool:
+        args = [owner, self.ttl]
+        for name, value in response.encode().items():
+            args.extend((name, value))
+        return bool(await self._complete(keys=[key], args=args))
+
+    async def release(self, key: str, owner: str):
+        await self._release(keys=[key], args=[owner])
+
+    async def close(self):
+        await self.client.close()
+
+_store: Optional[IdempotencyStore] = None
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get this worker's store, creating it on first use"""
+    global _store
+    if _store is None:
+        _store = IdempotencyStore(
+            config.redis_url,
+            prefix=config.idempotency_key_prefix,
+            ttl=config.idempotency_ttl,
+            lock_ttl=config.idempotency_lock_ttl
+        )
+    return _store
+
+async def close_idempotency_store():
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
+
+def _fingerprint(scope, body: bytes) -> str:
+    """Identifies the request a key was first used with"""
+    digest = hashlib.sha256(scope.get("query_string", b""))
+    digest.update(b"\x00")
+    digest.update(body)
+    return digest.hexdigest()
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+def _replay_receive(body: bytes, receive):
+    """A receive callable that hands the buffered body to the app once"""
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+def _reports_failure(content_type: bytes, body: bytes) -> bool:
+    """Agent endpoints report failures as 200 with {"success": false}; those are not kept either"""
+    if not content_type.startswith(b"application/json"):
+        return False
+    try:
+        content = json.loads(body)
+    except ValueError:
+        return False
+    return isinstance(content, dict) and content.get("success") is False
+
+class IdempotencyMiddleware:
+    """Runs a mutating request once per Idempotency-Key
+
+    The first request claims the key and its response is stored unless it
+    failed, either with a 5xx or with `"success": false` in the body. Duplicates arriving while it runs wait for that response
+    instead of running the pipeline again, and later duplicates get it straight
+    from Redis. Reusing a key with a different body is rejected with 422.
+    """
+
+    def __init__(self, app, wait_timeout: float = 30.0):
+        self.app = app
+        self.wait_timeout = wait_timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = None
+        for name, value in scope["headers"]:
+            if name == HEADER:
+                idempotency_key = value.decode("latin-1").strip()
+                break
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        receive = _replay_receive(body, receive)
+        store = get_idempotency_store()
+        key = store.key(scope["method"], scope["path"], idempotency_key)
+        fingerprint = _fingerprint(scope, body)
+
+        try:
+            owner = await store.acquire(key, fingerprint)
+            if owner is None:
+                outcome, stored, owner = await self._wait(store, key, fingerprint)
+            else:
+                outcome, stored = "first", None
+        except Exception as e:
+            # Without Redis, requests still run; they just lose duplicate protection
+            logger.warning(f"Idempotency store unavailable, running request without it: {str(e)}")
+            idempotent_requests.labels(outcome="unavailable").inc()
+            await self.app(scope, receive, send)
+            return
+
+        idempotent_requests.labels(outcome=outcome).inc()
+        if outcome == "mismatch":
+            await self._error(scope, receive, send, 422, "Idempotency-Key was already used with a different request")
+            return
+        if outcome == "timeout":
+            await self._error(scope, receive, send, 409, "A request with this Idempotency-Key is still in progress",
+                              retry_after=True)
+            return
+        if stored is not None:
+            await self._replay(stored, send)
+            return
+
+        await self._run(scope, receive, send, store, key, owner)
+
+    async def _wait(self, store: IdempotencyStore, key: str,
+                    fingerprint: str) -> Tuple[str, Optional[StoredResponse], Optional[str]]:
+        """Wait for the request holding the key; returns (outcome, stored response, owner token)
+
+        If the holder gave up without a response, this request claims the key
+        and runs instead.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        interval = 0.05
+        waited = False
+        while True:
+            record = await store.get(key)
+            if not record:
+                owner = await store.acquire(key, fingerprint)
+                if owner is not None:
+                    return "retried", None, owner
+                continue
+            if record.get("fingerprint") != fingerprint:
+                return "mismatch", None, None
+            if record.get("state") == "done":
+                return ("waited" if waited else "replayed"), StoredResponse.decode(record), None
+            if time.monotonic() >= deadline:
+                return "timeout", None, None
+
+            waited = True
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 0.5)
+
+    async def _run(self, scope, receive, send, store: IdempotencyStore, key: str, owner: str):
+        """Run the request as the key's owner and store its response"""
+        status = None
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks = []
+        streamed = False
+
+        async def capture(message):
+            nonlocal status, headers, streamed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                streamed = streamed or message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        except BaseException:
+            await self._release(store, key, owner)
+            raise
+
+        content_type = dict(headers).get(b"content-type", b"")
+        body = b"".join(chunks)
+        if (
+            status is None
+            or status >= 500
+            or (streamed and content_type.startswith(b"text/event-stream"))
+            or _reports_failure(content_type, body)
+        ):
+            # Failures and event streams are not replayed; a retry runs the request again
+            await self._release(store, key, owner)
+            return
+
+        try:
+            stored = StoredResponse(status, headers, body)
+            if not await store.complete(key, owner, stored):
+                logger.warning(f"Idempotency claim on {key} expired before the response was stored")
+        except Exception as e:
+            logger.warning(f"Error storing idempotent response for {key}: {str(e)}")
+
+    async def _release(self, store: IdempotencyStore, key: str, owner: str):
+        try:
+            await store.release(key, owner)
+        except Exception as e:
+            logger.warning(f"Error releasing idempotency key {key}: {str(e)}")
+
+    async def _replay(self, stored: StoredResponse, send):
+        await send({
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": stored.headers + [(b"idempotent-replayed", b"true")]
+        })
+        await send({"type": "http.response.body", "body": stored.body})
+
+    async def _error(self, scope, receive, send, status_code: int, detail: str, retry_after: bool = False):
+        headers = {"Retry-After": "1"} if retry_after else None
+        response = JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+        await response(scope, receive, send)
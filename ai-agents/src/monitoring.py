@@ -15,7 +15,6 @@ from prometheus_client import Counter, Histogram, Gauge, start_http_server
 import psutil
 
 from config.agent_config import config
-from tools.agent_tools import AGENT_TOOLS
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,6 +25,41 @@ agent_execution_time = Histogram('agent_execution_seconds', 'Agent task executio
 agent_memory_usage = Gauge('agent_memory_usage_bytes', 'Agent memory usage', ['agent_type'])
 agent_error_counter = Counter('agent_errors_total', 'Total agent errors', ['agent_type', 'error_type'])
 system_health_gauge = Gauge('system_health_score', 'Overall system health score')
+query_cache_hits = Counter('db_query_cache_hits_total', 'Database query results served from cache')
+query_cache_misses = Counter('db_query_cache_misses_total', 'Cacheable database queries that missed the cache')
+query_cache_invalidations = Counter('db_query_cache_invalidations_total', 'Query cache evictions caused by writes', ['table'])
+named_query_duration = Histogram('db_named_query_seconds', 'Named database query latency', ['query'])
+named_query_errors = Counter('db_named_query_errors_total', 'Named database queries that failed', ['query'])
+tool_call_counter = Counter('agent_tool_calls_total', 'Agent tool calls', ['tool', 'operation', 'status'])
+tool_latency = Histogram('agent_tool_latency_seconds', 'Agent tool call latency', ['tool', 'operation'])
+tool_error_counter = Counter('agent_tool_errors_total', 'Agent tool call errors', ['tool', 'operation', 'error_type'])
+tool_request_bytes = Histogram('agent_tool_request_bytes', 'Agent tool request payload size', ['tool', 'operation'],
+                               buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304))
+tool_response_bytes = Histogram('agent_tool_response_bytes', 'Agent tool response payload size', ['tool', 'operation'],
+                                buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304))
+laravel_coalesced_requests = Counter('laravel_api_coalesced_requests_total', 'Laravel GETs served by joining an identical in-flight request')
+laravel_not_modified_responses = Counter('laravel_api_not_modified_total', 'Laravel GETs answered 304 and served from the response cache')
+task_queue_depth = Gauge('agent_task_queue_depth', 'Agent tasks waiting in or claimed from the task queue')
+task_queue_in_flight = Gauge('agent_task_queue_in_flight', 'Agent tasks claimed by a worker and not yet acknowledged')
+task_queue_wait_time = Histogram('agent_task_queue_wait_seconds', 'Time agent tasks spend queued before a worker starts them', ['agent_type', 'priority'],
+                                 buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900))
+task_slots_in_use = Gauge('agent_task_slots_in_use', 'Worker slots running tasks, by tenant', ['tenant'])
+task_retries = Counter('agent_task_retries_total', 'Agent tasks requeued after a failed attempt', ['agent_type'])
+task_dead_letters = Counter('agent_task_dead_letters_total', 'Agent tasks moved to the dead-letter stream', ['agent_type'])
+dependency_circuit_state = Gauge('dependency_circuit_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open)', ['dependency'])
+dependency_rejections = Counter('dependency_rejections_total', 'Outbound calls rejected without being attempted', ['dependency', 'reason'])
+dependency_failures = Counter('dependency_failures_total', 'Outbound calls counted as failures by the circuit breaker', ['dependency'])
+dependency_in_flight = Gauge('dependency_in_flight', 'Outbound calls currently holding a bulkhead slot', ['dependency'])
+dependency_queued = Gauge('dependency_queued', 'Outbound calls waiting for a bulkhead slot', ['dependency'])
+executor_active = Gauge('agent_executor_active', 'Blocking agent calls running on an executor thread', ['pool'])
+executor_queued = Gauge('agent_executor_queued', 'Blocking agent calls waiting for an executor thread', ['pool'])
+executor_rejections = Counter('agent_executor_rejections_total', 'Blocking agent calls rejected because the executor queue was full', ['pool'])
+executor_wait_time = Histogram('agent_executor_wait_seconds', 'Time blocking agent calls wait for an executor thread', ['pool'])
+executor_run_time = Histogram('agent_executor_run_seconds', 'Time blocking agent calls spend running on an executor thread', ['pool'])
+idempotent_requests = Counter('idempotent_requests_total', 'Requests carrying an Idempotency-Key, by outcome', ['outcome'])
+admission_in_flight = Gauge('api_admission_in_flight', 'API requests admitted and still being served, excluding exempt paths')
+admission_loop_lag = Gauge('api_event_loop_lag_seconds', 'Smoothed delay of the API event loop in waking from short sleeps')
+admission_rejections = Counter('api_admission_rejections_total', 'API requests shed with 503 by admission control', ['priority', 'reason'])
 
 @dataclass
 class AgentMetrics:
@@ -291,6 +325,8 @@ class SystemHealthMonitor:
         
         # Check database connectivity
         try:
+            # Imported here because the tool registry imports these metrics
+            from tools.agent_tools import AGENT_TOOLS
             db_result = AGENT_TOOLS["database_query"]._run("SELECT 1")
             db_healthy = db_result.get("success", False)
             if not db_healthy:
@@ -301,6 +337,16 @@ class SystemHealthMonitor:
             health_score -= 30
             issues.append(f"Database error: {str(e)}")
         
+        # Check outbound dependency circuits
+        try:
+            # Imported here because the resilience module imports these metrics
+            from tools.resilience import open_circuits
+            for dependency in open_circuits():
+                health_score -= 10
+                issues.append(f"Circuit not closed for {dependency}")
+        except Exception as e:
+            issues.append(f"Dependency circuit check failed: {str(e)}")
+        
         # Check system resources
         cpu_percent = psutil.cpu_percent(interval=1)
         memory_percent = psutil.virtual_memory().percent
@@ -0,0 +1,296 @@
+"""
+Task and Workflow Progress Events
+Progress published through Redis pub/sub and streamed to clients as server-sent events
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+
+from config.agent_config import config
+
+logger = logging.getLogger(__name__)
+
+# Events after which nothing more is published on a channel
+TERMINAL_EVENTS = ("completed", "failed")
+
+# Numbers the event, keeps a short replayable history and publishes it, in one step.
+# KEYS: channel, sequence, history. ARGV: event JSON object, history length, TTL.
+PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[2])
+local event = '{"seq":' .. seq .. ',' .. string.sub(ARGV[1], 2)
+redis.call('RPUSH', KEYS[3], event)
+redis.call('LTRIM', KEYS[3], -tonumber(ARGV[2]), -1)
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+redis.call('PUBLISH', KEYS[1], event)
+return seq
+"""
+
+def channel_name(kind: str, subject_id: str, prefix: Optional[str] = None) -> str:
+    """Pub/sub channel for a task or workflow"""
+    return f"{prefix or config.progress_channel_prefix}:{kind}:{subject_id}"
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event in the text/event-stream format"""
+    lines = []
+    if "seq" in event:
+        lines.append(f"id: {event['seq']}")
+    lines.append(f"event: {event.get('event', 'message')}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+class ProgressPublisher:
+    """Publishes progress events from any process"""
+
+    def __init__(self, redis_url: str, prefix: str, history_length: int = 50, history_ttl: int = 86400):
+        self.client = redis.Redis.from_url(redis_url)
+        self.prefix = prefix
+        self.history_length = history_length
+        self.history_ttl = history_ttl
+        self._publish = self.client.register_script(PUBLISH_SCRIPT)
+
+    def publish(self, kind: str, subject_id: str, event: str, **fields) -> Optional[int]:
+        """Publish one event; returns its sequence number, or None if publishing failed"""
+        channel = channel_name(kind, subject_id, self.prefix)
+        payload = {**fields, "event": event, f"{kind}_id": subject_id, "timestamp": time.time()}
+        try:
+            return self._publish(
+                keys=[channel, f"{channel}:seq", f"{channel}:history"],
+                args=[json.dumps(payload, default=str), self.history_length, self.history_ttl]
+            )
+        except Exception as e:
+            # Progress is best effort and must never fail the work it reports on
+            logger.warning(f"Error publishing {event} for {kind} {subject_id}: {str(e)}")
+            return None
+
+    def reset(self, kind: str, subject_id: str):
+        """Forget a channel's sequence and history, so a reused ID starts from a clean slate"""
+        channel = channel_name(kind, subject_id, self.prefix)
+        try:
+            self.client.delete(f"{channel}:seq", f"{channel}:history")
+        except Exception as e:
+            logger.warning(f"Error resetting progress for {kind} {subject_id}: {str(e)}")
+
+_publisher: Optional[ProgressPublisher] = None
+_publisher_lock = threading.Lock()
+
+def get_progress_publisher() -> Optional[ProgressPublisher]:
+    """Get the shared publisher, or None when progress events are disabled"""
+    global _publisher
+    if not config.progress_events_enabled:
+        return None
+    if _publisher is None:
+        with _publisher_lock:
+            if _publisher is None:
+                _publisher = ProgressPublisher(
+                    config.redis_url,
+                    prefix=config.progress_channel_prefix,
+                    history_length=config.progress_history_length,
+                    history_ttl=config.progress_history_ttl
+                )
+    return _publisher
+
+def publish_task_event(task_id: str, event: str, **fields):
+    """Publish a task lifecycle event; blocking"""
+    publisher = get_progress_publisher()
+    if publisher:
+        publisher.publish("task", task_id, event, **fields)
+
+async def publish_workflow_event(workflow_id: str, event: str, **fields):
+    """Publish a workflow progress event without blocking the event loop"""
+    publisher = get_progress_publisher()
+    if publisher:
+        await asyncio.to_thread(publisher.publish, "workflow", workflow_id, event, **fields)
+
+async def reset_workflow_events(workflow_id: str):
+    """Clear a workflow's progress history without blocking the event loop"""
+    publisher = get_progress_publisher()
+    if publisher:
+        await asyncio.to_thread(publisher.reset, "workflow", workflow_id)
+
+class WorkflowProgress:
+    """Reports the steps of one workflow run as they complete"""
+
+    def __init__(self, workflow_id: str, total_steps: int):
+        self.workflow_id = workflow_id
+        self.total_steps = total_steps
+        self.completed_steps = 0
+
+    async def started(self, **fields):
+        # Caller-chosen IDs may be reused; the previous run's terminal event must not be replayed
+        await reset_workflow_events(self.workflow_id)
+        await publish_workflow_event(self.workflow_id, "started", total_steps=self.total_steps, **fields)
+
+    async def step(self, name: str, **fields):
+        """Mark the next step as done"""
+        self.completed_steps += 1
+        await publish_workflow_event(
+            self.workflow_id, "step_completed",
+            step=self.completed_steps,
+            step_name=name,
+            total_steps=self.total_steps,
+            **fields
+        )
+
+    async def completed(self, **fields):
+        await publish_workflow_event(self.workflow_id, "completed", steps_completed=self.completed_steps, **fields)
+
+    async def failed(self, error: str, **fields):
+        await publish_workflow_event(
+            self.workflow_id, "failed",
+            error=error,
+            steps_completed=self.completed_steps,
+            **fields
+        )
+
+class ProgressHub:
+    """One pub/sub connection per process, fanned out to local SSE subscribers
+
+    Channels are subscribed while at least one local listener needs them, so
+    any API worker can serve any client regardless of where the work runs.
+    """
+
+    def __init__(self, redis_url: str, subscriber_buffer: int = 100):
+        self.redis_url = redis_url
+        self.subscriber_buffer = subscriber_buffer
+        self.client = None
+        self.pubsub = None
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._subscribed = asyncio.Event()
+        self._reader: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self.client = aioredis.from_url(self.redis_url)
+        self.pubsub = self.client.pubsub()
+        self._reader = asyncio.create_task(self._read())
+
+    async def stop(self):
+        if self._reader:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        if self.pubsub:
+            await self.pubsub.close()
+        if self.client:
+            await self.client.close()
+
+    async def latest_seq(self, channel: str) -> int:
+        """Sequence number of the last event published on a channel, or 0"""
+        seq = await self.client.get(f"{channel}:seq")
+        return int(seq) if seq else 0
+
+    async def history(self, channel: str) -> List[Dict[str, Any]]:
+        """Recent events on a channel, oldest first"""
+        return [json.loads(event) for event in await self.client.lrange(f"{channel}:history", 0, -1)]
+
+    @asynccontextmanager
+    async def listen(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        """Receive a channel's events on a queue for the duration of the block"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_buffer)
+        listeners = self._listeners.setdefault(channel, set())
+        listeners.add(queue)
+        if len(listeners) == 1:
+            await self.pubsub.subscribe(channel)
+            self._subscribed.set()
+        try:
+            yield queue
+        finally:
+            listeners.discard(queue)
+            if not listeners:
+                del self._listeners[channel]
+                try:
+                    await self.pubsub.unsubscribe(channel)
+                except Exception as e:
+                    logger.debug(f"Error unsubscribing from {channel}: {str(e)}")
+
+    async def _read(self):
+        """Deliver pub/sub messages to local listeners"""
+        while True:
+            try:
+                # get_message fails until the connection has a subscription
+                await self._subscribed.wait()
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message["type"] != "message":
+                    continue
+                channel = message["channel"].decode()
+                event = json.loads(message["data"])
+                for queue in list(self._listeners.get(channel, ())):
+                    if queue.full():
+                        # A slow client loses intermediate steps, never the newest event
+                        queue.get_nowait()
+                    queue.put_nowait(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error reading progress events: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def stream(self, channel: str, last_seq: int = 0,
+                     snapshot: Optional[Dict[str, Any]] = None,
+                     is_disconnected=None) -> AsyncIterator[str]:
+        """Yield SSE frames for a channel until a terminal event or disconnect
+
+        Subscribes before replaying history, so no event between the two is lost.
+        A snapshot of the current state, if given, is sent first; pass the
+        sequence read before taking it as last_seq so older events are skipped.
+        """
+        async with self.listen(channel) as queue:
+            if snapshot is not None:
+                yield format_sse(snapshot)
+                if snapshot.get("status") in TERMINAL_EVENTS:
+                    return
+
+            for event in await self.history(channel):
+                if event["seq"] > last_seq:
+                    last_seq = event["seq"]
+                    yield format_sse(event)
+                    if event["event"] in TERMINAL_EVENTS:
+                        return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=config.progress_keepalive_interval)
+                except asyncio.TimeoutError:
+                    if is_disconnected and await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+
+                if event["seq"] <= last_seq:
+                    continue
+                last_seq = event["seq"]
+                yield format_sse(event)
+                if event["event"] in TERMINAL_EVENTS:
+                    return
+
+_hub: Optional[ProgressHub] = None
+
+def get_progress_hub() -> Optional[ProgressHub]:
+    """The hub running in this worker, if any"""
+    return _hub
+
+async def start_progress_hub() -> ProgressHub:
+    """Open this worker's pub/sub connection for progress subscribers"""
+    global _hub
+    if _hub is None:
+        hub = ProgressHub(config.redis_url, subscriber_buffer=config.progress_subscriber_buffer)
+        await hub.start()
+        _hub = hub
+    return _hub
+
+async def stop_progress_hub():
+    """Close this worker's pub/sub connection"""
+    global _hub
+    if _hub is not None:
+        await _hub.stop()
+        _hub = None
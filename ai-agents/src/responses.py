@@ -0,0 +1,209 @@
+"""
+API Responses
+Fast JSON rendering, `fields=` projection and response compression for the agent API
+"""
+
+import gzip
+import json
+import logging
+from contextvars import ContextVar
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Paths requested through ?fields= for the current request, already parsed
+_requested_fields: ContextVar[Optional[Dict[str, Any]]] = ContextVar("requested_fields", default=None)
+
+# Streaming bodies are never buffered, and these are never compressed
+UNCOMPRESSED_CONTENT_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+def parse_fields(spec: str) -> Optional[Dict[str, Any]]:
+    """Parse "status,next_actions,result.status" into a tree of requested paths"""
+    tree: Dict[str, Any] = {}
+    for path in spec.split(","):
+        parts = [part.strip() for part in path.split(".") if part.strip()]
+        if not parts:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:
+                # A shorter path already asked for the whole value
+                break
+            node = child
+        else:
+            node[parts[-1]] = None
+    return tree or None
+
+def project(content: Any, fields: Optional[Dict[str, Any]]) -> Any:
+    """Keep only the requested paths; lists are projected item by item"""
+    if fields is None:
+        return content
+    if isinstance(content, list):
+        return [project(item, fields) for item in content]
+    if not isinstance(content, dict):
+        return content
+    return {
+        name: project(content[name], subfields)
+        for name, subfields in fields.items()
+        if name in content
+    }
+
+def _default(value: Any) -> Any:
+    """Encode the values FastAPI's encoder would otherwise have converted"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "dict") and callable(value.dict):
+        return value.dict()
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, honouring the request's ?fields= projection
+
+    Endpoints that return this directly also skip FastAPI's jsonable_encoder
+    pass over the whole payload, which dominates serialization time for large
+    workflow and analytics results.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(project(content, _requested_fields.get()))
+
+class FieldSelectionMiddleware:
+    """Makes ?fields=a,b.c available to FastJSONResponse for the current request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or b"fields=" not in scope.get("query_string", b""):
+            await self.app(scope, receive, send)
+            return
+
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        token = _requested_fields.set(parse_fields(",".join(query.get("fields", []))))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _requested_fields.reset(token)
+
+def _accepted_encodings(header: str) -> List[str]:
+    """Encodings the client accepts, ignoring any refused with q=0"""
+    accepted = []
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.append(name.strip().lower())
+    return accepted
+
+class CompressionMiddleware:
+    """Brotli or gzip for single-body responses of at least `minimum_size` bytes
+
+    Streaming responses such as server-sent events pass through untouched, so
+    no frame is ever held back waiting for a compression buffer to fill.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose(self, scope) -> Optional[str]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        encoding = self._choose(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held until the first body message shows whether the body is complete
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            response_start, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=response_start["headers"])
+            content_type = headers.get("content-type", "")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or content_type.startswith(UNCOMPRESSED_CONTENT_TYPES)
+            ):
+                await send(response_start)
+                await send(message)
+                return
+
+            compressed = self._compress(encoding, body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(response_start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,177 @@
+"""
+Agent Task Scheduler
+Priority ordering with aging, and weighted fair sharing of worker slots between tenants
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Highest first; tasks are stored and claimed per level
+PRIORITY_LEVELS = ("urgent", "high", "normal", "low")
+
+PRIORITY_ALIASES = {
+    "critical": "urgent",
+    "emergency": "urgent",
+    "immediate": "urgent",
+    "medium": "normal",
+    "standard": "normal",
+    "bulk": "low",
+    "background": "low",
+    "backfill": "low"
+}
+
+DEFAULT_TENANT = "default"
+
+def normalize_priority(priority: Any) -> str:
+    """Map a priority name or alias onto one of PRIORITY_LEVELS, defaulting to normal"""
+    if isinstance(priority, str):
+        name = priority.strip().lower()
+        name = PRIORITY_ALIASES.get(name, name)
+        if name in PRIORITY_LEVELS:
+            return name
+    return "normal"
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """Parse "payroll=3,hr=2,analytics=0.5" into tenant weights"""
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        tenant, _, weight = part.partition("=")
+        weights[tenant.strip()] = float(weight)
+    return weights
+
+class _Tenant:
+    """Pending work and slot usage of one tenant"""
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        # Oldest first within a level: (enqueued_at, sequence, item)
+        self.queues: Dict[str, List[Tuple[float, int, Any]]] = {level: [] for level in PRIORITY_LEVELS}
+        self.running = 0
+        self.pending = 0
+        # Weighted count of dispatched tasks; breaks ties between equally loaded tenants
+        self.virtual_time = 0.0
+
+class FairScheduler:
+    """Orders pending work by aged priority, sharing slots between tenants by weight
+
+    A task's effective priority improves by one level for every `aging_interval`
+    seconds it has waited, up to high, so low-priority work cannot starve and
+    urgent work always goes first. Among tenants whose
+    best task is within one level of the best overall, the tenant using the
+    smallest share of its weighted slots goes next.
+    """
+
+    def __init__(self, aging_interval: float = 60.0, weights: Optional[Dict[str, float]] = None,
+                 default_weight: float = 1.0):
+        self.aging_interval = aging_interval
+        self.weights = weights or {}
+        self.default_weight = default_weight
+        self._tenants: Dict[str, _Tenant] = {}
+        self._size = 0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def _tenant(self, name: str) -> _Tenant:
+        tenant = self._tenants.get(name)
+        if tenant is None:
+            tenant = _Tenant(max(self.weights.get(name, self.default_weight), 0.001))
+            self._tenants[name] = tenant
+        return tenant
+
+    def push(self, item: Any, priority: Any = None, tenant: Any = None,
+             enqueued_at: Optional[float] = None):
+        """Add pending work; enqueued_at is wall-clock time and drives aging"""
+        level = normalize_priority(priority)
+        with self._lock:
+            state = self._tenant(DEFAULT_TENANT if tenant in (None, "") else str(tenant))
+            enqueued_at = enqueued_at if enqueued_at is not None else time.time()
+            heapq.heappush(state.queues[level], (enqueued_at, next(self._sequence), item))
+            state.pending += 1
+            self._size += 1
+
+    def _best(self, state: _Tenant, now: float) -> Tuple[float, Optional[str]]:
+        """Best effective priority among a tenant's queue heads; caller holds the lock"""
+        best, best_level = math.inf, None
+        for rank, level in enumerate(PRIORITY_LEVELS):
+            queue = state.queues[level]
+            if queue:
+                effective = rank - (now - queue[0][0]) / self.aging_interval
+                if rank > 0:
+                    # Aged work can reach high but never competes with urgent
+                    effective = max(effective, 1.0)
+                if effective < best:
+                    best, best_level = effective, level
+        return best, best_level
+
+    def pop(self) -> Optional[Tuple[Any, str, str]]:
+        """Take the next item to run as (item, priority, tenant), or None when idle
+
+        The caller must report `finished(tenant)` once the item is done.
+        """
+        now = time.time()
+        with self._lock:
+            heads = []
+            for name, state in self._tenants.items():
+                if state.pending:
+                    effective, level = self._best(state, now)
+                    heads.append((effective, name, state, level))
+            if not heads:
+                return None
+
+            best = min(head[0] for head in heads)
+            _, name, state, level = min(
+                (head for head in heads if head[0] < best + 1),
+                key=lambda head: (head[2].running / head[2].weight, head[2].virtual_time, head[0])
+            )
+
+            _, _, item = heapq.heappop(state.queues[level])
+            state.pending -= 1
+            state.running += 1
+            state.virtual_time += 1 / state.weight
+            self._size -= 1
+            return item, level, name
+
+    def finished(self, tenant: str):
+        """Release the slot held by a tenant's task"""
+        with self._lock:
+            state = self._tenants.get(tenant)
+            if state is None:
+                return
+            state.running = max(state.running - 1, 0)
+            if not state.running and not state.pending:
+                # Idle tenants start afresh rather than banking credit
+                del self._tenants[tenant]
+
+    def pending(self) -> List[Any]:
+        """Snapshot of items waiting to run"""
+        with self._lock:
+            return [item for state in self._tenants.values()
+                    for queue in state.queues.values() for _, _, item in queue]
+
+    def drain(self) -> List[Any]:
+        """Remove and return every waiting item"""
+        with self._lock:
+            items = []
+            for name, state in list(self._tenants.items()):
+                for queue in state.queues.values():
+                    items.extend(item for _, _, item in sorted(queue))
+                    queue.clear()
+                state.pending = 0
+                if not state.running:
+                    del self._tenants[name]
+            self._size = 0
+        return items
+
+    def running(self) -> Dict[str, int]:
+        """Slots in use per tenant"""
+        with self._lock:
+            return {name: state.running for name, state in self._tenants.items() if state.running}
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,379 @@
+"""
+Agent Task Queue
+Durable queue of agent tasks on Redis Streams, with an in-memory stand-in for local development
+"""
+
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import redis
+
+from config.agent_config import config
+from src.monitoring import task_retries, task_dead_letters
+from src.scheduler import PRIORITY_LEVELS, normalize_priority
+from src.task_state import get_task_state_store
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class QueuedTask:
+    """A task claimed by a worker, acknowledged once it has been handled"""
+    entry_id: str
+    payload: Dict[str, Any]
+    deliveries: int = 1
+    stream: str = ""
+
+    @property
+    def attempts(self) -> int:
+        """Attempts so far, counting requeues and redeliveries after a crash"""
+        return self.payload.get("attempts", 0) + self.deliveries
+
+def _stamp(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in queue bookkeeping fields"""
+    payload.setdefault("enqueued_at", time.time())
+    payload.setdefault("attempts", 0)
+    payload["priority"] = normalize_priority(payload.get("priority"))
+    return payload
+
+class RedisStreamQueue:
+    """Consumer-group queue: unacknowledged entries are reclaimed after the visibility timeout
+
+    Each priority level has its own stream, so urgent work is never read from
+    behind a backlog of low-priority entries. Normal priority keeps the base
+    stream name.
+    """
+
+    def __init__(self, redis_url: str, stream: str, group: str, visibility_timeout: float = 300.0,
+                 max_attempts: int = 3, dead_letter_length: int = 10000):
+        self.client = redis.Redis.from_url(redis_url)
+        self.stream = stream
+        self.streams = {
+            level: stream if level == "normal" else f"{stream}:{level}"
+            for level in PRIORITY_LEVELS
+        }
+        self.group = group
+        self.dead_letter_stream = f"{stream}:dead"
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.dead_letter_length = dead_letter_length
+
+    def ensure_group(self):
+        """Create the streams and consumer groups if they do not exist yet"""
+        for stream in self.streams.values():
+            try:
+                self.client.xgroup_create(stream, self.group, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        return self.enqueue_many([payload])[0]
+
+    def enqueue_many(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        """Append tasks in one round trip, returning their entry ids"""
+        pipe = self.client.pipeline(transaction=False)
+        for payload in payloads:
+            payload = _stamp(payload)
+            pipe.xadd(self.streams[payload["priority"]], {"payload": json.dumps(payload, default=str)})
+        return [entry_id.decode() for entry_id in pipe.execute()]
+
+    @staticmethod
+    def _decode(entry_id, fields) -> Tuple[str, Optional[Dict[str, Any]]]:
+        entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+        if not fields:
+            return entry_id, None
+        return entry_id, json.loads(fields[b"payload"])
+
+    def claim(self, consumer: str, count: int, block_ms: int = 1000) -> List[QueuedTask]:
+        """Reclaim stalled entries first, then read new ones
+
+        New entries are read from every priority stream at once, so up to
+        `count` per stream may be returned; the worker's scheduler orders them.
+        """
+        tasks = []
+
+        # Entries idle past the visibility timeout belong to a crashed or stuck worker
+        for stream in self.streams.values():
+            _, reclaimed, *_ = self.client.xautoclaim(
+                stream, self.group, consumer,
+                min_idle_time=int(self.visibility_timeout * 1000),
+                start_id="0-0",
+                count=count - len(tasks)
+            )
+            if reclaimed:
+                tasks.extend(self._redelivered(stream, reclaimed))
+            if len(tasks) >= count:
+                return tasks
+
+        response = self.client.xreadgroup(
+            self.group, consumer, {stream: ">" for stream in self.streams.values()},
+            count=count - len(tasks),
+            block=block_ms
+        )
+        for stream, entries in response or []:
+            stream = stream.decode() if isinstance(stream, bytes) else stream
+            for entry_id, fields in entries:
+                entry_id, payload = self._decode(entry_id, fields)
+                if payload is not None:
+                    tasks.append(QueuedTask(entry_id, payload, stream=stream))
+
+        return tasks
+
+    def _redelivered(self, stream: str, entries) -> List[QueuedTask]:
+        """Wrap reclaimed entries, dead-lettering those that keep killing their worker"""
+        pipe = self.client.pipeline(transaction=False)
+        decoded = [self._decode(entry_id, fields) for entry_id, fields in entries]
+        for entry_id, _ in decoded:
+            pipe.xpending_range(stream, self.group, min=entry_id, max=entry_id, count=1)
+        pending = pipe.execute()
+
+        tasks = []
+        for (entry_id, payload), info in zip(decoded, pending):
+            if payload is None:
+                self.client.xack(stream, self.group, entry_id)
+                continue
+            task = QueuedTask(entry_id, payload, deliveries=info[0]["times_delivered"] if info else 1, stream=stream)
+            if task.attempts > self.max_attempts:
+                self.dead_letter(task, "Exceeded visibility timeout on every attempt")
+                continue
+            logger.warning(f"Reclaimed task {payload.get('task_id')} after visibility timeout")
+            tasks.append(task)
+        return tasks
+
+    def ack(self, task: QueuedTask):
+        """Mark a task handled and drop it from the stream"""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.xack(task.stream, self.group, task.entry_id)
+        pipe.xdel(task.stream, task.entry_id)
+        pipe.execute()
+
+    def touch(self, tasks: List[QueuedTask], consumer: str):
+        """Reset the idle time of claimed tasks so they are not reclaimed"""
+        by_stream: Dict[str, List[str]] = {}
+        for task in tasks:
+            by_stream.setdefault(task.stream, []).append(task.entry_id)
+        if not by_stream:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for stream, entry_ids in by_stream.items():
+            pipe.xclaim(stream, self.group, consumer, min_idle_time=0, message_ids=entry_ids, justid=True)
+        pipe.execute()
+
+    def _requeue(self, task: QueuedTask, payload: Dict[str, Any]):
+        """Append a fresh copy of a claimed task and drop the original"""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xadd(task.stream, {"payload": json.dumps(payload, default=str)})
+        pipe.xack(task.stream, self.group, task.entry_id)
+        pipe.xdel(task.stream, task.entry_id)
+        pipe.execute()
+
+    def release(self, task: QueuedTask):
+        """Give back a claimed task that never started, without using up an attempt"""
+        self._requeue(task, task.payload)
+
+    def retry(self, task: QueuedTask, error: str) -> bool:
+        """Requeue a failed task, or dead-letter it once out of attempts; True if requeued"""
+        if task.attempts >= self.max_attempts:
+            self.dead_letter(task, error)
+            return False
+
+        self._requeue(task, dict(task.payload, attempts=task.attempts, last_error=error))
+        task_retries.labels(agent_type=task.payload.get("agent_type")).inc()
+        return True
+
+    def dead_letter(self, task: QueuedTask, error: str):
+        """Move a task to the dead-letter stream for inspection"""
+        pipe = self.client.pipeline(transaction=True)
+        pipe.xadd(
+            self.dead_letter_stream,
+            {"payload": json.dumps(task.payload, default=str), "error": error, "failed_at": str(time.time())},
+            maxlen=self.dead_letter_length,
+            approximate=True
+        )
+        pipe.xack(task.stream, self.group, task.entry_id)
+        pipe.xdel(task.stream, task.entry_id)
+        pipe.execute()
+        task_dead_letters.labels(agent_type=task.payload.get("agent_type")).inc()
+        logger.error(f"Dead-lettered task {task.payload.get('task_id')}: {error}")
+
+    def depth(self) -> int:
+        """Tasks waiting or claimed but not yet acknowledged"""
+        pipe = self.client.pipeline(transaction=False)
+        for stream in self.streams.values():
+            pipe.xlen(stream)
+        return sum(pipe.execute())
+
+    def in_flight(self) -> int:
+        pipe = self.client.pipeline(transaction=False)
+        for stream in self.streams.values():
+            pipe.xpending(stream, self.group)
+        return sum(pending["pending"] for pending in pipe.execute())
+
+    def remove_consumer(self, consumer: str):
+        """Forget a consumer after it shut down cleanly"""
+        for stream in self.streams.values():
+            self.client.xgroup_delconsumer(stream, self.group, consumer)
+
+class LocalTaskQueue:
+    """In-memory stand-in with the same semantics, for a single process"""
+
+    def __init__(self, visibility_timeout: float = 300.0, max_attempts: int = 3, dead_letter_length: int = 10000):
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=dead_letter_length)
+        self._ready: Dict[str, Deque[QueuedTask]] = {level: deque() for level in PRIORITY_LEVELS}
+        self._claimed: Dict[str, Tuple[QueuedTask, float]] = {}
+        self._ids = itertools.count()
+        self._condition = threading.Condition()
+
+    def ensure_group(self):
+        pass
+
+    def enqueue(self, payload: Dict[str, Any]) -> str:
+        return self.enqueue_many([payload])[0]
+
+    def enqueue_many(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        entry_ids = []
+        with self._condition:
+            for payload in payloads:
+                entry_id = f"{int(time.time() * 1000)}-{next(self._ids)}"
+                payload = _stamp(payload)
+                self._ready[payload["priority"]].append(
+                    QueuedTask(entry_id, payload, deliveries=0, stream=payload["priority"])
+                )
+                entry_ids.append(entry_id)
+            self._condition.notify_all()
+        return entry_ids
+
+    def claim(self, consumer: str, count: int, block_ms: int = 1000) -> List[QueuedTask]:
+        """Take up to count tasks per priority, waiting at most block_ms for the first"""
+        deadline = time.monotonic() + block_ms / 1000
+        with self._condition:
+            self._reclaim_expired()
+            while not any(self._ready.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._condition.wait(remaining)
+                self._reclaim_expired()
+
+            tasks = []
+            for ready in self._ready.values():
+                for _ in range(min(count, len(ready))):
+                    task = ready.popleft()
+                    task.deliveries += 1
+                    self._claimed[task.entry_id] = (task, time.monotonic() + self.visibility_timeout)
+                    tasks.append(task)
+            return tasks
+
+    def _reclaim_expired(self):
+        """Return timed-out claims to the front of the queue; caller holds the lock"""
+        now = time.monotonic()
+        for entry_id, (task, expires_at) in list(self._claimed.items()):
+            if expires_at <= now:
+                del self._claimed[entry_id]
+                if task.attempts >= self.max_attempts:
+                    self._dead_letter(task, "Exceeded visibility timeout on every attempt")
+                else:
+                    self._ready[task.stream].appendleft(task)
+
+    def ack(self, task: QueuedTask):
+        with self._condition:
+            self._claimed.pop(task.entry_id, None)
+
+    def touch(self, tasks: List[QueuedTask], consumer: str):
+        with self._condition:
+            for task in tasks:
+                if task.entry_id in self._claimed:
+                    self._claimed[task.entry_id] = (task, time.monotonic() + self.visibility_timeout)
+
+    def _requeue(self, task: QueuedTask, payload: Dict[str, Any]):
+        with self._condition:
+            self._claimed.pop(task.entry_id, None)
+            self._ready[task.stream].append(QueuedTask(task.entry_id, payload, deliveries=0, stream=task.stream))
+            self._condition.notify_all()
+
+    def release(self, task: QueuedTask):
+        self._requeue(task, task.payload)
+
+    def retry(self, task: QueuedTask, error: str) -> bool:
+        if task.attempts >= self.max_attempts:
+            self.dead_letter(task, error)
+            return False
+        self._requeue(task, dict(task.payload, attempts=task.attempts, last_error=error))
+        task_retries.labels(agent_type=task.payload.get("agent_type")).inc()
+        return True
+
+    def dead_letter(self, task: QueuedTask, error: str):
+        with self._condition:
+            self._claimed.pop(task.entry_id, None)
+            self._dead_letter(task, error)
+
+    def _dead_letter(self, task: QueuedTask, error: str):
+        """Record a dead letter; caller holds the lock"""
+        self.dead_letters.append({"payload": task.payload, "error": error, "failed_at": time.time()})
+        task_dead_letters.labels(agent_type=task.payload.get("agent_type")).inc()
+        logger.error(f"Dead-lettered task {task.payload.get('task_id')}: {error}")
+
+    def depth(self) -> int:
+        with self._condition:
+            return sum(len(ready) for ready in self._ready.values()) + len(self._claimed)
+
+    def in_flight(self) -> int:
+        with self._condition:
+            return len(self._claimed)
+
+    def remove_consumer(self, consumer: str):
+        pass
+
+_task_queue = None
+_queue_lock = threading.Lock()
+
+def get_task_queue():
+    """Get the configured task queue, creating it on first use"""
+    global _task_queue
+    if _task_queue is None:
+        with _queue_lock:
+            if _task_queue is None:
+                if config.task_queue_backend == "local":
+                    queue = LocalTaskQueue(
+                        visibility_timeout=config.task_queue_visibility_timeout,
+                        max_attempts=config.task_queue_max_attempts,
+                        dead_letter_length=config.task_queue_dead_letter_length
+                    )
+                elif config.task_queue_backend == "redis":
+                    queue = RedisStreamQueue(
+                        redis_url=config.redis_url,
+                        stream=config.task_queue_stream,
+                        group=config.task_queue_group,
+                        visibility_timeout=config.task_queue_visibility_timeout,
+                        max_attempts=config.task_queue_max_attempts,
+                        dead_letter_length=config.task_queue_dead_letter_length
+                    )
+                else:
+                    raise ValueError(f"Unknown task queue backend: {config.task_queue_backend}")
+                queue.ensure_group()
+                _task_queue = queue
+    return _task_queue
+
+def submit_tasks(payloads: List[Dict[str, Any]]) -> List[str]:
+    """Record new tasks as queued and hand them to the workers; blocking, returns their task ids"""
+    get_task_state_store().create_many([
+        {
+            "task_id": payload["task_id"],
+            "agent_type": payload["agent_type"],
+            "task": payload["task"],
+            "data": payload.get("data"),
+            "priority": normalize_priority(payload.get("priority")),
+            "tenant": payload.get("tenant")
+        }
+        for payload in payloads
+    ])
+    get_task_queue().enqueue_many(payloads)
+    return [payload["task_id"] for payload in payloads]
@@ -0,0 +1,119 @@
+"""
+Agent Task State
+One Redis hash per task, updated atomically through its lifecycle and read in pipelined batches
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from config.agent_config import config
+
+logger = logging.getLogger(__name__)
+
+# Fields holding structured values, stored as JSON
+JSON_FIELDS = ("data", "result")
+
+# Applies an update unless the task already finished, so a late or duplicate
+# "processing" write can never overwrite a result. Refreshes the TTL.
+UPDATE_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status == 'completed' or status == 'failed' then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+    encoded = {}
+    for name, value in fields.items():
+        if value is None:
+            continue
+        if name in JSON_FIELDS:
+            encoded[name] = json.dumps(value, default=str)
+        else:
+            encoded[name] = str(value)
+    return encoded
+
+def _decode(fields: Dict[str, str]) -> Dict[str, Any]:
+    decoded = dict(fields)
+    for name in JSON_FIELDS:
+        if name in decoded:
+            decoded[name] = json.loads(decoded[name])
+    if "attempt" in decoded:
+        decoded["attempt"] = int(decoded["attempt"])
+    return decoded
+
+class TaskStateStore:
+    """Lifecycle record of agent tasks, one hash per task"""
+
+    def __init__(self, redis_url: str, prefix: str = "agent-task", ttl: int = 3600):
+        self.client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.prefix = prefix
+        self.ttl = ttl
+        self._update = self.client.register_script(UPDATE_SCRIPT)
+
+    def key(self, task_id: str) -> str:
+        return f"{self.prefix}:{task_id}"
+
+    def create(self, task_id: str, **fields) -> Dict[str, Any]:
+        return self.create_many([dict(fields, task_id=task_id)])[0]
+
+    def create_many(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write new task records in one round trip; each needs a task_id"""
+        pipe = self.client.pipeline(transaction=True)
+        records = []
+        for task in tasks:
+            record = dict(task)
+            record.setdefault("status", "queued")
+            record.setdefault("created_at", datetime.now().isoformat())
+            key = self.key(record["task_id"])
+            pipe.delete(key)
+            pipe.hset(key, mapping=_encode(record))
+            pipe.expire(key, self.ttl)
+            records.append(record)
+        pipe.execute()
+        return records
+
+    def update(self, task_id: str, status: str, **fields) -> bool:
+        """Move a task to a new status; False if it had already finished"""
+        encoded = _encode(dict(fields, task_id=task_id, status=status))
+        args = [self.ttl]
+        for name, value in encoded.items():
+            args.extend((name, value))
+        return bool(self._update(keys=[self.key(task_id)], args=args))
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([task_id])[task_id]
+
+    def get_many(self, task_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Read many task records in one round trip; missing tasks map to None"""
+        pipe = self.client.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hgetall(self.key(task_id))
+        return {
+            task_id: _decode(fields) if fields else None
+            for task_id, fields in zip(task_ids, pipe.execute())
+        }
+
+_task_state_store = None
+_store_lock = threading.Lock()
+
+def get_task_state_store() -> TaskStateStore:
+    """Get the shared task state store, creating it on first use"""
+    global _task_state_store
+    if _task_state_store is None:
+        with _store_lock:
+            if _task_state_store is None:
+                _task_state_store = TaskStateStore(
+                    config.redis_url,
+                    prefix=config.task_state_prefix,
+                    ttl=config.task_state_ttl
+                )
+    return _task_state_store
@@ -0,0 +1,280 @@
+"""
+Agent Task Worker
+Runs queued agent tasks in a process pool, separate from the web workers
+"""
+
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.agent_config import config
+from src.monitoring import (
+    agent_monitor, start_prometheus_server,
+    task_queue_depth, task_queue_in_flight, task_queue_wait_time, task_slots_in_use
+)
+from src.progress import publish_task_event
+from src.scheduler import FairScheduler, parse_weights
+from src.task_queue import QueuedTask, get_task_queue
+from src.task_state import get_task_state_store
+
+logger = logging.getLogger(__name__)
+
+def run_task(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute one agent task; runs inside a pool process"""
+    # Imported here so the parent process never builds agents
+    from agents.core_agents import get_agent
+    from agents.specialized_agents import SPECIALIZED_AGENTS
+
+    # Both registries hold ready-built instances
+    agent = get_agent(payload["agent_type"]) or SPECIALIZED_AGENTS.get(payload["agent_type"])
+    if not agent:
+        raise ValueError(f"Agent {payload['agent_type']} not found")
+
+    # This is a simplified execution - in practice, you'd use CrewAI's task execution
+    return {"success": True, "message": f"Task '{payload['task']}' completed", "data": payload.get("data")}
+
+def _record(task_id: str, status: str, **fields):
+    """Update the task's state record and notify subscribers; a failed write must not stop the worker"""
+    try:
+        updated = get_task_state_store().update(task_id, status, **fields)
+    except Exception as e:
+        logger.error(f"Error recording {status} state for task {task_id}: {str(e)}")
+        updated = True
+    if updated:
+        publish_task_event(task_id, status, **fields)
+
+def _create_scheduler() -> FairScheduler:
+    return FairScheduler(
+        aging_interval=config.task_scheduler_aging_interval,
+        weights=parse_weights(config.task_scheduler_tenant_weights)
+    )
+
+class TaskWorker:
+    """Claims tasks from the queue, runs them in an executor and acknowledges them when done
+
+    Claimed tasks wait in a small scheduler buffer, which picks the next one to
+    run by aged priority and each tenant's weighted share of the slots.
+    """
+
+    def __init__(self, queue, executor_factory: Callable[[], Executor], concurrency: int, consumer: str,
+                 poll_interval: float = 1.0, prefetch: int = 0, scheduler: Optional[FairScheduler] = None):
+        self.queue = queue
+        self.executor_factory = executor_factory
+        self.executor = executor_factory()
+        self.concurrency = concurrency
+        self.consumer = consumer
+        self.poll_interval = poll_interval
+        self.prefetch = prefetch
+        self.scheduler = scheduler or _create_scheduler()
+        # Renew claims well before another worker could reclaim them
+        self.heartbeat_interval = max(queue.visibility_timeout / 3, poll_interval)
+        self._running: Dict[Future, Tuple[QueuedTask, str]] = {}
+        self._stopping = threading.Event()
+
+    def stop(self):
+        """Stop claiming new tasks; tasks already running are allowed to finish"""
+        self._stopping.set()
+
+    def run(self):
+        """Work until stopped, then drain in-flight tasks"""
+        logger.info(f"Task worker {self.consumer} started with {self.concurrency} slots")
+        last_heartbeat = time.monotonic()
+
+        while not self._stopping.is_set() or self._running:
+            capacity = self.concurrency + self.prefetch - len(self._running) - len(self.scheduler)
+            if capacity > 0 and not self._stopping.is_set():
+                # Only block on the queue while there is nothing else to wait for
+                idle = not self._running and not len(self.scheduler)
+                block_ms = int(self.poll_interval * 1000) if idle else 1
+                try:
+                    for task in self.queue.claim(self.consumer, capacity, block_ms=block_ms):
+                        self.scheduler.push(
+                            task,
+                            task.payload.get("priority"),
+                            task.payload.get("tenant"),
+                            task.payload.get("enqueued_at")
+                        )
+                except Exception as e:
+                    logger.error(f"Error claiming tasks: {str(e)}")
+                    self._stopping.wait(self.poll_interval)
+
+            while len(self._running) < self.concurrency and not self._stopping.is_set():
+                scheduled = self.scheduler.pop()
+                if scheduled is None:
+                    break
+                task, _, tenant = scheduled
+                self._submit(task, tenant)
+
+            if self._stopping.is_set() and len(self.scheduler):
+                self._release_pending()
+
+            if self._running:
+                done, _ = wait(list(self._running), timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._finish(future, *self._running.pop(future))
+
+            if time.monotonic() - last_heartbeat >= self.heartbeat_interval:
+                claimed = [task for task, _ in self._running.values()] + self.scheduler.pending()
+                try:
+                    self.queue.touch(claimed, self.consumer)
+                except Exception as e:
+                    logger.error(f"Error renewing task claims: {str(e)}")
+                last_heartbeat = time.monotonic()
+
+            self._update_gauges()
+
+        self.executor.shutdown(wait=True)
+        logger.info(f"Task worker {self.consumer} stopped")
+
+    def _release_pending(self):
+        """Hand buffered tasks back to the queue so other workers can run them"""
+        for task in self.scheduler.drain():
+            try:
+                self.queue.release(task)
+            except Exception as e:
+                # Left claimed, so it is reclaimed after the visibility timeout
+                logger.error(f"Error releasing task {task.payload.get('task_id')}: {str(e)}")
+
+    def _submit(self, task: QueuedTask, tenant: str):
+        payload = task.payload
+        task_id = payload["task_id"]
+
+        if task.attempts == 1:
+            task_queue_wait_time.labels(agent_type=payload["agent_type"], priority=payload.get("priority", "normal")).observe(
+                max(time.time() - payload["enqueued_at"], 0.0)
+            )
+
+        _record(task_id, "processing", attempt=task.attempts, started_at=datetime.now().isoformat())
+        agent_monitor.start_task_monitoring(payload["agent_type"], task_id, payload["task"], payload.get("data"))
+
+        try:
+            future = self.executor.submit(run_task, payload)
+        except BrokenProcessPool:
+            self._replace_executor()
+            future = self.executor.submit(run_task, payload)
+        self._running[future] = (task, tenant)
+        task_slots_in_use.labels(tenant=tenant).inc()
+
+    def _replace_executor(self):
+        """A pool process died; start a fresh pool so the worker keeps going"""
+        logger.error("Task process pool is broken, starting a new one")
+        self.executor.shutdown(wait=False)
+        self.executor = self.executor_factory()
+
+    def _finish(self, future: Future, task: QueuedTask, tenant: str):
+        """Record the outcome and acknowledge, requeue or dead-letter the task"""
+        task_id = task.payload["task_id"]
+        self.scheduler.finished(tenant)
+        task_slots_in_use.labels(tenant=tenant).dec()
+        try:
+            result = future.result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._replace_executor()
+            agent_monitor.end_task_monitoring(task_id, "failed", error_message=str(e))
+            try:
+                requeued = self.queue.retry(task, str(e))
+            except Exception as queue_error:
+                # Left unacknowledged, so it is reclaimed after the visibility timeout
+                logger.error(f"Error requeueing task {task_id}: {str(queue_error)}")
+                return
+
+            if requeued:
+                _record(task_id, "retrying", attempt=task.attempts, last_error=str(e))
+            else:
+                _record(task_id, "failed", error=str(e), failed_at=datetime.now().isoformat())
+            return
+
+        _record(task_id, "completed", result=result, completed_at=datetime.now().isoformat())
+        agent_monitor.end_task_monitoring(task_id, "completed", output_data=result)
+        try:
+            self.queue.ack(task)
+        except Exception as e:
+            logger.error(f"Error acknowledging task {task_id}: {str(e)}")
+
+    def _update_gauges(self):
+        try:
+            task_queue_depth.set(self.queue.depth())
+            task_queue_in_flight.set(self.queue.in_flight())
+        except Exception as e:
+            logger.debug(f"Error reading queue gauges: {str(e)}")
+
+_local_worker: Optional[TaskWorker] = None
+_local_thread: Optional[threading.Thread] = None
+
+def start_local_worker():
+    """Run tasks from the in-memory queue on threads inside this process"""
+    global _local_worker, _local_thread
+    if _local_worker is not None:
+        return
+    concurrency = config.task_worker_processes
+    _local_worker = TaskWorker(
+        get_task_queue(),
+        lambda: ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="agent-task"),
+        concurrency=concurrency,
+        consumer="local",
+        poll_interval=config.task_worker_poll_interval,
+        prefetch=config.task_scheduler_prefetch
+    )
+    _local_thread = threading.Thread(target=_local_worker.run, name="agent-task-worker", daemon=True)
+    _local_thread.start()
+
+def stop_local_worker(timeout: Optional[float] = None):
+    """Stop the in-process worker, waiting for running tasks to finish"""
+    global _local_worker, _local_thread
+    if _local_worker is None:
+        return
+    _local_worker.stop()
+    _local_thread.join(timeout)
+    _local_worker = None
+    _local_thread = None
+
+def main():
+    """Entry point for a standalone worker: python -m src.task_worker"""
+    logging.basicConfig(
+        level=getattr(logging, config.agent_log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    if config.task_queue_backend == "local":
+        logger.error("The local task queue only lives inside the API process; use TASK_QUEUE_BACKEND=redis")
+        sys.exit(1)
+
+    queue = get_task_queue()
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    worker = TaskWorker(
+        queue,
+        lambda: ProcessPoolExecutor(max_workers=config.task_worker_processes),
+        concurrency=config.task_worker_processes,
+        consumer=consumer,
+        poll_interval=config.task_worker_poll_interval,
+        prefetch=config.task_scheduler_prefetch
+    )
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}. Draining in-flight tasks...")
+        worker.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    start_prometheus_server(config.task_worker_metrics_port)
+    worker.run()
+
+    # A clean exit leaves nothing pending, so the consumer can be forgotten
+    try:
+        queue.remove_consumer(consumer)
+    except Exception as e:
+        logger.error(f"Error removing consumer {consumer}: {str(e)}")
+
+if __name__ == "__main__":
+    main()
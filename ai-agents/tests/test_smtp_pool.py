@@ -0,0 +1,138 @@
+"""
+SMTP Connection Pool Tests
+Pooled bulk sends against a local aiosmtpd server
+"""
+
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from tools.smtp_pool import SMTPConnectionPool, SMTPSessionError
+
+SENDER = "hr@example.com"
+
+def _message(subject: str) -> str:
+    return f"From: {SENDER}\r\nSubject: {subject}\r\n\r\nBody\r\n"
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class RecordingHandler:
+    """Accepts mail, refusing recipients at refused@ and messages containing REJECT"""
+
+    def __init__(self):
+        self.delivered = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("refused@"):
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if b"REJECT" in envelope.content:
+            return "554 5.6.0 Message rejected"
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+class LocalSMTPServer:
+    """An aiosmtpd server on a fixed port that can be taken down and brought back"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.hostname = "127.0.0.1"
+        self.port = _free_port()
+        self._controller = None
+
+    def start(self):
+        self._controller = Controller(self.handler, hostname=self.hostname, port=self.port)
+        self._controller.start()
+
+    def stop(self):
+        if self._controller is not None:
+            self._controller.stop()
+            self._controller = None
+
+@pytest.fixture
+def handler():
+    return RecordingHandler()
+
+@pytest.fixture
+def smtp_server(handler):
+    server = LocalSMTPServer(handler)
+    server.start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def pool(smtp_server):
+    pool = SMTPConnectionPool(smtp_server.hostname, smtp_server.port, use_tls=False, max_size=2, timeout=5)
+    pool.connects = 0
+    connect = pool._connect
+
+    def counting_connect():
+        pool.connects += 1
+        return connect()
+
+    pool._connect = counting_connect
+    yield pool
+    pool.close()
+
+def test_send_many_reuses_one_session(pool, handler):
+    errors = pool.send_many([(SENDER, f"user{i}@example.com", _message(f"Hello {i}")) for i in range(3)])
+    errors += pool.send_many([(SENDER, "user3@example.com", _message("Hello 3"))])
+
+    assert errors == [None, None, None, None]
+    assert handler.delivered == [f"user{i}@example.com" for i in range(4)]
+    assert pool.connects == 1
+
+def test_send_many_reports_errors_per_envelope(pool, handler):
+    errors = pool.send_many([
+        (SENDER, "first@example.com", _message("First")),
+        (SENDER, None, _message("No recipient")),
+        (SENDER, "refused@example.com", _message("Refused")),
+        (SENDER, "rejected@example.com", _message("REJECT me")),
+        (SENDER, "last@example.com", _message("Last"))
+    ])
+
+    assert errors[0] is None
+    assert errors[1] == "Missing recipient address"
+    assert "550" in errors[2]
+    assert "554" in errors[3]
+    assert errors[4] is None
+    # Refused envelopes do not end the session
+    assert handler.delivered == ["first@example.com", "last@example.com"]
+    assert pool.connects == 1
+
+def test_send_many_reconnects_once_when_session_drops(pool, handler, smtp_server):
+    assert pool.send_many([(SENDER, "before@example.com", _message("Before"))]) == [None]
+
+    # Restarting the server drops the pooled session while it sits idle
+    smtp_server.stop()
+    smtp_server.start()
+
+    errors = pool.send_many([
+        (SENDER, "after1@example.com", _message("After 1")),
+        (SENDER, "after2@example.com", _message("After 2"))
+    ])
+
+    assert errors == [None, None]
+    assert handler.delivered == ["before@example.com", "after1@example.com", "after2@example.com"]
+    assert pool.connects == 2
+
+def test_send_many_raises_session_error_when_reconnect_fails(pool, smtp_server):
+    smtp_server.stop()
+    envelopes = [(SENDER, f"user{i}@example.com", _message(f"Hello {i}")) for i in range(3)]
+
+    with pytest.raises(SMTPSessionError) as raised:
+        pool.send_many(envelopes)
+
+    assert len(raised.value.errors) == len(envelopes)
+    assert all(raised.value.errors)
+    assert pool.connects == 2
+    # Both attempts gave their slot back
+    for _ in range(2):
+        assert pool._slots.acquire(blocking=False)
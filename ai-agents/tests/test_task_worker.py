@@ -0,0 +1,38 @@
+"""
+Agent Task Worker Tests
+Task execution against the core and specialized agent registries
+"""
+
+import sys
+import types
+
+import pytest
+
+from src.task_worker import run_task
+from tools.lazy_registry import LazyRegistry
+
+class PayrollAgentStub:
+    """Stands in for a specialized agent; instances are not callable"""
+
+@pytest.fixture
+def registries(monkeypatch):
+    """Replace both agent registries so run_task needs no agent framework"""
+    core = types.ModuleType("agents.core_agents")
+    core.get_agent = lambda agent_type: None
+    specialized = types.ModuleType("agents.specialized_agents")
+    specialized.SPECIALIZED_AGENTS = LazyRegistry({"payroll_agent": PayrollAgentStub})
+
+    monkeypatch.setitem(sys.modules, "agents.core_agents", core)
+    monkeypatch.setitem(sys.modules, "agents.specialized_agents", specialized)
+    return specialized.SPECIALIZED_AGENTS
+
+def test_run_task_uses_specialized_agent(registries):
+    result = run_task({"agent_type": "payroll_agent", "task": "Review payslip", "data": {"employee_id": 7}})
+
+    assert result["success"] is True
+    assert result["data"] == {"employee_id": 7}
+    assert registries.is_loaded("payroll_agent")
+
+def test_run_task_rejects_unknown_agent(registries):
+    with pytest.raises(ValueError):
+        run_task({"agent_type": "missing_agent", "task": "Anything"})
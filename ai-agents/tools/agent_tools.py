@@ -3,20 +3,48 @@ CrewAI Agent Tools Registry
 Custom tools for Laravel HR system integration
 """
 
-import json
-import requests
-import pandas as pd
-from typing import Any, Dict, List, Optional
+import asyncio
+import contextvars
+import copy
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
 from crewai_tools import BaseTool
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 import redis
-import smtplib
-from email.mime.text import MimeType
-from email.mime.multipart import MimeMultipart
-from twilio.rest import Client as TwilioClient
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 
 from config.agent_config import config
+from tools.db_engine import get_engine, get_async_engine
+from tools.http_client import get_http_session, get_async_http_client
+from tools.smtp_pool import SMTPSessionError, get_smtp_pool
+from tools.streaming_stats import StreamingTableStats
+from tools.memory_codec import get_memory_codec
+from tools.memory_cache import get_memory_cache
+from tools.query_cache import get_query_cache, is_write
+from tools.query_registry import get_query
+from tools.bulk_write import build_bulk_update, chunk_rows, row_key, row_outcomes
+from tools.instrumentation import instrument_tool
+from tools.lazy_registry import LazyRegistry
+from tools.resilience import get_dependency
+from tools.http_cache import AsyncSingleFlight, ConditionalCache, SingleFlight, request_key
+from tools.sms_dispatch import enqueue_sms, get_sms_status, set_sms_status
+from src.executors import cpu_bound
+from src.monitoring import (
+    named_query_duration, named_query_errors,
+    laravel_coalesced_requests, laravel_not_modified_responses
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared by every LaravelAPITool instance in this worker
+_laravel_flight = SingleFlight()
+_laravel_async_flight = AsyncSingleFlight()
+_laravel_response_cache = ConditionalCache(max_size=config.laravel_response_cache_size)
 
 class DatabaseQueryTool(BaseTool):
     """Tool for querying the Laravel database"""
@@ -26,32 +54,243 @@ class DatabaseQueryTool(BaseTool):
     
     def __init__(self):
         super().__init__()
-        self.engine = create_engine(config.database_url)
+        self.engine = get_engine()
     
-    def _run(self, query: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+    def _run(self, query: str, params: Optional[Dict] = None, cache_ttl: Optional[float] = None) -> Dict[str, Any]:
         """Execute database query and return results"""
+        return self._execute(query, text(query), is_write(query), params, cache_ttl)
+    
+    async def _arun(self, query: str, params: Optional[Dict] = None, cache_ttl: Optional[float] = None) -> Dict[str, Any]:
+        """Execute database query on the async pool without blocking the event loop"""
+        return await self._aexecute(query, text(query), is_write(query), params, cache_ttl)
+    
+    def run_named(self, name: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Execute a query from the named query registry"""
+        named = get_query(name)
+        started = time.perf_counter()
+        result = self._execute(named.sql, named.statement, named.writes, params, named.cache_ttl)
+        self._observe_named(name, started, result)
+        return result
+    
+    async def arun_named(self, name: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Execute a query from the named query registry on the async pool"""
+        named = get_query(name)
+        started = time.perf_counter()
+        result = await self._aexecute(named.sql, named.statement, named.writes, params, named.cache_ttl)
+        self._observe_named(name, started, result)
+        return result
+    
+    def iter_rows(self, query: str, params: Optional[Dict] = None, batch_size: Optional[int] = None,
+                  as_dicts: bool = True) -> Iterator[List[Any]]:
+        """Yield row batches from a server-side cursor; close the generator to stop early"""
+        yield from self._iter_statement(text(query), params, batch_size, as_dicts)
+    
+    def iter_named(self, name: str, params: Optional[Dict] = None, batch_size: Optional[int] = None,
+                   as_dicts: bool = True) -> Iterator[List[Any]]:
+        """Yield row batches of a registered query from a server-side cursor"""
+        named = get_query(name)
+        started = time.perf_counter()
+        outcome = {"success": False}
         try:
-            with self.engine.connect() as conn:
-                result = conn.execute(text(query), params or {})
-                
-                if result.returns_rows:
-                    columns = result.keys()
-                    rows = result.fetchall()
-                    return {
-                        "success": True,
-                        "data": [dict(zip(columns, row)) for row in rows],
-                        "row_count": len(rows)
-                    }
-                else:
-                    return {
-                        "success": True,
-                        "rows_affected": result.rowcount
-                    }
+            yield from self._iter_statement(named.statement, params, batch_size, as_dicts)
+            outcome["success"] = True
+        except GeneratorExit:
+            # The consumer stopped early, which is not a query error
+            outcome["success"] = True
+            raise
+        finally:
+            self._observe_named(name, started, outcome)
+    
+    async def aiter_rows(self, query: str, params: Optional[Dict] = None, batch_size: Optional[int] = None,
+                         as_dicts: bool = True) -> AsyncIterator[List[Any]]:
+        """Async-yield row batches from a server-side cursor; wrap in aclosing() to stop early"""
+        # Closing this generator closes the inner one, which releases its connection
+        async with aclosing(self._aiter_statement(text(query), params, batch_size, as_dicts)) as batches:
+            async for batch in batches:
+                yield batch
+    
+    async def aiter_named(self, name: str, params: Optional[Dict] = None, batch_size: Optional[int] = None,
+                          as_dicts: bool = True) -> AsyncIterator[List[Any]]:
+        """Async-yield row batches of a registered query from a server-side cursor"""
+        named = get_query(name)
+        started = time.perf_counter()
+        outcome = {"success": False}
+        try:
+            async with aclosing(self._aiter_statement(named.statement, params, batch_size, as_dicts)) as batches:
+                async for batch in batches:
+                    yield batch
+            outcome["success"] = True
+        except GeneratorExit:
+            outcome["success"] = True
+            raise
+        finally:
+            self._observe_named(name, started, outcome)
+    
+    def _iter_statement(self, statement, params: Optional[Dict], batch_size: Optional[int],
+                        as_dicts: bool) -> Iterator[List[Any]]:
+        """Stream a statement over a dedicated pooled connection"""
+        batch_size = batch_size or config.db_stream_batch_size
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True,
+                max_row_buffer=batch_size
+            ).execute(statement, params or {})
+            for partition in result.partitions(batch_size):
+                yield [dict(row._mapping) for row in partition] if as_dicts else partition
+    
+    async def _aiter_statement(self, statement, params: Optional[Dict], batch_size: Optional[int],
+                               as_dicts: bool) -> AsyncIterator[List[Any]]:
+        """Stream a statement over a dedicated async pooled connection"""
+        batch_size = batch_size or config.db_stream_batch_size
+        async with get_async_engine().connect() as conn:
+            result = await conn.stream(statement, params or {})
+            try:
+                async for partition in result.partitions(batch_size):
+                    yield [dict(row._mapping) for row in partition] if as_dicts else partition
+            finally:
+                await result.close()
+    
+    def bulk_update(self, table: str, key_columns: List[str], set_columns: List[str], rows: List[Dict[str, Any]],
+                    column_types: Optional[Dict[str, str]] = None, extra_set: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Update many rows in one transaction using UPDATE ... FROM (VALUES ...)"""
+        if not rows:
+            return {"success": True, "rows_affected": 0, "results": []}
+        
+        updated = set()
+        try:
+            with self.engine.begin() as conn:
+                for chunk in chunk_rows(rows, len(key_columns) + len(set_columns), config.db_bulk_chunk_size):
+                    sql, params = build_bulk_update(table, key_columns, set_columns, chunk, column_types, extra_set)
+                    updated.update(row_key(row, key_columns) for row in conn.execute(text(sql), params))
+        except Exception as e:
+            return self._bulk_failure(rows, key_columns, e)
+        
+        query_cache = get_query_cache()
+        if query_cache:
+            query_cache.invalidate_for(f"UPDATE {table}")
+        
+        return self._bulk_result(rows, key_columns, updated)
+    
+    async def abulk_update(self, table: str, key_columns: List[str], set_columns: List[str], rows: List[Dict[str, Any]],
+                           column_types: Optional[Dict[str, str]] = None, extra_set: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Update many rows in one transaction on the async pool"""
+        if not rows:
+            return {"success": True, "rows_affected": 0, "results": []}
+        
+        updated = set()
+        try:
+            async with get_async_engine().begin() as conn:
+                for chunk in chunk_rows(rows, len(key_columns) + len(set_columns), config.db_bulk_chunk_size):
+                    sql, params = build_bulk_update(table, key_columns, set_columns, chunk, column_types, extra_set)
+                    result = await conn.execute(text(sql), params)
+                    updated.update(row_key(row, key_columns) for row in result)
+        except Exception as e:
+            return self._bulk_failure(rows, key_columns, e)
+        
+        query_cache = get_query_cache()
+        if query_cache:
+            await asyncio.to_thread(query_cache.invalidate_for, f"UPDATE {table}")
+        
+        return self._bulk_result(rows, key_columns, updated)
+    
+    @staticmethod
+    def _bulk_result(rows: List[Dict[str, Any]], key_columns: List[str], updated) -> Dict[str, Any]:
+        """Summarize a committed bulk write"""
+        results = row_outcomes(rows, key_columns, updated)
+        succeeded = sum(1 for outcome in results if outcome["success"])
+        return {
+            "success": True,
+            "rows_affected": succeeded,
+            "not_found": len(results) - succeeded,
+            "results": results
+        }
+    
+    @staticmethod
+    def _bulk_failure(rows: List[Dict[str, Any]], key_columns: List[str], error: Exception) -> Dict[str, Any]:
+        """The transaction rolled back, so every row failed"""
+        return {
+            "success": False,
+            "error": str(error),
+            "rows_affected": 0,
+            "results": [
+                {"key": {column: row.get(column) for column in key_columns}, "success": False, "error": str(error)}
+                for row in rows
+            ]
+        }
+    
+    @staticmethod
+    def _observe_named(name: str, started: float, result: Dict[str, Any]):
+        """Record latency and failures for a named query"""
+        named_query_duration.labels(query=name).observe(time.perf_counter() - started)
+        if not result.get("success"):
+            named_query_errors.labels(query=name).inc()
+    
+    def _execute(self, query: str, statement, writes: bool, params: Optional[Dict], cache_ttl: Optional[float]) -> Dict[str, Any]:
+        """Run a compiled statement through the result cache and the sync pool"""
+        query_cache = get_query_cache()
+        
+        if query_cache and cache_ttl and not writes:
+            key, cached, versions = query_cache.lookup(query, params)
+            if cached is not None:
+                return cached
+        
+        try:
+            with self.engine.begin() as conn:
+                result = self._format_result(conn.execute(statement, params or {}))
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        if query_cache and writes:
+            query_cache.invalidate_for(query)
+        elif query_cache and cache_ttl:
+            query_cache.store(key, result, cache_ttl, versions)
+        
+        return result
+    
+    async def _aexecute(self, query: str, statement, writes: bool, params: Optional[Dict], cache_ttl: Optional[float]) -> Dict[str, Any]:
+        """Run a compiled statement through the result cache and the async pool"""
+        query_cache = get_query_cache()
+        
+        if query_cache and cache_ttl and not writes:
+            key, cached, versions = query_cache.lookup(query, params)
+            if cached is not None:
+                return cached
+        
+        try:
+            async with get_async_engine().begin() as conn:
+                result = self._format_result(await conn.execute(statement, params or {}))
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
+        
+        if query_cache and writes:
+            await asyncio.to_thread(query_cache.invalidate_for, query)
+        elif query_cache and cache_ttl:
+            query_cache.store(key, result, cache_ttl, versions)
+        
+        return result
+    
+    @staticmethod
+    def _format_result(result) -> Dict[str, Any]:
+        """Convert a SQLAlchemy result into the tool response format"""
+        if result.returns_rows:
+            columns = list(result.keys())
+            data = [dict(zip(columns, row)) for row in result]
+            return {
+                "success": True,
+                "data": data,
+                "row_count": len(data)
+            }
+        else:
+            return {
+                "success": True,
+                "rows_affected": result.rowcount
+            }
 
 class LaravelAPITool(BaseTool):
     """Tool for calling Laravel API endpoints"""
@@ -62,37 +301,246 @@ class LaravelAPITool(BaseTool):
     def _run(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None, headers: Optional[Dict] = None) -> Dict[str, Any]:
         """Make API request to Laravel application"""
         try:
-            url = f"{config.laravel_api_url}/api/{endpoint.lstrip('/')}"
+            url, request_headers = self._prepare_request(endpoint, headers)
             
-            default_headers = {
-                "Authorization": f"Bearer {config.laravel_api_token}",
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
+            if method.upper() == "GET" and data is None:
+                return self._read(url, request_headers)
             
-            if headers:
-                default_headers.update(headers)
-            
-            response = requests.request(
-                method=method.upper(),
-                url=url,
-                json=data,
-                headers=default_headers,
-                timeout=30
-            )
+            response = self._send(method.upper(), url, data, request_headers)
+            return self._format_response(response)
             
+        except Exception as e:
             return {
-                "success": response.status_code < 400,
-                "status_code": response.status_code,
-                "data": response.json() if response.text else None,
-                "headers": dict(response.headers)
+                "success": False,
+                "error": str(e)
             }
+    
+    async def _arun(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None, headers: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make API request to Laravel application without blocking the event loop"""
+        try:
+            url, request_headers = self._prepare_request(endpoint, headers)
+            
+            if method.upper() == "GET" and data is None:
+                return await self._aread(url, request_headers)
+            
+            response = await self._asend(method.upper(), url, data, request_headers)
+            return self._format_response(response)
             
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
+    
+    def batch(self, requests: List[Dict[str, Any]], bulk_endpoint: Optional[str] = None,
+              max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Run many {endpoint, method, data, headers} requests, returning results in input order"""
+        if not requests:
+            return self._batch_result([])
+        
+        if bulk_endpoint:
+            bulk_result = self._bulk(requests, bulk_endpoint)
+            if bulk_result is not None:
+                return bulk_result
+        
+        workers = max(1, min(max_concurrency or config.laravel_batch_concurrency, len(requests) or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each request runs in a copy of the caller's context, so metrics count the batch once
+            futures = [pool.submit(contextvars.copy_context().run, self._run_request, request) for request in requests]
+            results = [future.result() for future in futures]
+        return self._batch_result(results)
+    
+    async def abatch(self, requests: List[Dict[str, Any]], bulk_endpoint: Optional[str] = None,
+                     max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Async counterpart of batch with a bounded number of requests in flight"""
+        if not requests:
+            return self._batch_result([])
+        
+        if bulk_endpoint:
+            bulk_result = await asyncio.to_thread(self._bulk, requests, bulk_endpoint)
+            if bulk_result is not None:
+                return bulk_result
+        
+        semaphore = asyncio.Semaphore(max_concurrency or config.laravel_batch_concurrency)
+        
+        async def run(request: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._arun(
+                    request["endpoint"],
+                    request.get("method", "GET"),
+                    request.get("data"),
+                    request.get("headers")
+                )
+        
+        results = await asyncio.gather(*(run(request) for request in requests))
+        return self._batch_result(list(results))
+    
+    def _run_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self._run(
+            request["endpoint"],
+            request.get("method", "GET"),
+            request.get("data"),
+            request.get("headers")
+        )
+    
+    def _bulk(self, requests: List[Dict[str, Any]], bulk_endpoint: str) -> Optional[Dict[str, Any]]:
+        """Send all payloads to a bulk endpoint, or None when it is missing so callers fan out instead"""
+        result = self._run(bulk_endpoint, "POST", {"items": [request.get("data") for request in requests]})
+        
+        if result.get("status_code") in (404, 405):
+            logger.info(f"Bulk endpoint {bulk_endpoint} unavailable, falling back to concurrent requests")
+            return None
+        
+        if not result["success"]:
+            return self._batch_result([
+                {"success": False, "status_code": result.get("status_code"), "error": result.get("error") or result.get("data")}
+                for _ in requests
+            ])
+        
+        # The bulk endpoint answers with one entry per item, in request order,
+        # either as a bare list or wrapped in a Laravel resource collection
+        payload = result.get("data")
+        items = (payload.get("data") or []) if isinstance(payload, dict) else (payload or [])
+        results = []
+        for index in range(len(requests)):
+            item = items[index] if index < len(items) else None
+            if item is None:
+                results.append({"success": False, "error": "Missing from bulk response"})
+            elif isinstance(item, dict) and item.get("error"):
+                results.append({"success": False, "error": item["error"]})
+            else:
+                results.append({"success": True, "status_code": result["status_code"], "data": item})
+        return self._batch_result(results)
+    
+    @staticmethod
+    def _batch_result(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize per-item results, keeping their order"""
+        succeeded = sum(1 for result in results if result.get("success"))
+        return {
+            "success": succeeded == len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results
+        }
+    
+    def _send(self, method: str, url: str, data: Optional[Dict], headers: Dict[str, str]):
+        """Issue one request through the Laravel bulkhead and circuit breaker"""
+        return get_dependency("laravel").call(
+            get_http_session().request,
+            is_failure=self._is_server_error,
+            method=method,
+            url=url,
+            json=data,
+            headers=headers,
+            timeout=config.laravel_api_timeout
+        )
+    
+    async def _asend(self, method: str, url: str, data: Optional[Dict], headers: Dict[str, str]):
+        """Await one request through the Laravel bulkhead and circuit breaker"""
+        return await get_dependency("laravel").acall(
+            get_async_http_client().request,
+            method,
+            url,
+            json=data,
+            headers=headers,
+            timeout=config.laravel_api_timeout,
+            is_failure=self._is_server_error
+        )
+    
+    def _read(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """GET shared with identical in-flight reads and revalidated against the response cache"""
+        key = request_key(url, headers)
+        if not config.laravel_get_coalescing_enabled:
+            return self._conditional_get(key, url, headers)
+        
+        result, shared = _laravel_flight.do(key, lambda: self._conditional_get(key, url, headers))
+        if shared:
+            laravel_coalesced_requests.inc()
+        # Every caller gets its own copy, since callers may mutate results
+        return copy.deepcopy(result)
+    
+    async def _aread(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Async counterpart of _read"""
+        key = request_key(url, headers)
+        if not config.laravel_get_coalescing_enabled:
+            return await self._aconditional_get(key, url, headers)
+        
+        result, shared = await _laravel_async_flight.do(key, lambda: self._aconditional_get(key, url, headers))
+        if shared:
+            laravel_coalesced_requests.inc()
+        return copy.deepcopy(result)
+    
+    def _conditional_get(self, key: str, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """GET with If-None-Match/If-Modified-Since when a cached copy exists"""
+        validators = _laravel_response_cache.validators(key) if config.laravel_conditional_cache_enabled else {}
+        response = self._send("GET", url, None, {**headers, **validators})
+        
+        result = self._revalidated(key, response, validators)
+        if result is None:
+            # The cached copy was evicted while revalidating, so fetch it in full
+            response = self._send("GET", url, None, headers)
+            result = self._revalidated(key, response, {})
+        return result
+    
+    async def _aconditional_get(self, key: str, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Async counterpart of _conditional_get"""
+        validators = _laravel_response_cache.validators(key) if config.laravel_conditional_cache_enabled else {}
+        response = await self._asend("GET", url, None, {**headers, **validators})
+        
+        result = self._revalidated(key, response, validators)
+        if result is None:
+            response = await self._asend("GET", url, None, headers)
+            result = self._revalidated(key, response, {})
+        return result
+    
+    def _revalidated(self, key: str, response, validators: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Serve a 304 from cache or cache a fresh 200; None if a 304 has nothing cached to serve"""
+        if response.status_code == 304 and validators:
+            cached = _laravel_response_cache.get(key)
+            if cached is None:
+                return None
+            laravel_not_modified_responses.inc()
+            cached["not_modified"] = True
+            return cached
+        
+        result = self._format_response(response)
+        if config.laravel_conditional_cache_enabled:
+            if response.status_code == 200:
+                _laravel_response_cache.store(key, result, result["headers"])
+            else:
+                _laravel_response_cache.discard(key)
+        return result
+    
+    @staticmethod
+    def _prepare_request(endpoint: str, headers: Optional[Dict] = None):
+        """Build the Laravel API URL and request headers"""
+        url = f"{config.laravel_api_url}/api/{endpoint.lstrip('/')}"
+        
+        default_headers = {
+            "Authorization": f"Bearer {config.laravel_api_token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        
+        if headers:
+            default_headers.update(headers)
+        
+        return url, default_headers
+    
+    @staticmethod
+    def _is_server_error(response) -> bool:
+        """Responses that count against the Laravel circuit breaker"""
+        return response.status_code >= 500 or response.status_code == 429
+    
+    @staticmethod
+    def _format_response(response) -> Dict[str, Any]:
+        """Convert an HTTP response into the tool response format"""
+        return {
+            "success": response.status_code < 400,
+            "status_code": response.status_code,
+            "data": response.json() if response.text else None,
+            "headers": dict(response.headers)
+        }
 
 class EmailSenderTool(BaseTool):
     """Tool for sending emails"""
@@ -102,57 +550,147 @@ class EmailSenderTool(BaseTool):
     
     def _run(self, to_email: str, subject: str, body: str, is_html: bool = False) -> Dict[str, Any]:
         """Send email notification"""
+        result = self.send_many([{
+            "to_email": to_email,
+            "subject": subject,
+            "body": body,
+            "is_html": is_html
+        }])
+        
+        if not result["success"]:
+            return {
+                "success": False,
+                "error": result.get("error") or result["results"][0]["error"]
+            }
+        
+        return {
+            "success": True,
+            "message": f"Email sent successfully to {to_email}"
+        }
+    
+    def send_many(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send many emails over a single pooled SMTP session"""
         try:
-            msg = MimeMultipart()
-            msg['From'] = config.smtp_username
-            msg['To'] = to_email
-            msg['Subject'] = subject
+            envelopes = [
+                (config.smtp_username, message.get("to_email"), self._build_message(message))
+                for message in messages
+            ]
             
-            msg.attach(MimeText(body, 'html' if is_html else 'plain'))
+            try:
+                errors = get_dependency("smtp").call(get_smtp_pool().send_many, envelopes)
+            except SMTPSessionError as e:
+                # Counted against the SMTP circuit; messages sent before the failure still report success
+                errors = e.errors
             
-            server = smtplib.SMTP(config.smtp_host, config.smtp_port)
-            server.starttls()
-            server.login(config.smtp_username, config.smtp_password)
-            
-            text = msg.as_string()
-            server.sendmail(config.smtp_username, to_email, text)
-            server.quit()
+            results = []
+            for message, error in zip(messages, errors):
+                outcome = {"to_email": message.get("to_email"), "success": error is None}
+                if error:
+                    outcome["error"] = error
+                results.append(outcome)
             
+            sent = sum(1 for outcome in results if outcome["success"])
             return {
-                "success": True,
-                "message": f"Email sent successfully to {to_email}"
+                "success": sent == len(results),
+                "sent": sent,
+                "failed": len(results) - sent,
+                "results": results
             }
             
         except Exception as e:
             return {
                 "success": False,
-                "error": str(e)
+                "error": str(e),
+                "sent": 0,
+                "failed": len(messages),
+                "results": [
+                    {"to_email": message.get("to_email"), "success": False, "error": str(e)}
+                    for message in messages
+                ]
             }
+    
+    async def asend_many(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send many emails from async code without blocking the event loop"""
+        return await asyncio.to_thread(self.send_many, messages)
+    
+    @staticmethod
+    def _build_message(message: Dict[str, Any]) -> str:
+        """Render a message dict as a MIME document"""
+        msg = MIMEMultipart()
+        msg['From'] = config.smtp_username
+        msg['To'] = message.get("to_email") or ""
+        msg['Subject'] = message.get("subject", "")
+        
+        msg.attach(MIMEText(message.get("body", ""), 'html' if message.get("is_html") else 'plain'))
+        return msg.as_string()
 
 class SMSSenderTool(BaseTool):
     """Tool for sending SMS messages"""
     
     name: str = "SMS Sender Tool"
-    description: str = "Send SMS messages through Twilio"
+    description: str = "Queue SMS messages for rate-limited delivery through the configured provider"
     
     def __init__(self):
         super().__init__()
-        self.client = TwilioClient(config.twilio_account_sid, config.twilio_auth_token)
+        self.redis_client = redis.Redis.from_url(config.redis_url)
     
     def _run(self, to_phone: str, message: str) -> Dict[str, Any]:
-        """Send SMS notification"""
+        """Queue an SMS notification"""
+        result = self.send_many([{"to_phone": to_phone, "message": message}])
+        
+        if not result["success"]:
+            return {
+                "success": False,
+                "error": result["error"]
+            }
+        
+        return {
+            "success": True,
+            "message_id": result["message_ids"][0],
+            "status": "queued"
+        }
+    
+    def send_many(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Queue many {to_phone, message} SMS in a single Redis round trip"""
         try:
-            message = self.client.messages.create(
-                body=message,
-                from_=config.twilio_phone_number,
-                to=to_phone
-            )
-            
+            message_ids = enqueue_sms(self.redis_client, messages)
             return {
                 "success": True,
-                "message_sid": message.sid,
-                "status": message.status
+                "queued": len(message_ids),
+                "message_ids": message_ids
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "queued": 0,
+                "message_ids": []
+            }
+    
+    async def asend_many(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Queue many SMS from async code without blocking the event loop"""
+        return await asyncio.to_thread(self.send_many, messages)
+    
+    def status(self, message_id: str) -> Dict[str, Any]:
+        """Delivery status of a queued SMS"""
+        try:
+            status = get_sms_status(self.redis_client, message_id)
+            if status is None:
+                return {"success": False, "error": "Message not found"}
+            return {"success": True, "data": status}
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
             }
+    
+    def record_status(self, message_id: str, **fields: Any) -> Dict[str, Any]:
+        """Record status fields of a queued SMS, such as a delivery receipt"""
+        try:
+            set_sms_status(self.redis_client, message_id, fields)
+            return {"success": True}
             
         except Exception as e:
             return {
@@ -166,17 +704,26 @@ class DataAnalyzerTool(BaseTool):
     name: str = "Data Analyzer Tool"
     description: str = "Analyze datasets and generate business insights"
     
-    def _run(self, query: str, analysis_type: str = "summary") -> Dict[str, Any]:
+    def __init__(self):
+        super().__init__()
+        self.db_tool = DatabaseQueryTool()
+    
+    @cpu_bound
+    def _run(self, query: str, analysis_type: str = "summary", streaming: bool = False,
+             chunk_size: Optional[int] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Analyze data from database query"""
+        if streaming:
+            return self._run_streaming(query, analysis_type, chunk_size or config.analyzer_stream_chunk_size, params)
+        
         try:
             # Get data from database
-            db_tool = DatabaseQueryTool()
-            result = db_tool._run(query)
+            result = self.db_tool._run(query, params)
             
             if not result["success"]:
                 return result
             
-            # Convert to DataFrame for analysis
+            # Convert to DataFrame for analysis; pandas is only imported once analysis is needed
+            import pandas as pd
             df = pd.DataFrame(result["data"])
             
             if analysis_type == "summary":
@@ -219,43 +766,101 @@ class DataAnalyzerTool(BaseTool):
                 "error": str(e)
             }
 
+    def _run_streaming(self, query: str, analysis_type: str, chunk_size: int, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Analyze data chunk by chunk over a server-side cursor"""
+        if analysis_type not in ("summary", "trends"):
+            return {
+                "success": True,
+                "analysis": {"message": f"Analysis type '{analysis_type}' not supported"},
+                "row_count": 0
+            }
+        
+        try:
+            stats = StreamingTableStats(sample_size=config.analyzer_quantile_sample_size)
+            
+            for chunk in self.db_tool.iter_rows(query, params, batch_size=chunk_size, as_dicts=False):
+                stats.update(chunk[0]._fields, chunk)
+            
+            analysis = stats.summary() if analysis_type == "summary" else stats.trends()
+            
+            return {
+                "success": True,
+                "analysis": analysis,
+                "row_count": stats.total_rows,
+                "streamed": True
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
 class WorkflowEngineTool(BaseTool):
     """Tool for managing workflow operations"""
     
     name: str = "Workflow Engine Tool"
     description: str = "Create and manage automated workflows"
     
+    def __init__(self):
+        super().__init__()
+        self.api_tool = LaravelAPITool()
+    
     def _run(self, action: str, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute workflow operations"""
         try:
-            api_tool = LaravelAPITool()
-            
-            if action == "create":
-                return api_tool._run("workflows", "POST", workflow_data)
-            
-            elif action == "trigger":
-                workflow_id = workflow_data.get("workflow_id")
-                return api_tool._run(f"workflows/{workflow_id}/trigger", "POST", workflow_data)
-            
-            elif action == "status":
-                workflow_id = workflow_data.get("workflow_id")
-                return api_tool._run(f"workflows/{workflow_id}/status", "GET")
-            
-            elif action == "approve":
-                step_id = workflow_data.get("step_id")
-                return api_tool._run(f"workflow-steps/{step_id}/approve", "POST", workflow_data)
+            request = self._route_action(action, workflow_data)
+            if not request:
+                return {
+                    "success": False,
+                    "error": f"Unsupported workflow action: {action}"
+                }
             
-            else:
+            return self.api_tool._run(*request)
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    async def _arun(self, action: str, workflow_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute workflow operations without blocking the event loop"""
+        try:
+            request = self._route_action(action, workflow_data)
+            if not request:
                 return {
                     "success": False,
                     "error": f"Unsupported workflow action: {action}"
                 }
+            
+            return await self.api_tool._arun(*request)
                 
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
+    
+    @staticmethod
+    def _route_action(action: str, workflow_data: Dict[str, Any]):
+        """Map a workflow action to its Laravel endpoint, method and payload"""
+        if action == "create":
+            return ("workflows", "POST", workflow_data)
+        
+        elif action == "trigger":
+            workflow_id = workflow_data.get("workflow_id")
+            return (f"workflows/{workflow_id}/trigger", "POST", workflow_data)
+        
+        elif action == "status":
+            workflow_id = workflow_data.get("workflow_id")
+            return (f"workflows/{workflow_id}/status", "GET")
+        
+        elif action == "approve":
+            step_id = workflow_data.get("step_id")
+            return (f"workflow-steps/{step_id}/approve", "POST", workflow_data)
+        
+        return None
 
 class MemoryStoreTool(BaseTool):
     """Tool for managing agent memory and context"""
@@ -266,23 +871,48 @@ class MemoryStoreTool(BaseTool):
     def __init__(self):
         super().__init__()
         self.redis_client = redis.Redis.from_url(config.redis_url)
+        self.codec = get_memory_codec()
     
     def _run(self, action: str, key: str, data: Optional[Any] = None, ttl: Optional[int] = None) -> Dict[str, Any]:
         """Manage memory operations"""
         try:
+            local_cache = get_memory_cache()
+            
             if action == "set":
+                payload = self.codec.encode(data)
                 if ttl:
-                    self.redis_client.setex(key, ttl, json.dumps(data))
+                    self.redis_client.setex(key, ttl, payload)
                 else:
-                    self.redis_client.set(key, json.dumps(data))
+                    self.redis_client.set(key, payload)
+                
+                if local_cache:
+                    # Filling here could let an older concurrent set in this worker win locally
+                    local_cache.publish(key, self.redis_client)
                 return {"success": True, "message": f"Data stored with key: {key}"}
             
             elif action == "get":
-                result = self.redis_client.get(key)
+                if local_cache:
+                    hit, payload = local_cache.get(key)
+                    if hit:
+                        return {
+                            "success": True,
+                            "data": self.codec.decode(payload)
+                        }
+                    
+                    generation = local_cache.cache.generation
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    result, remaining_ttl = pipe.execute()
+                    if result:
+                        local_cache.fill(key, result, generation, ttl=self._local_ttl(remaining_ttl))
+                else:
+                    result = self.redis_client.get(key)
+                
                 if result:
                     return {
                         "success": True,
-                        "data": json.loads(result.decode('utf-8'))
+                        "data": self.codec.decode(result)
                     }
                 else:
                     return {
@@ -292,6 +922,8 @@ class MemoryStoreTool(BaseTool):
             
             elif action == "delete":
                 deleted = self.redis_client.delete(key)
+                if local_cache:
+                    local_cache.publish(key, self.redis_client)
                 return {
                     "success": True,
                     "deleted": bool(deleted)
@@ -316,18 +948,27 @@ class MemoryStoreTool(BaseTool):
                 "error": str(e)
             }
 
+    @staticmethod
+    def _local_ttl(ttl: Optional[int]) -> Optional[float]:
+        """Never keep a local copy longer than the Redis key lives"""
+        if ttl and ttl > 0:
+            return min(float(ttl), config.memory_local_cache_ttl)
+        return None
+
 class ReportGeneratorTool(BaseTool):
     """Tool for generating business reports"""
     
     name: str = "Report Generator Tool"
     description: str = "Generate formatted business reports and analytics"
     
-    def _run(self, report_type: str, data_query: str, format_type: str = "json") -> Dict[str, Any]:
+    @cpu_bound
+    def _run(self, report_type: str, data_query: str, format_type: str = "json",
+             params: Optional[Dict] = None) -> Dict[str, Any]:
         """Generate business report"""
         try:
             # Get data using analyzer tool
             analyzer = DataAnalyzerTool()
-            data_result = analyzer._run(data_query, "summary")
+            data_result = analyzer._run(data_query, "summary", params=params)
             
             if not data_result["success"]:
                 return data_result
@@ -370,14 +1011,14 @@ class ReportGeneratorTool(BaseTool):
                 "error": str(e)
             }
 
-# Tool registry for easy access
-AGENT_TOOLS = {
-    "database_query": DatabaseQueryTool(),
-    "laravel_api": LaravelAPITool(), 
-    "email_sender": EmailSenderTool(),
-    "sms_sender": SMSSenderTool(),
-    "data_analyzer": DataAnalyzerTool(),
-    "workflow_engine": WorkflowEngineTool(),
-    "memory_store": MemoryStoreTool(),
-    "report_generator": ReportGeneratorTool()
-}
\ No newline at end of file
+# Tool registry for easy access; each tool is built and instrumented on first use
+AGENT_TOOLS = LazyRegistry({
+    "database_query": DatabaseQueryTool,
+    "laravel_api": LaravelAPITool,
+    "email_sender": EmailSenderTool,
+    "sms_sender": SMSSenderTool,
+    "data_analyzer": DataAnalyzerTool,
+    "workflow_engine": WorkflowEngineTool,
+    "memory_store": MemoryStoreTool,
+    "report_generator": ReportGeneratorTool
+}, on_create=instrument_tool)
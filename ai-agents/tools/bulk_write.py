@@ -0,0 +1,77 @@
+"""
+Bulk Write Statements
+Set-based UPDATE ... FROM (VALUES ...) statements for batched writes
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# PostgreSQL caps a single statement at 65535 bind parameters
+MAX_BIND_PARAMETERS = 32000
+
+def _identifier(name: str) -> str:
+    """Reject anything that is not a plain SQL identifier"""
+    if not IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name}")
+    return name
+
+def chunk_rows(rows: Sequence[Dict[str, Any]], column_count: int, chunk_size: int) -> Iterable[Sequence[Dict[str, Any]]]:
+    """Split rows into chunks that stay under the bind parameter limit"""
+    size = max(1, min(chunk_size, MAX_BIND_PARAMETERS // max(column_count, 1)))
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def build_bulk_update(table: str, key_columns: List[str], set_columns: List[str], rows: Sequence[Dict[str, Any]],
+                      column_types: Optional[Dict[str, str]] = None,
+                      extra_set: Optional[Dict[str, str]] = None) -> Tuple[str, Dict[str, Any]]:
+    """Build one UPDATE joined against a VALUES list, returning the keys it touched"""
+    column_types = column_types or {}
+    columns = [_identifier(column) for column in key_columns + set_columns]
+    table = _identifier(table)
+
+    params: Dict[str, Any] = {}
+    value_rows = []
+    for row_index, row in enumerate(rows):
+        placeholders = []
+        for column_index, column in enumerate(columns):
+            name = f"p{row_index}_{column_index}"
+            params[name] = row.get(column)
+            placeholder = f":{name}"
+            if column in column_types:
+                placeholder = f"CAST({placeholder} AS {column_types[column]})"
+            placeholders.append(placeholder)
+        value_rows.append(f"({', '.join(placeholders)})")
+
+    assignments = [f"{column} = v.{column}" for column in set_columns]
+    assignments += [f"{_identifier(column)} = {expression}" for column, expression in (extra_set or {}).items()]
+    join = " AND ".join(f"t.{column} = v.{column}" for column in key_columns)
+    returning = ", ".join(f"t.{column}" for column in key_columns)
+
+    sql = (
+        f"UPDATE {table} AS t SET {', '.join(assignments)} "
+        f"FROM (VALUES {', '.join(value_rows)}) AS v({', '.join(columns)}) "
+        f"WHERE {join} RETURNING {returning}"
+    )
+    return sql, params
+
+def row_key(row: Any, key_columns: List[str]) -> Tuple[str, ...]:
+    """Comparable key for an input dict or a returned row"""
+    if isinstance(row, dict):
+        return tuple(str(row.get(column)) for column in key_columns)
+    return tuple(str(value) for value in row)
+
+def row_outcomes(rows: Sequence[Dict[str, Any]], key_columns: List[str], updated: Set[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    """Per-row result in input order"""
+    outcomes = []
+    for row in rows:
+        matched = row_key(row, key_columns) in updated
+        outcome = {
+            "key": {column: row.get(column) for column in key_columns},
+            "success": matched
+        }
+        if not matched:
+            outcome["error"] = "No matching row"
+        outcomes.append(outcome)
+    return outcomes
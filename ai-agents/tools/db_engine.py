@@ -0,0 +1,57 @@
+"""
+Database Engine Registry
+Shared, pooled SQLAlchemy engines for the Laravel database
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from config.agent_config import config
+
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_engine_lock = threading.Lock()
+
+def _pool_options() -> Dict[str, Any]:
+    """Connection pool settings shared by the sync and async engines"""
+    return {
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping
+    }
+
+def get_engine() -> Engine:
+    """Get the process-wide synchronous engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(config.database_url, **_pool_options())
+    return _engine
+
+def get_async_engine() -> AsyncEngine:
+    """Get the process-wide asyncio engine, creating it on first use"""
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                # asyncpg prepares each distinct statement once per connection
+                url = f"{config.async_database_url}?prepared_statement_cache_size={config.db_prepared_statement_cache_size}"
+                _async_engine = create_async_engine(url, **_pool_options())
+    return _async_engine
+
+async def dispose_engines():
+    """Close all pooled connections held by the shared engines"""
+    global _engine, _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
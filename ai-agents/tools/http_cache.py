@@ -0,0 +1,133 @@
+"""
+HTTP Read Coalescing and Conditional Cache
+Single-flight deduplication of identical GETs and ETag/Last-Modified revalidation
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+def request_key(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+    """Identify a GET by URL and every header that could change the response"""
+    material = json.dumps([url, sorted((headers or {}).items())])
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+class _Call:
+    """One in-flight call shared by a leader and its followers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Collapses concurrent identical calls from threads into one execution"""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run func once per key at a time, returning (result, whether it was shared)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+class AsyncSingleFlight:
+    """Collapses concurrent identical calls from coroutines into one execution"""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await func once per key at a time, returning (result, whether it was shared)"""
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            # A separate task, so a cancelled leader does not cancel its followers
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task), shared
+
+class ConditionalCache:
+    """LRU of GET responses that carry validators, revalidated with conditional requests"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """Conditional request headers for a cached response, if any"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+            headers = {}
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+            return headers
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Copy of the cached result after a 304"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry["result"])
+
+    def store(self, key: str, result: Dict[str, Any], headers: Dict[str, str]):
+        """Cache a 200 response that can be revalidated later"""
+        lowered = {name.lower(): value for name, value in headers.items()}
+        etag = lowered.get("etag")
+        last_modified = lowered.get("last-modified")
+        no_store = "no-store" in lowered.get("cache-control", "")
+
+        with self._lock:
+            if (not etag and not last_modified) or no_store:
+                self._entries.pop(key, None)
+                return
+
+            self._entries[key] = {
+                "result": copy.deepcopy(result),
+                "etag": etag,
+                "last_modified": last_modified
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,57 @@
+"""
+Shared HTTP Client Pool
+Keep-alive HTTP clients reused by all outbound tool calls
+"""
+
+import threading
+from typing import Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.agent_config import config
+
+_session: Optional[requests.Session] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_client_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """Get the worker-wide keep-alive session for synchronous requests"""
+    global _session
+    if _session is None:
+        with _client_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=config.http_pool_hosts,
+                    pool_maxsize=config.http_pool_maxsize_per_host
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the worker-wide keep-alive client for asyncio requests"""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                limits = httpx.Limits(
+                    max_connections=config.http_pool_hosts * config.http_pool_maxsize_per_host,
+                    max_keepalive_connections=config.http_pool_maxsize_per_host,
+                    keepalive_expiry=config.http_keepalive_expiry
+                )
+                _async_client = httpx.AsyncClient(limits=limits)
+    return _async_client
+
+async def close_http_clients():
+    """Close pooled connections held by the shared clients"""
+    global _session, _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _session is not None:
+        _session.close()
+        _session = None
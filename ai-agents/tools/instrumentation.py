@@ -0,0 +1,190 @@
+"""
+Tool Instrumentation
+Uniform call, latency, error and payload metrics for every registered tool
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import random
+import re
+import time
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+from config.agent_config import config
+from tools.query_cache import extract_tables, normalize_sql
+from src.monitoring import (
+    tool_call_counter, tool_latency, tool_error_counter,
+    tool_request_bytes, tool_response_bytes
+)
+
+SQL_VERB_PATTERN = re.compile(r"^\s*(\w+)")
+NUMERIC_SEGMENT_PATTERN = re.compile(r"(?<=/)\d+(?=/|$)")
+UUID_SEGMENT_PATTERN = re.compile(r"(?<=/)[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}(?=/|$)")
+
+# Methods wrapped on every tool that defines them
+INSTRUMENTED_METHODS = (
+    "_run", "_arun",
+    "run_named", "arun_named",
+    "bulk_update", "abulk_update",
+    "send_many", "asend_many",
+    "batch", "abatch"
+)
+
+# Tools with an instrumented call running in this context; their nested calls,
+# such as _run calling send_many, belong to the outer call and are not recorded
+_active_tools: contextvars.ContextVar[FrozenSet[int]] = contextvars.ContextVar("active_tools", default=frozenset())
+
+def sql_fingerprint(query: str) -> str:
+    """Low-cardinality label for a SQL statement: verb plus the tables it touches"""
+    normalized = normalize_sql(query)
+    match = SQL_VERB_PATTERN.match(normalized)
+    verb = match.group(1).lower() if match else "sql"
+    tables = ",".join(sorted(extract_tables(normalized)))
+    return f"{verb}:{tables}" if tables else verb
+
+def endpoint_template(endpoint: str) -> str:
+    """Collapse ids in a Laravel endpoint so each route is one label"""
+    path = "/" + endpoint.split("?", 1)[0].strip("/")
+    path = UUID_SEGMENT_PATTERN.sub("{uuid}", path)
+    return NUMERIC_SEGMENT_PATTERN.sub("{id}", path)
+
+def _database_operation(method: str, arguments: Dict[str, Any]) -> str:
+    if method in ("run_named", "arun_named"):
+        return f"named:{arguments.get('name')}"
+    if method in ("bulk_update", "abulk_update"):
+        return f"bulk_update:{arguments.get('table')}"
+    return sql_fingerprint(arguments.get("query") or "")
+
+def _laravel_operation(method: str, arguments: Dict[str, Any]) -> str:
+    if method in ("batch", "abatch"):
+        bulk_endpoint = arguments.get("bulk_endpoint")
+        return f"BATCH {endpoint_template(bulk_endpoint)}" if bulk_endpoint else "BATCH concurrent"
+    return f"{str(arguments.get('method') or 'GET').upper()} {endpoint_template(arguments.get('endpoint') or '')}"
+
+# How each registered tool names the operation of a call
+OPERATION_EXTRACTORS: Dict[str, Callable[[str, Dict[str, Any]], str]] = {
+    "database_query": _database_operation,
+    "laravel_api": _laravel_operation,
+    "memory_store": lambda method, arguments: str(arguments.get("action")),
+    "workflow_engine": lambda method, arguments: str(arguments.get("action")),
+    "data_analyzer": lambda method, arguments: str(arguments.get("analysis_type") or "summary"),
+    "report_generator": lambda method, arguments: str(arguments.get("report_type")),
+    "email_sender": lambda method, arguments: "send_many" if method.endswith("send_many") else "send",
+    "sms_sender": lambda method, arguments: "enqueue_many" if method.endswith("send_many") else "enqueue"
+}
+
+def _payload_size(payload: Any) -> Optional[int]:
+    """Approximate wire size of a payload as JSON"""
+    try:
+        return len(json.dumps(payload, default=str))
+    except (TypeError, ValueError):
+        return None
+
+class _CallRecorder:
+    """Collects one call's measurements and publishes them"""
+
+    def __init__(self, tool_name: str, method: str, signature: inspect.Signature, args, kwargs):
+        self.tool_name = tool_name
+        self.started = time.perf_counter()
+
+        try:
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+        except TypeError:
+            arguments = dict(kwargs)
+
+        extractor = OPERATION_EXTRACTORS.get(tool_name)
+        try:
+            self.operation = extractor(method, arguments) if extractor else method
+        except Exception:
+            self.operation = method
+
+        # Measuring sizes means serializing the payloads, so only sampled calls pay for it
+        self.measure_payloads = (
+            config.tool_metrics_payload_sizes
+            and random.random() < config.tool_metrics_payload_sample_rate
+        )
+        if self.measure_payloads:
+            size = _payload_size(arguments)
+            if size is not None:
+                tool_request_bytes.labels(tool=tool_name, operation=self.operation).observe(size)
+
+    def finish(self, result: Any = None, error: Optional[BaseException] = None):
+        """Record latency, outcome and response size"""
+        labels = {"tool": self.tool_name, "operation": self.operation}
+        tool_latency.labels(**labels).observe(time.perf_counter() - self.started)
+
+        if error is not None:
+            status = "error"
+            tool_error_counter.labels(error_type=type(error).__name__, **labels).inc()
+        elif isinstance(result, dict) and result.get("success") is False:
+            status = "failed"
+            tool_error_counter.labels(error_type="failed_result", **labels).inc()
+        else:
+            status = "success"
+
+        tool_call_counter.labels(status=status, **labels).inc()
+
+        if error is None and self.measure_payloads:
+            size = _payload_size(result)
+            if size is not None:
+                tool_response_bytes.labels(**labels).observe(size)
+
+def _wrap(tool_name: str, tool_id: int, method: str, func: Callable) -> Callable:
+    """Wrap a bound tool method, preserving sync or async behaviour"""
+    signature = inspect.signature(func)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            active = _active_tools.get()
+            if tool_id in active:
+                return await func(*args, **kwargs)
+
+            token = _active_tools.set(active | {tool_id})
+            recorder = _CallRecorder(tool_name, method, signature, args, kwargs)
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as e:
+                recorder.finish(error=e)
+                raise
+            finally:
+                _active_tools.reset(token)
+            recorder.finish(result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        active = _active_tools.get()
+        if tool_id in active:
+            return func(*args, **kwargs)
+
+        token = _active_tools.set(active | {tool_id})
+        recorder = _CallRecorder(tool_name, method, signature, args, kwargs)
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            recorder.finish(error=e)
+            raise
+        finally:
+            _active_tools.reset(token)
+        recorder.finish(result)
+        return result
+    return wrapper
+
+def instrument_tool(tool_name: str, tool: Any) -> Any:
+    """Wrap a tool instance's entry points with metrics, once; only the outermost call per tool is recorded"""
+    if getattr(tool, "_instrumented", False):
+        return tool
+
+    for method in INSTRUMENTED_METHODS:
+        func = getattr(tool, method, None)
+        if func is None or not callable(func):
+            continue
+        # BaseTool is a pydantic model, so bypass its attribute validation
+        object.__setattr__(tool, method, _wrap(tool_name, id(tool), method, func))
+
+    object.__setattr__(tool, "_instrumented", True)
+    return tool
@@ -0,0 +1,109 @@
+"""
+Cache Invalidation Channel
+Redis pub/sub fan-out that keeps per-worker caches coherent
+"""
+
+import logging
+import os
+import threading
+import uuid
+from typing import Any, Callable, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Wildcard payload telling every worker to drop its whole local cache
+FLUSH_ALL = "*"
+
+class InvalidationChannel:
+    """Publishes and consumes invalidation keys, skipping this worker's own messages"""
+
+    def __init__(self, redis_url: str, channel: str, on_invalidate: Callable[[str], None],
+                 on_reset: Callable[[], None], name: str = "cache-invalidation"):
+        self.channel = channel
+        self.name = name
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._on_invalidate = on_invalidate
+        self._on_reset = on_reset
+        self._redis = redis.Redis.from_url(redis_url)
+        self._connected = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def available(self) -> bool:
+        """Local caches are only safe to read while invalidations are being received"""
+        return self._connected.is_set()
+
+    def start(self):
+        """Start the background listener thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the listener and reset the local cache"""
+        self._stopping.set()
+        self._connected.clear()
+        self._on_reset()
+        try:
+            self._redis.close()
+        except Exception:
+            pass
+
+    def _listen(self):
+        """Consume invalidation messages, resetting the local cache on every reconnect"""
+        backoff = 0.5
+        while not self._stopping.is_set():
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                # Anything cached before the subscription may have missed invalidations
+                self._on_reset()
+                self._connected.set()
+                backoff = 0.5
+
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._handle(message["data"])
+
+            except Exception as e:
+                if not self._stopping.is_set():
+                    logger.warning(f"Invalidation channel {self.channel} lost: {str(e)}")
+            finally:
+                self._connected.clear()
+                self._on_reset()
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+            self._stopping.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _handle(self, data: Any):
+        """Apply one invalidation message from another worker"""
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+
+        sender, _, key = data.partition(":")
+        if sender == self.worker_id:
+            return
+
+        if key == FLUSH_ALL:
+            self._on_reset()
+        else:
+            self._on_invalidate(key)
+
+    def publish(self, key: str, publisher: Optional[redis.Redis] = None) -> bool:
+        """Tell every other worker to drop a key"""
+        try:
+            (publisher or self._redis).publish(self.channel, f"{self.worker_id}:{key}")
+            return True
+        except Exception as e:
+            # Other workers cannot be told, so stop trusting our own cache too
+            logger.error(f"Failed to publish invalidation on {self.channel}: {str(e)}")
+            self._on_reset()
+            return False
@@ -0,0 +1,62 @@
+"""
+Lazy Registry
+Name-to-instance mapping that builds each entry on first access
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+class LazyRegistry(Mapping):
+    """Read-only mapping of names to instances constructed by factories on first use"""
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]],
+                 on_create: Optional[Callable[[str, Any], Any]] = None):
+        self._factories = dict(factories)
+        self._instances: Dict[str, Any] = {}
+        self._on_create = on_create
+        self._lock = threading.RLock()
+
+    def __getitem__(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        factory = self._factories[name]
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                started = time.perf_counter()
+                instance = factory()
+                if self._on_create is not None:
+                    instance = self._on_create(name, instance) or instance
+                self._instances[name] = instance
+                logger.debug(f"Constructed {name} in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return instance
+
+    # Membership, iteration and len only look at names, so they never construct anything
+    def __contains__(self, name: object) -> bool:
+        return name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether an entry has already been constructed"""
+        return name in self._instances
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Construct entries ahead of the first request, returning seconds spent per entry"""
+        timings = {}
+        for name in (names if names is not None else list(self._factories)):
+            started = time.perf_counter()
+            self[name]
+            timings[name] = time.perf_counter() - started
+        return timings
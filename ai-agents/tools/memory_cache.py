@@ -0,0 +1,143 @@
+"""
+Local Memory Cache
+In-process TTL/LRU tier in front of Redis agent memory with cross-worker invalidation
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import redis
+
+from config.agent_config import config
+from tools.invalidation import InvalidationChannel
+
+class LocalTTLCache:
+    """Size-bounded, thread-safe LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key, dropping it if expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, generation: Optional[int] = None, ttl: Optional[float] = None):
+        """Store a value unless an invalidation happened since `generation` was read"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._entries[key] = (value, time.monotonic() + (ttl if ttl is not None else self.ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        """Drop one key and fence out reads that started before this point"""
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry and fence out in-flight reads"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class MemoryCacheTier:
+    """Read-through local tier kept coherent across workers over Redis pub/sub
+
+    Writes only evict: the next read fills the tier from Redis, and the
+    generation fence drops any fill that raced with an eviction, so a worker
+    always reads its own latest write. Reads are not versioned against Redis,
+    so another worker's write is seen once its invalidation arrives, normally
+    within milliseconds and never later than the local TTL. Leave the tier
+    disabled for keys that need strict cross-worker consistency.
+    """
+
+    def __init__(self, redis_url: str, channel: str, max_size: int = 1024, ttl: float = 30.0):
+        self.cache = LocalTTLCache(max_size=max_size, ttl=ttl)
+        self.invalidation = InvalidationChannel(
+            redis_url,
+            channel,
+            on_invalidate=self.cache.invalidate,
+            on_reset=self.cache.clear,
+            name="memory-cache-invalidation"
+        )
+
+    @property
+    def available(self) -> bool:
+        """Local reads are only safe while invalidations are being received"""
+        return self.invalidation.available
+
+    def start(self):
+        """Start the background invalidation listener"""
+        self.invalidation.start()
+
+    def stop(self):
+        """Stop the listener and drop all cached values"""
+        self.invalidation.stop()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Look a key up in the local tier"""
+        if not self.available:
+            return False, None
+        return self.cache.get(key)
+
+    def fill(self, key: str, value: Any, generation: int, ttl: Optional[float] = None):
+        """Cache a value read from Redis unless it was invalidated mid-read"""
+        if self.available:
+            self.cache.set(key, value, generation=generation, ttl=ttl)
+
+    def publish(self, key: str, publisher: Optional[redis.Redis] = None):
+        """Evict a key locally and tell every other worker to do the same; call after writing Redis"""
+        self.cache.invalidate(key)
+        self.invalidation.publish(key, publisher)
+
+_tier: Optional[MemoryCacheTier] = None
+_tier_lock = threading.Lock()
+
+def get_memory_cache() -> Optional[MemoryCacheTier]:
+    """Get the worker-wide local memory tier, or None when it is disabled"""
+    global _tier
+    if not config.memory_local_cache_enabled:
+        return None
+    if _tier is None:
+        with _tier_lock:
+            if _tier is None:
+                tier = MemoryCacheTier(
+                    redis_url=config.redis_url,
+                    channel=config.memory_local_cache_channel,
+                    max_size=config.memory_local_cache_size,
+                    ttl=config.memory_local_cache_ttl
+                )
+                tier.start()
+                _tier = tier
+    return _tier
+
+def close_memory_cache():
+    """Stop the invalidation listener of the worker-wide tier"""
+    global _tier
+    if _tier is not None:
+        _tier.stop()
+        _tier = None
@@ -0,0 +1,171 @@
+"""
+Memory Codec
+Pluggable serialization and compression for values kept in agent memory
+"""
+
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.agent_config import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+# Tagged values start with a NUL byte, which never begins a JSON document,
+# so values written before the codec layer existed are still read as JSON.
+FORMAT_MARKER = b"\x00"
+
+CODEC_IDS = {"json": 1, "orjson": 2, "msgpack": 3}
+COMPRESSION_IDS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for types the binary codecs do not handle natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def _encode_json(value: Any) -> bytes:
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+def _decode_json(payload: bytes) -> Any:
+    return json.loads(payload.decode("utf-8"))
+
+def _encode_orjson(value: Any) -> bytes:
+    return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+def _decode_orjson(payload: bytes) -> Any:
+    # orjson output is plain JSON, so it stays readable without the package
+    if orjson is None:
+        return _decode_json(payload)
+    return orjson.loads(payload)
+
+def _encode_msgpack(value: Any) -> bytes:
+    return msgpack.packb(value, default=_json_default, use_bin_type=True)
+
+def _decode_msgpack(payload: bytes) -> Any:
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+def _zstd_compress(payload: bytes) -> bytes:
+    return zstandard.ZstdCompressor().compress(payload)
+
+def _zstd_decompress(payload: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+CODECS: Dict[int, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    CODEC_IDS["json"]: (_encode_json, _decode_json),
+    CODEC_IDS["orjson"]: (_encode_orjson, _decode_orjson),
+    CODEC_IDS["msgpack"]: (_encode_msgpack, _decode_msgpack)
+}
+
+COMPRESSORS: Dict[int, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    COMPRESSION_IDS["zlib"]: (zlib.compress, zlib.decompress),
+    COMPRESSION_IDS["zstd"]: (_zstd_compress, _zstd_decompress),
+    COMPRESSION_IDS["lz4"]: (
+        lambda payload: lz4_frame.compress(payload),
+        lambda payload: lz4_frame.decompress(payload)
+    )
+}
+
+_AVAILABLE = {
+    "json": True,
+    "orjson": orjson is not None,
+    "msgpack": msgpack is not None,
+    "none": True,
+    "zlib": True,
+    "zstd": zstandard is not None,
+    "lz4": lz4_frame is not None
+}
+
+class MemoryCodec:
+    """Encode values with a format tag so any configured codec can read them back"""
+
+    def __init__(self, codec: str = "json", compression: str = "none", compression_threshold: int = 1024):
+        self.codec = self._resolve(codec, CODEC_IDS, "json")
+        self.compression = self._resolve(compression, COMPRESSION_IDS, "zlib" if compression != "none" else "none")
+        self.compression_threshold = compression_threshold
+
+    @staticmethod
+    def _resolve(name: str, known: Dict[str, int], fallback: str) -> str:
+        """Validate a configured codec name, falling back when its package is missing"""
+        name = (name or fallback).lower()
+        if name not in known:
+            raise ValueError(f"Unknown memory codec setting: {name}")
+        if not _AVAILABLE[name]:
+            logger.warning(f"Memory codec '{name}' is not installed, falling back to '{fallback}'")
+            return fallback
+        return name
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value, compressing it when it exceeds the size threshold"""
+        codec_id = CODEC_IDS[self.codec]
+        payload = CODECS[codec_id][0](value)
+
+        compression_id = COMPRESSION_IDS["none"]
+        if self.compression != "none" and len(payload) >= self.compression_threshold:
+            compression_id = COMPRESSION_IDS[self.compression]
+            payload = COMPRESSORS[compression_id][0](payload)
+
+        return FORMAT_MARKER + bytes((codec_id, compression_id)) + payload
+
+    @staticmethod
+    def decode(raw: Optional[bytes]) -> Any:
+        """Deserialize a stored value written by any codec or by plain json.dumps"""
+        if raw is None:
+            return None
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+
+        if not raw.startswith(FORMAT_MARKER):
+            return _decode_json(raw)
+
+        codec_id, compression_id = raw[1], raw[2]
+        payload = raw[3:]
+
+        if compression_id != COMPRESSION_IDS["none"]:
+            if compression_id not in COMPRESSORS:
+                raise ValueError(f"Unknown memory compression id: {compression_id}")
+            payload = COMPRESSORS[compression_id][1](payload)
+
+        if codec_id not in CODECS:
+            raise ValueError(f"Unknown memory codec id: {codec_id}")
+        return CODECS[codec_id][1](payload)
+
+_codec: Optional[MemoryCodec] = None
+
+def get_memory_codec() -> MemoryCodec:
+    """Get the codec configured for agent memory"""
+    global _codec
+    if _codec is None:
+        _codec = MemoryCodec(
+            codec=config.memory_codec,
+            compression=config.memory_compression,
+            compression_threshold=config.memory_compression_threshold
+        )
+    return _codec
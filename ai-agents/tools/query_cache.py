@@ -0,0 +1,195 @@
+"""
+Query Result Cache
+Opt-in cache of database read results, evicted by the tables a write touches
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from config.agent_config import config
+from tools.invalidation import InvalidationChannel
+from src.monitoring import query_cache_hits, query_cache_misses, query_cache_invalidations
+
+TABLE_PATTERN = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO|TRUNCATE(?:\s+TABLE)?)\s+([A-Za-z_][\w.]*)", re.IGNORECASE)
+WRITE_PATTERN = re.compile(r"\b(?:INSERT\s+INTO|UPDATE\s+[A-Za-z_]\w*|DELETE\s+FROM|TRUNCATE|MERGE\s+INTO|ALTER\s+TABLE|DROP\s+TABLE)\b", re.IGNORECASE)
+COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_sql(query: str) -> str:
+    """Strip comments and collapse whitespace so formatting does not split cache keys"""
+    return WHITESPACE_PATTERN.sub(" ", COMMENT_PATTERN.sub(" ", query)).strip()
+
+def extract_tables(query: str) -> Set[str]:
+    """Tables referenced by a statement, without schema qualifiers"""
+    return {match.split(".")[-1].lower() for match in TABLE_PATTERN.findall(COMMENT_PATTERN.sub(" ", query))}
+
+def is_write(query: str) -> bool:
+    """Whether a statement modifies data, including writes inside CTEs"""
+    return bool(WRITE_PATTERN.search(COMMENT_PATTERN.sub(" ", query)))
+
+def cache_key(query: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key from normalized SQL and bound parameters"""
+    material = json.dumps([normalize_sql(query), params or {}], sort_keys=True, default=str)
+    return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a query result down to its rows"""
+    copied = dict(result)
+    if "data" in copied:
+        copied["data"] = [dict(row) for row in copied["data"]]
+    return copied
+
+class QueryResultCache:
+    """Thread-safe LRU of query results tagged by the tables they read"""
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float, Set[str]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a live cached result"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            result, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        # Callers may mutate rows, so never hand out the cached objects
+        return _copy_result(result)
+
+    def versions(self, tables: Iterable[str]) -> Dict[str, int]:
+        """Snapshot table versions before running a query"""
+        with self._lock:
+            return {table: self._versions.get(table, 0) for table in tables}
+
+    def set(self, key: str, result: Dict[str, Any], ttl: float, versions: Dict[str, int]):
+        """Store a result unless one of its tables was written while it was being read"""
+        with self._lock:
+            if any(self._versions.get(table, 0) != version for table, version in versions.items()):
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            tables = set(versions)
+            # The caller keeps using the result it stored, so cache a copy of it
+            self._entries[key] = (_copy_result(result), time.monotonic() + ttl, tables)
+            for table in tables:
+                self._tags.setdefault(table, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, table: str):
+        """Evict every entry that read a table"""
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            for key in list(self._tags.pop(table, ())):
+                self._remove(key)
+        query_cache_invalidations.labels(table=table).inc()
+
+    def clear(self):
+        """Evict everything and fence out in-flight reads"""
+        with self._lock:
+            for table in set(self._versions) | set(self._tags):
+                self._versions[table] = self._versions.get(table, 0) + 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str):
+        """Drop an entry and its tag references; caller holds the lock"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for table in entry[2]:
+            keys = self._tags.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[table]
+
+class SharedQueryCache:
+    """Worker-local query cache evicted by writes from any worker"""
+
+    def __init__(self, redis_url: str, channel: str, max_size: int = 512):
+        self.cache = QueryResultCache(max_size=max_size)
+        self.invalidation = InvalidationChannel(
+            redis_url,
+            channel,
+            on_invalidate=self.cache.invalidate,
+            on_reset=self.cache.clear,
+            name="query-cache-invalidation"
+        )
+
+    def start(self):
+        """Start the background invalidation listener"""
+        self.invalidation.start()
+
+    def stop(self):
+        """Stop the listener and drop all cached results"""
+        self.invalidation.stop()
+
+    def lookup(self, query: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[Dict[str, Any]], Dict[str, int]]:
+        """Return (key, cached result or None, table versions to store a fresh result with)"""
+        key = cache_key(query, params)
+        tables = extract_tables(query)
+
+        result = self.cache.get(key) if self.invalidation.available else None
+        if result is not None:
+            query_cache_hits.inc()
+            return key, result, {}
+
+        query_cache_misses.inc()
+        return key, None, self.cache.versions(tables)
+
+    def store(self, key: str, result: Dict[str, Any], ttl: float, versions: Dict[str, int]):
+        """Cache a successful read result"""
+        if result.get("success") and self.invalidation.available:
+            self.cache.set(key, result, ttl, versions)
+
+    def invalidate_for(self, query: str):
+        """Evict cached reads of every table a write statement touches"""
+        for table in extract_tables(query):
+            self.cache.invalidate(table)
+            self.invalidation.publish(table)
+
+_query_cache: Optional[SharedQueryCache] = None
+_cache_lock = threading.Lock()
+
+def get_query_cache() -> Optional[SharedQueryCache]:
+    """Get the worker-wide query cache, or None when it is disabled"""
+    global _query_cache
+    if not config.query_cache_enabled:
+        return None
+    if _query_cache is None:
+        with _cache_lock:
+            if _query_cache is None:
+                cache = SharedQueryCache(
+                    redis_url=config.redis_url,
+                    channel=config.query_cache_channel,
+                    max_size=config.query_cache_size
+                )
+                cache.start()
+                _query_cache = cache
+    return _query_cache
+
+def close_query_cache():
+    """Stop the invalidation listener of the worker-wide cache"""
+    global _query_cache
+    if _query_cache is not None:
+        _query_cache.stop()
+        _query_cache = None
@@ -0,0 +1,211 @@
+"""
+Named Query Registry
+Central catalogue of parameterized SQL, compiled once and invoked by name
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from tools.query_cache import is_write
+
+@dataclass
+class NamedQuery:
+    """A parameterized statement compiled once at import time"""
+    name: str
+    sql: str
+    cache_ttl: Optional[float] = None
+    statement: TextClause = field(init=False, repr=False)
+    writes: bool = field(init=False)
+
+    def __post_init__(self):
+        self.statement = text(self.sql)
+        self.writes = is_write(self.sql)
+
+QUERIES: Dict[str, NamedQuery] = {}
+
+def register_query(name: str, sql: str, cache_ttl: Optional[float] = None) -> NamedQuery:
+    """Add a query to the registry"""
+    if name in QUERIES:
+        raise ValueError(f"Query '{name}' is already registered")
+    QUERIES[name] = NamedQuery(name=name, sql=sql, cache_ttl=cache_ttl)
+    return QUERIES[name]
+
+def get_query(name: str) -> NamedQuery:
+    """Look up a registered query by name"""
+    try:
+        return QUERIES[name]
+    except KeyError:
+        raise KeyError(f"Unknown named query: {name}")
+
+# Date parameters are cast in SQL: callers pass ISO strings, which asyncpg
+# will not bind to a date column without an explicit type.
+
+# Employees
+register_query("employees.by_id", """
+    SELECT * FROM employees WHERE id = :employee_id
+""")
+
+register_query("employees.with_approval_chain", """
+    SELECT e.*, d.name as department_name, m.id as manager_id, m.name as manager_name
+    FROM employees e
+    LEFT JOIN departments d ON e.department_id = d.id
+    LEFT JOIN employees m ON e.manager_id = m.id
+    WHERE e.id = :employee_id
+""")
+
+# :since_days of NULL means year to date; asyncpg cannot infer the type of a bare NULL parameter, hence the casts
+register_query("employees.statistics", """
+    SELECT
+        COUNT(*) as total_employees,
+        COUNT(CASE WHEN active = true THEN 1 END) as active_employees,
+        COUNT(CASE WHEN created_at >= (
+            CASE WHEN CAST(:since_days AS integer) IS NULL THEN date_trunc('year', NOW())
+                 ELSE NOW() - make_interval(days => CAST(:since_days AS integer)) END
+        ) THEN 1 END) as new_employees,
+        ROUND(AVG(CASE WHEN salary > 0 THEN salary END), 2) as avg_salary
+    FROM employees
+""", cache_ttl=300)
+
+register_query("departments.headcount", """
+    SELECT d.name as department, COUNT(e.id) as employee_count
+    FROM departments d
+    LEFT JOIN employees e ON d.id = e.department_id
+    GROUP BY d.id, d.name
+    ORDER BY employee_count DESC
+""", cache_ttl=300)
+
+register_query("employees.coverage_candidates", """
+    SELECT e.id, e.name, e.email, e.skills, e.current_workload,
+           d.name as department_name
+    FROM employees e
+    JOIN departments d ON e.department_id = d.id
+    WHERE e.id != :employee_id
+    AND e.active = true
+    AND e.current_workload < 90
+    AND NOT EXISTS (
+        SELECT 1 FROM leave_requests lr
+        WHERE lr.employee_id = e.id
+        AND lr.status = 'approved'
+        AND (lr.start_date <= CAST(:end_date AS date) AND lr.end_date >= CAST(:start_date AS date))
+    )
+    ORDER BY e.current_workload ASC, e.experience_level DESC
+""", cache_ttl=60)
+
+register_query("employees.available_in_department", """
+    SELECT e.id, e.name, e.email, e.department_id, e.skills,
+           COUNT(lr.id) as concurrent_leaves
+    FROM employees e
+    LEFT JOIN leave_requests lr ON e.id = lr.employee_id
+        AND lr.status = 'approved'
+        AND (lr.start_date <= CAST(:end_date AS date) AND lr.end_date >= CAST(:start_date AS date))
+    WHERE e.department_id = (
+        SELECT department_id FROM employees WHERE id = :employee_id
+    )
+    AND e.id != :employee_id
+    AND e.active = true
+    GROUP BY e.id
+    HAVING COUNT(lr.id) = 0
+    ORDER BY e.experience_level DESC
+""")
+
+register_query("employee_documents.by_employees", """
+    SELECT * FROM employee_documents WHERE employee_id = ANY(:employee_ids)
+""")
+
+register_query("employee_goals.by_period", """
+    SELECT goal_description, target_value, actual_value, achievement_percentage
+    FROM employee_goals
+    WHERE employee_id = :employee_id
+    AND goal_period = :review_period
+""")
+
+register_query("attendance.summary_since", """
+    SELECT AVG(hours_worked) as avg_hours,
+           COUNT(*) as total_days,
+           SUM(CASE WHEN hours_worked >= 8 THEN 1 ELSE 0 END) as full_days
+    FROM attendance
+    WHERE employee_id = :employee_id
+    AND date >= CAST(:start_period AS date)
+""")
+
+# Projects and tasks
+register_query("projects.with_tasks", """
+    SELECT p.*, t.name as task_name, t.status, t.assigned_to, t.estimated_hours
+    FROM projects p
+    LEFT JOIN tasks t ON p.id = t.project_id
+    WHERE p.id = :project_id
+""")
+
+register_query("users.active_workload", """
+    SELECT u.id, u.name, u.email,
+           COUNT(t.id) as active_tasks,
+           SUM(t.estimated_hours) as total_workload
+    FROM users u
+    LEFT JOIN tasks t ON u.id = t.assigned_to AND t.status IN ('in_progress', 'pending')
+    WHERE u.active = true
+    GROUP BY u.id, u.name, u.email
+    ORDER BY total_workload ASC
+""")
+
+register_query("tasks.due_during_period", """
+    SELECT p.id, p.name, p.deadline, t.name as task_name, t.deadline as task_deadline
+    FROM projects p
+    JOIN tasks t ON p.id = t.project_id
+    WHERE t.assigned_to = :employee_id
+    AND (t.deadline BETWEEN CAST(:start_date AS date) AND CAST(:end_date AS date))
+""")
+
+register_query("tasks.assigned_since", """
+    SELECT p.name, t.status, t.completion_date, t.quality_score
+    FROM projects p
+    JOIN tasks t ON p.id = t.project_id
+    WHERE t.assigned_to = :employee_id
+    AND t.created_at >= CAST(:start_period AS date)
+""")
+
+# Leave
+register_query("leave_balances.by_type", """
+    SELECT lb.*, e.hire_date, e.employment_status
+    FROM leave_balances lb
+    JOIN employees e ON lb.employee_id = e.id
+    WHERE lb.employee_id = :employee_id AND lb.leave_type = :leave_type
+""")
+
+register_query("leave_requests.overlapping", """
+    SELECT id, start_date, end_date, leave_type, status
+    FROM leave_requests
+    WHERE employee_id = :employee_id
+    AND status IN ('pending', 'approved')
+    AND (start_date <= CAST(:end_date AS date) AND end_date >= CAST(:start_date AS date))
+""")
+
+register_query("leave_requests.approve", """
+    UPDATE leave_requests
+    SET status = 'approved',
+        approved_by = :approver_id,
+        approved_at = NOW(),
+        approval_comments = :comments
+    WHERE id = :leave_request_id
+""")
+
+register_query("leave_requests.reject", """
+    UPDATE leave_requests
+    SET status = 'rejected',
+        rejected_by = :approver_id,
+        rejected_at = NOW(),
+        rejection_comments = :comments
+    WHERE id = :leave_request_id
+""")
+
+# Payroll
+register_query("payroll_records.by_period", """
+    SELECT e.id, e.name, e.salary, e.hourly_rate,
+           p.gross_pay, p.net_pay, p.hours_worked, p.overtime_hours,
+           p.deductions, p.bonuses, p.commissions
+    FROM employees e
+    JOIN payroll_records p ON e.id = p.employee_id
+    WHERE p.payroll_period = :period
+""")
@@ -0,0 +1,327 @@
+"""
+Outbound Dependency Resilience
+Per-dependency bulkheads and circuit breakers so one slow service cannot stall the rest
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from config.agent_config import config
+from src.monitoring import (
+    dependency_circuit_state, dependency_rejections, dependency_failures,
+    dependency_in_flight, dependency_queued
+)
+
+logger = logging.getLogger(__name__)
+
+# Outbound services guarded by a bulkhead and circuit breaker, configured by prefix in AgentConfig
+DEPENDENCIES = ("laravel", "smtp", "twilio", "frappe")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class DependencyUnavailable(Exception):
+    """Raised when a call is rejected before reaching the dependency"""
+
+class CircuitOpenError(DependencyUnavailable):
+    """The dependency's circuit is open, so calls fail fast"""
+
+class BulkheadFullError(DependencyUnavailable):
+    """No concurrency slot became available within the queue limits"""
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a few probe calls through once the recovery timeout passes"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        dependency_circuit_state.labels(dependency=name).set(STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Move an open circuit to half-open once it has cooled down; caller holds the lock"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str):
+        """Change state and reset counters; caller holds the lock"""
+        if state == self._state:
+            return
+        logger.warning(f"Circuit for {self.name} is now {state}")
+        self._state = state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state == CLOSED:
+            self._failures = 0
+        dependency_circuit_state.labels(dependency=self.name).set(STATE_VALUES[state])
+
+    def acquire(self):
+        """Admit a call or raise CircuitOpenError"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+
+        dependency_rejections.labels(dependency=self.name, reason="circuit_open").inc()
+        raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+    def release(self):
+        """Give back an admitted call that never reached the dependency"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        dependency_failures.labels(dependency=self.name).inc()
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._transition(OPEN)
+
+class _Waiter:
+    """A caller queued for a bulkhead slot; `wake` is called once a slot has been handed to it"""
+
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake: Callable[[], None]):
+        self.wake = wake
+        self.granted = False
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+class Bulkhead:
+    """Caps concurrent calls and the number of callers allowed to wait for a slot
+
+    Threads and coroutines share one budget of `max_concurrent` slots. A
+    released slot is handed to the longest waiting caller: a thread is woken
+    through an event, a coroutine through a future resolved on its own loop,
+    so the event loop never blocks on a thread primitive.
+    """
+
+    def __init__(self, name: str, max_concurrent: int = 10, max_queue: int = 20, queue_timeout: float = 5.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._in_use = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    def _try_acquire(self, waiter: _Waiter) -> bool:
+        """Take a free slot, or queue the waiter or reject; caller holds the lock"""
+        if self._in_use < self.max_concurrent and not self._waiters:
+            self._in_use += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            dependency_rejections.labels(dependency=self.name, reason="queue_full").inc()
+            raise BulkheadFullError(f"Too many calls waiting for {self.name}")
+        self._waiters.append(waiter)
+        dependency_queued.labels(dependency=self.name).inc()
+        return False
+
+    def _withdraw(self, waiter: _Waiter) -> bool:
+        """Leave the queue unless a slot was already handed over; returns whether it was"""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+        dependency_queued.labels(dependency=self.name).dec()
+        return False
+
+    def _release(self):
+        """Pass the slot to the next waiter, or free it"""
+        with self._lock:
+            if not self._waiters:
+                self._in_use -= 1
+                return
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+        dependency_queued.labels(dependency=self.name).dec()
+        waiter.wake()
+
+    def _timed_out(self):
+        dependency_rejections.labels(dependency=self.name, reason="queue_timeout").inc()
+        return BulkheadFullError(f"Timed out waiting for a {self.name} slot")
+
+    @contextmanager
+    def slot(self):
+        """Hold a concurrency slot for the duration of a blocking call"""
+        event = threading.Event()
+        waiter = _Waiter(event.set)
+        with self._lock:
+            acquired = self._try_acquire(waiter)
+
+        if not acquired:
+            event.wait(self.queue_timeout)
+            if not self._withdraw(waiter):
+                raise self._timed_out()
+
+        dependency_in_flight.labels(dependency=self.name).inc()
+        try:
+            yield
+        finally:
+            dependency_in_flight.labels(dependency=self.name).dec()
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self):
+        """Hold a concurrency slot for the duration of an awaited call"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Released by any thread, so the future is resolved on its own loop
+        waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve, future))
+        with self._lock:
+            acquired = self._try_acquire(waiter)
+
+        if not acquired:
+            try:
+                await asyncio.wait_for(future, timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                if not self._withdraw(waiter):
+                    raise self._timed_out()
+            except asyncio.CancelledError:
+                if self._withdraw(waiter):
+                    self._release()
+                raise
+
+        dependency_in_flight.labels(dependency=self.name).inc()
+        try:
+            yield
+        finally:
+            dependency_in_flight.labels(dependency=self.name).dec()
+            self._release()
+
+class Dependency:
+    """A bulkhead and circuit breaker guarding one outbound service"""
+
+    def __init__(self, name: str, bulkhead: Bulkhead, breaker: CircuitBreaker):
+        self.name = name
+        self.bulkhead = bulkhead
+        self.breaker = breaker
+
+    def _record(self, result: Any = None, error: Optional[BaseException] = None,
+                is_failure: Optional[Callable[[Any], bool]] = None,
+                trips_on: Optional[Callable[[BaseException], bool]] = None):
+        """Feed the outcome of an attempted call to the breaker"""
+        if error is not None:
+            failed = trips_on(error) if trips_on else True
+        else:
+            failed = bool(is_failure and is_failure(result))
+
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def call(self, func: Callable[..., Any], *args,
+             is_failure: Optional[Callable[[Any], bool]] = None,
+             trips_on: Optional[Callable[[BaseException], bool]] = None, **kwargs) -> Any:
+        """Run a blocking call through the breaker and bulkhead
+
+        `is_failure` marks results that should count against the breaker (such as
+        HTTP 5xx responses); `trips_on` filters which exceptions count.
+        """
+        self.breaker.acquire()
+        try:
+            with self.bulkhead.slot():
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    self._record(error=e, trips_on=trips_on)
+                    raise
+                self._record(result, is_failure=is_failure)
+                return result
+        except BulkheadFullError:
+            self.breaker.release()
+            raise
+
+    async def acall(self, func: Callable[..., Awaitable[Any]], *args,
+                    is_failure: Optional[Callable[[Any], bool]] = None,
+                    trips_on: Optional[Callable[[BaseException], bool]] = None, **kwargs) -> Any:
+        """Await a call through the breaker and bulkhead"""
+        self.breaker.acquire()
+        try:
+            async with self.bulkhead.aslot():
+                try:
+                    result = await func(*args, **kwargs)
+                except asyncio.CancelledError:
+                    self.breaker.release()
+                    raise
+                except Exception as e:
+                    self._record(error=e, trips_on=trips_on)
+                    raise
+                self._record(result, is_failure=is_failure)
+                return result
+        except BulkheadFullError:
+            self.breaker.release()
+            raise
+
+_dependencies: Dict[str, Dependency] = {}
+_dependencies_lock = threading.Lock()
+
+def _setting(name: str, suffix: str):
+    return getattr(config, f"{name}_{suffix}")
+
+def get_dependency(name: str) -> Dependency:
+    """Get the worker-wide guard for an outbound dependency, creating it on first use"""
+    dependency = _dependencies.get(name)
+    if dependency is None:
+        if name not in DEPENDENCIES:
+            raise KeyError(f"Unknown dependency: {name}")
+        with _dependencies_lock:
+            dependency = _dependencies.get(name)
+            if dependency is None:
+                dependency = Dependency(
+                    name,
+                    Bulkhead(
+                        name,
+                        max_concurrent=_setting(name, "max_concurrency"),
+                        max_queue=_setting(name, "max_queue"),
+                        queue_timeout=config.bulkhead_queue_timeout
+                    ),
+                    CircuitBreaker(
+                        name,
+                        failure_threshold=_setting(name, "circuit_failure_threshold"),
+                        recovery_timeout=_setting(name, "circuit_recovery_timeout"),
+                        half_open_max_calls=config.circuit_half_open_max_calls
+                    )
+                )
+                _dependencies[name] = dependency
+    return dependency
+
+def open_circuits() -> List[str]:
+    """Dependencies whose circuit is currently not closed"""
+    return [name for name, dependency in _dependencies.items() if dependency.breaker.state != CLOSED]
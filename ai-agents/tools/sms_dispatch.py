@@ -0,0 +1,503 @@
+"""
+SMS Dispatch Queue
+Redis-backed SMS queue shared by all workers, drained at the provider's sustained rate
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from config.agent_config import config
+from tools.resilience import DependencyUnavailable, get_dependency
+
+logger = logging.getLogger(__name__)
+
+# Takes one token from a bucket shared by every worker, returning seconds to wait when empty.
+# A pause key set after a provider 429 holds everyone back until it expires.
+TOKEN_BUCKET_SCRIPT = """
+local pause_ms = redis.call('PTTL', KEYS[2])
+if pause_ms > 0 then
+    return tostring(pause_ms / 1000)
+end
+
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+# Moves retries whose backoff has elapsed back onto the queue, ahead of new messages
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+    redis.call('RPUSH', KEYS[2], unpack(due))
+end
+return #due
+"""
+
+# Returns a consumer's in-flight messages to the front of the queue and forgets the consumer.
+# KEYS: processing list, queue, consumers. ARGV: consumer id, heartbeat cutoff, force flag.
+# Without the force flag nothing moves if the consumer has sent a heartbeat since the cutoff.
+REQUEUE_SCRIPT = """
+local beat = redis.call('ZSCORE', KEYS[3], ARGV[1])
+if ARGV[3] ~= '1' and beat and tonumber(beat) > tonumber(ARGV[2]) then
+    return 0
+end
+local moved = 0
+while redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT') do
+    moved = moved + 1
+end
+redis.call('ZREM', KEYS[3], ARGV[1])
+return moved
+"""
+
+class SMSThrottled(Exception):
+    """The provider rejected a message for exceeding its rate limit"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class SMSDeliveryError(Exception):
+    """The provider failed to accept a message"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class SMSKeys:
+    """Redis key layout for one dispatch queue"""
+
+    def __init__(self, prefix: str):
+        self.queue = f"{prefix}:queue"
+        self.delayed = f"{prefix}:delayed"
+        self.bucket = f"{prefix}:bucket"
+        self.pause = f"{prefix}:pause"
+        self.consumers = f"{prefix}:consumers"
+        self.prefix = prefix
+
+    def status(self, message_id: str) -> str:
+        return f"{self.prefix}:status:{message_id}"
+
+    def processing(self, consumer_id: str) -> str:
+        return f"{self.prefix}:processing:{consumer_id}"
+
+class TwilioSMSProvider:
+    """Sends through the Twilio REST API behind the twilio circuit breaker"""
+
+    name = "twilio"
+
+    def __init__(self):
+        from twilio.rest import Client as TwilioClient
+        from twilio.http.http_client import TwilioHttpClient
+        # The Twilio client waits forever by default
+        self.client = TwilioClient(
+            config.twilio_account_sid,
+            config.twilio_auth_token,
+            http_client=TwilioHttpClient(timeout=config.twilio_timeout)
+        )
+
+    @staticmethod
+    def _trips_breaker(error: Exception) -> bool:
+        """Only outages count against the circuit; rate limits are handled by the bucket"""
+        status = getattr(error, "status", None)
+        return status is None or status >= 500
+
+    def _create(self, to_phone: str, body: str, status_callback: Optional[str]):
+        options = {"body": body, "from_": config.twilio_phone_number, "to": to_phone}
+        if status_callback:
+            options["status_callback"] = status_callback
+        return self.client.messages.create(**options)
+
+    async def send(self, to_phone: str, body: str, status_callback: Optional[str] = None) -> Dict[str, Any]:
+        """Hand a message to Twilio, mapping its errors onto retryable and permanent failures"""
+        try:
+            message = await get_dependency("twilio").acall(
+                asyncio.to_thread,
+                self._create,
+                to_phone,
+                body,
+                status_callback,
+                trips_on=self._trips_breaker
+            )
+        except DependencyUnavailable as e:
+            raise SMSDeliveryError(str(e), retryable=True)
+        except Exception as e:
+            status = getattr(e, "status", None)
+            if status == 429:
+                raise SMSThrottled(str(e))
+            raise SMSDeliveryError(str(e), retryable=status is None or status >= 500)
+
+        return {"provider_id": message.sid, "provider_status": message.status}
+
+class FakeSMSProvider:
+    """In-memory provider for tests and local development"""
+
+    name = "fake"
+
+    def __init__(self, history_size: int = 1000):
+        self.sent: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._failures: Deque[Exception] = deque()
+
+    def queue_failure(self, error: Exception):
+        """Make the next send raise `error`, e.g. SMSThrottled to exercise retries"""
+        self._failures.append(error)
+
+    async def send(self, to_phone: str, body: str, status_callback: Optional[str] = None) -> Dict[str, Any]:
+        if self._failures:
+            raise self._failures.popleft()
+
+        provider_id = f"FAKE{uuid.uuid4().hex[:16].upper()}"
+        self.sent.append({
+            "provider_id": provider_id,
+            "to": to_phone,
+            "body": body,
+            "sent_at": datetime.now().isoformat()
+        })
+        return {"provider_id": provider_id, "provider_status": "sent"}
+
+SMS_PROVIDERS = {
+    "twilio": TwilioSMSProvider,
+    "fake": FakeSMSProvider
+}
+
+def create_sms_provider(name: str):
+    """Build the provider selected in configuration"""
+    try:
+        return SMS_PROVIDERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown SMS provider: {name}")
+
+def _prepare_messages(messages: List[Dict[str, Any]]) -> List[Tuple[str, str, Dict[str, str]]]:
+    """Build (message id, queue payload, initial status) for each message"""
+    prepared = []
+    now = datetime.now().isoformat()
+    for message in messages:
+        message_id = uuid.uuid4().hex
+        payload = json.dumps({
+            "id": message_id,
+            "to": message.get("to_phone"),
+            "body": message.get("message", ""),
+            "attempts": 0
+        })
+        status = {"status": "queued", "to": message.get("to_phone") or "", "queued_at": now, "updated_at": now}
+        prepared.append((message_id, payload, status))
+    return prepared
+
+def enqueue_sms(client: redis.Redis, messages: List[Dict[str, Any]], prefix: Optional[str] = None) -> List[str]:
+    """Queue {to_phone, message} dicts in one round trip, returning their message ids"""
+    keys = SMSKeys(prefix or config.sms_key_prefix)
+    prepared = _prepare_messages(messages)
+
+    pipe = client.pipeline(transaction=False)
+    for message_id, payload, status in prepared:
+        pipe.hset(keys.status(message_id), mapping=status)
+        pipe.expire(keys.status(message_id), config.sms_status_ttl)
+        pipe.lpush(keys.queue, payload)
+    pipe.execute()
+
+    return [message_id for message_id, _, _ in prepared]
+
+def get_sms_status(client: redis.Redis, message_id: str, prefix: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """Read the delivery status of a queued message"""
+    status = client.hgetall(SMSKeys(prefix or config.sms_key_prefix).status(message_id))
+    if not status:
+        return None
+    return {key.decode(): value.decode() for key, value in status.items()}
+
+def set_sms_status(client: redis.Redis, message_id: str, fields: Dict[str, Any], prefix: Optional[str] = None):
+    """Write status fields of a message straight to Redis, for processes without a dispatcher"""
+    key = SMSKeys(prefix or config.sms_key_prefix).status(message_id)
+    mapping = {name: str(value) for name, value in fields.items() if value is not None}
+    mapping["updated_at"] = datetime.now().isoformat()
+
+    pipe = client.pipeline(transaction=False)
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, config.sms_status_ttl)
+    pipe.execute()
+
+class SMSDispatcher:
+    """Per-worker consumers of the shared queue, rate limited by the shared token bucket
+
+    Each message is moved atomically onto this dispatcher's processing list
+    while it is sent and removed once its outcome is recorded. A dispatcher
+    that stops heartbeating for `consumer_lease` seconds is presumed dead and
+    its processing list is requeued by the others, so a crash can resend a
+    message but never loses one.
+    """
+
+    def __init__(self, redis_url: str, provider, prefix: str = "sms-dispatch", rate: float = 1.0,
+                 burst: int = 5, concurrency: int = 4, max_attempts: int = 5,
+                 retry_base_delay: float = 2.0, retry_max_delay: float = 300.0,
+                 status_ttl: int = 604800, status_flush_interval: float = 1.0,
+                 status_batch_size: int = 100, status_callback_url: str = "",
+                 consumer_lease: float = 30.0):
+        self.redis_url = redis_url
+        self.provider = provider
+        self.keys = SMSKeys(prefix)
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.status_ttl = status_ttl
+        self.status_flush_interval = status_flush_interval
+        self.status_batch_size = status_batch_size
+        self.status_callback_url = status_callback_url
+        self.consumer_lease = consumer_lease
+        self.consumer_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.processing = self.keys.processing(self.consumer_id)
+        self.redis: Optional[aioredis.Redis] = None
+        self._take_token = None
+        self._promote_due = None
+        self._requeue = None
+        self._pending_status: Dict[str, Dict[str, str]] = {}
+        self._status_ready = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._background: List[asyncio.Task] = []
+        self._running = False
+
+    async def start(self):
+        """Connect to Redis and start the consumers, retry promoter, status writer and heartbeat"""
+        self.redis = aioredis.from_url(self.redis_url)
+        self._take_token = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self._promote_due = self.redis.register_script(PROMOTE_DUE_SCRIPT)
+        self._requeue = self.redis.register_script(REQUEUE_SCRIPT)
+        # Registered before consuming so no other worker mistakes this one for dead
+        await self.redis.zadd(self.keys.consumers, {self.consumer_id: time.time()})
+        self._running = True
+
+        self._workers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        self._background = [
+            asyncio.create_task(self._promote_retries()),
+            asyncio.create_task(self._write_statuses()),
+            asyncio.create_task(self._heartbeat())
+        ]
+        logger.info(f"SMS dispatcher started with {self.concurrency} consumers via {self.provider.name}")
+
+    async def stop(self, timeout: float = 10.0):
+        """Let in-flight sends finish, then flush pending statuses and disconnect"""
+        self._running = False
+        if self._workers:
+            _, pending = await asyncio.wait(self._workers, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._background, return_exceptions=True)
+        self._workers, self._background = [], []
+
+        if self.redis is not None:
+            await self._flush_statuses()
+            # Messages whose send was cancelled go back for another worker
+            try:
+                await self._requeue(
+                    keys=[self.processing, self.keys.queue, self.keys.consumers],
+                    args=[self.consumer_id, 0, 1]
+                )
+            except Exception as e:
+                logger.error(f"Error requeueing in-flight SMS: {str(e)}")
+            await self.redis.aclose()
+            self.redis = None
+
+    def record_status(self, message_id: str, **fields: Any):
+        """Buffer a status change; changes are written to Redis in batches"""
+        fields["updated_at"] = datetime.now().isoformat()
+        pending = self._pending_status.setdefault(message_id, {})
+        pending.update({key: str(value) for key, value in fields.items() if value is not None})
+        if len(self._pending_status) >= self.status_batch_size:
+            self._status_ready.set()
+
+    async def _flush_statuses(self):
+        """Write every buffered status change in one pipeline"""
+        if not self._pending_status:
+            return
+        batch, self._pending_status = self._pending_status, {}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for message_id, fields in batch.items():
+            pipe.hset(self.keys.status(message_id), mapping=fields)
+            pipe.expire(self.keys.status(message_id), self.status_ttl)
+        await pipe.execute()
+
+    async def _write_statuses(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._status_ready.wait(), timeout=self.status_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._status_ready.clear()
+            try:
+                await self._flush_statuses()
+            except Exception as e:
+                logger.error(f"Error writing SMS statuses: {str(e)}")
+
+    async def _promote_retries(self):
+        while True:
+            try:
+                await self._promote_due(keys=[self.keys.delayed, self.keys.queue], args=[time.time(), 100])
+            except Exception as e:
+                logger.error(f"Error promoting SMS retries: {str(e)}")
+            await asyncio.sleep(0.5)
+
+    async def _heartbeat(self):
+        """Keep this dispatcher's lease alive and requeue the messages of dispatchers that lost theirs"""
+        while True:
+            try:
+                now = time.time()
+                await self.redis.zadd(self.keys.consumers, {self.consumer_id: now})
+                cutoff = now - self.consumer_lease
+                for consumer in await self.redis.zrangebyscore(self.keys.consumers, "-inf", cutoff):
+                    consumer = consumer.decode()
+                    moved = await self._requeue(
+                        keys=[self.keys.processing(consumer), self.keys.queue, self.keys.consumers],
+                        args=[consumer, cutoff, 0]
+                    )
+                    if moved:
+                        logger.warning(f"Requeued {moved} SMS from dispatcher {consumer} after its lease expired")
+            except Exception as e:
+                logger.error(f"Error renewing SMS consumer lease: {str(e)}")
+            await asyncio.sleep(self.consumer_lease / 3)
+
+    async def _acquire_token(self):
+        """Wait until the shared bucket grants a send"""
+        while True:
+            wait = float(await self._take_token(keys=[self.keys.bucket, self.keys.pause], args=[self.rate, self.burst]))
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def _consume(self):
+        while self._running:
+            try:
+                raw = await self.redis.blmove(self.keys.queue, self.processing, 1, "RIGHT", "LEFT")
+                if raw is None:
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in SMS consumer: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+
+            try:
+                await self._deliver(json.loads(raw))
+                await self.redis.lrem(self.processing, 1, raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Left on the processing list; requeued when this dispatcher stops or its lease lapses
+                logger.error(f"Error delivering SMS: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def _deliver(self, message: Dict[str, Any]):
+        """Send one message, scheduling a retry or recording the outcome"""
+        message["attempts"] = message.get("attempts", 0) + 1
+        callback = f"{self.status_callback_url}?message_id={message['id']}" if self.status_callback_url else None
+
+        await self._acquire_token()
+        try:
+            result = await self.provider.send(message["to"], message["body"], callback)
+        except SMSThrottled as e:
+            # Hold back every worker rather than letting each discover the limit with its own 429
+            pause = e.retry_after or self.retry_base_delay
+            await self.redis.set(self.keys.pause, 1, px=int(pause * 1000), nx=True)
+            await self._retry(message, str(e), e.retry_after)
+        except SMSDeliveryError as e:
+            if e.retryable:
+                await self._retry(message, str(e))
+            else:
+                self.record_status(message["id"], status="failed", attempts=message["attempts"], error=str(e))
+        except Exception as e:
+            await self._retry(message, str(e))
+        else:
+            self.record_status(message["id"], status="sent", attempts=message["attempts"], **result)
+
+    async def _retry(self, message: Dict[str, Any], error: str, retry_after: Optional[float] = None):
+        """Schedule another attempt with jittered exponential backoff, or give up"""
+        if message["attempts"] >= self.max_attempts:
+            self.record_status(message["id"], status="failed", attempts=message["attempts"], error=error)
+            return
+
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (message["attempts"] - 1))
+        delay = max(random.uniform(delay / 2, delay), retry_after or 0)
+        due_at = time.time() + delay
+
+        await self.redis.zadd(self.keys.delayed, {json.dumps(message): due_at})
+        self.record_status(
+            message["id"],
+            status="retrying",
+            attempts=message["attempts"],
+            error=error,
+            next_attempt_at=datetime.fromtimestamp(due_at).isoformat()
+        )
+
+def verify_twilio_signature(url: str, params: Dict[str, Any], signature: str) -> bool:
+    """Check that a status callback was signed by Twilio with our auth token"""
+    from twilio.request_validator import RequestValidator
+    return RequestValidator(config.twilio_auth_token).validate(url, params, signature)
+
+_dispatcher: Optional[SMSDispatcher] = None
+
+def get_sms_dispatcher() -> Optional[SMSDispatcher]:
+    """The dispatcher running in this worker, if any"""
+    return _dispatcher
+
+async def start_sms_dispatcher() -> SMSDispatcher:
+    """Start this worker's share of SMS consumers"""
+    global _dispatcher
+    if _dispatcher is None:
+        dispatcher = SMSDispatcher(
+            redis_url=config.redis_url,
+            provider=create_sms_provider(config.sms_provider),
+            prefix=config.sms_key_prefix,
+            rate=config.sms_rate_per_second,
+            burst=config.sms_burst,
+            concurrency=config.sms_consumers_per_worker,
+            max_attempts=config.sms_max_attempts,
+            retry_base_delay=config.sms_retry_base_delay,
+            retry_max_delay=config.sms_retry_max_delay,
+            status_ttl=config.sms_status_ttl,
+            status_flush_interval=config.sms_status_flush_interval,
+            status_batch_size=config.sms_status_batch_size,
+            status_callback_url=config.sms_status_callback_url,
+            consumer_lease=config.sms_consumer_lease
+        )
+        await dispatcher.start()
+        _dispatcher = dispatcher
+    return _dispatcher
+
+async def stop_sms_dispatcher():
+    """Stop this worker's SMS consumers"""
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.stop()
+        _dispatcher = None
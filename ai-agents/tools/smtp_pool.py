@@ -0,0 +1,175 @@
+"""
+SMTP Connection Pool
+Reusable authenticated SMTP sessions for email delivery
+"""
+
+import logging
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from config.agent_config import config
+
+logger = logging.getLogger(__name__)
+
+# Sessions idle for longer than this are checked with NOOP before reuse
+LIVENESS_CHECK_AFTER = 5.0
+
+class SMTPSessionError(Exception):
+    """No usable session even after reconnecting once; `errors` has one entry per envelope"""
+
+    def __init__(self, message: str, errors: List[Optional[str]]):
+        super().__init__(message)
+        self.errors = errors
+
+class SMTPConnectionPool:
+    """Thread-safe pool of logged-in SMTP sessions"""
+
+    def __init__(self, host: str, port: int, username: str = "", password: str = "",
+                 use_tls: bool = True, max_size: int = 4, idle_timeout: float = 60.0, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open, secure and authenticate a new SMTP session"""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        """Close a session, ignoring errors from already dead connections"""
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _checkout(self) -> smtplib.SMTP:
+        """Take a live idle session from the pool or open a new one"""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            idle_for = time.monotonic() - last_used
+            if idle_for > self.idle_timeout:
+                self._close(server)
+                continue
+
+            if idle_for <= LIVENESS_CHECK_AFTER:
+                return server
+
+            # Servers may drop idle sessions before our own idle timeout
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close(server)
+
+    @contextmanager
+    def connection(self):
+        """Borrow an authenticated session, returning it to the pool when done"""
+        self._slots.acquire()
+        server = None
+        reusable = False
+        try:
+            server = self._checkout()
+            yield server
+            reusable = True
+        finally:
+            if server is not None:
+                if reusable:
+                    self._idle.put((server, time.monotonic()))
+                else:
+                    self._close(server)
+            self._slots.release()
+
+    def send_many(self, envelopes: List[Tuple[str, Optional[str], str]]) -> List[Optional[str]]:
+        """Send (sender, recipient, message) envelopes over one session, returning an error per envelope
+
+        Raises SMTPSessionError, carrying the per-envelope errors, when the
+        session fails again after one reconnect, so callers can count the
+        server itself as failing rather than individual messages.
+        """
+        errors: List[Optional[str]] = []
+        pending = list(envelopes)
+        reconnected = False
+
+        while pending:
+            try:
+                with self.connection() as server:
+                    while pending:
+                        sender, recipient, message = pending[0]
+                        if not recipient:
+                            errors.append("Missing recipient address")
+                        else:
+                            try:
+                                server.sendmail(sender, recipient, message)
+                                errors.append(None)
+                            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused) as e:
+                                errors.append(str(e))
+                        pending.pop(0)
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                # Retry the remaining messages once on a fresh session
+                if reconnected:
+                    logger.error(f"SMTP session lost twice during bulk send: {str(e)}")
+                    errors.extend(str(e) for _ in pending)
+                    raise SMTPSessionError(str(e), errors) from e
+                reconnected = True
+
+        return errors
+
+    def close(self):
+        """Close all idle sessions"""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close(server)
+
+_smtp_pool: Optional[SMTPConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Get the worker-wide SMTP pool, creating it on first use"""
+    global _smtp_pool
+    if _smtp_pool is None:
+        with _pool_lock:
+            if _smtp_pool is None:
+                _smtp_pool = SMTPConnectionPool(
+                    host=config.smtp_host,
+                    port=config.smtp_port,
+                    username=config.smtp_username,
+                    password=config.smtp_password,
+                    use_tls=config.smtp_use_tls,
+                    max_size=config.smtp_pool_size,
+                    idle_timeout=config.smtp_pool_idle_timeout,
+                    timeout=config.smtp_timeout
+                )
+    return _smtp_pool
+
+def close_smtp_pool():
+    """Close idle sessions held by the worker-wide pool"""
+    global _smtp_pool
+    if _smtp_pool is not None:
+        _smtp_pool.close()
+        _smtp_pool = None
@@ -0,0 +1,171 @@
+"""
+Streaming Statistics
+Bounded-memory column statistics computed incrementally over row chunks
+"""
+
+import math
+import random
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+class RunningColumnStats:
+    """Incremental statistics for a single column with bounded memory"""
+
+    def __init__(self, sample_size: int = 10000, seed: Optional[int] = None):
+        self.count = 0
+        self.null_count = 0
+        self.numeric_count = 0
+        self.mean = 0.0
+        self.min = None
+        self.max = None
+        self.value_type = None
+        self._m2 = 0.0
+        self._numeric_min: Optional[float] = None
+        self._numeric_max: Optional[float] = None
+        self._sample: List[float] = []
+        self._sample_size = sample_size
+        self._rng = random.Random(seed)
+
+    def update(self, value: Any):
+        """Fold one value into the running statistics"""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            self.null_count += 1
+            return
+
+        self.count += 1
+        if self.value_type is None:
+            self.value_type = type(value).__name__
+
+        try:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        except TypeError:
+            # Mixed, non-comparable types in one column
+            pass
+
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            self._update_numeric(float(value))
+
+    def _update_numeric(self, value: float):
+        """Welford update for mean/variance plus reservoir sampling for quantiles"""
+        self.numeric_count += 1
+        delta = value - self.mean
+        self.mean += delta / self.numeric_count
+        self._m2 += delta * (value - self.mean)
+
+        if self._numeric_min is None or value < self._numeric_min:
+            self._numeric_min = value
+        if self._numeric_max is None or value > self._numeric_max:
+            self._numeric_max = value
+
+        if len(self._sample) < self._sample_size:
+            self._sample.append(value)
+        else:
+            slot = self._rng.randrange(self.numeric_count)
+            if slot < self._sample_size:
+                self._sample[slot] = value
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.numeric_count > 0
+
+    @property
+    def is_temporal(self) -> bool:
+        return isinstance(self.min, (datetime, date))
+
+    def variance(self) -> Optional[float]:
+        """Sample variance (ddof=1), matching pandas describe()"""
+        if self.numeric_count < 2:
+            return None
+        return self._m2 / (self.numeric_count - 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile from the reservoir sample"""
+        if not self._sample:
+            return None
+        ordered = sorted(self._sample)
+        position = (len(ordered) - 1) * q
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        if lower == upper:
+            return ordered[lower]
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    def describe(self) -> Dict[str, Any]:
+        """Summary statistics in the same shape as pandas describe()"""
+        variance = self.variance()
+        summary = {
+            "count": float(self.numeric_count),
+            "mean": self.mean,
+            "std": math.sqrt(variance) if variance is not None else None,
+            "min": self._numeric_min
+        }
+        for q in QUANTILES:
+            summary[f"{int(q * 100)}%"] = self.quantile(q)
+        summary["max"] = self._numeric_max
+        summary["variance"] = variance
+        return summary
+
+class StreamingTableStats:
+    """Incremental statistics for every column of a streamed result set"""
+
+    def __init__(self, sample_size: int = 10000, seed: Optional[int] = None):
+        self.total_rows = 0
+        self.columns: List[str] = []
+        self._columns: Dict[str, RunningColumnStats] = {}
+        self._sample_size = sample_size
+        self._seed = seed
+
+    def update(self, columns: Sequence[str], rows: Sequence[Sequence[Any]]):
+        """Fold a chunk of rows into the running statistics"""
+        if not self.columns:
+            self.columns = list(columns)
+            self._columns = {
+                column: RunningColumnStats(self._sample_size, self._seed)
+                for column in self.columns
+            }
+
+        column_stats = [self._columns[column] for column in self.columns]
+        for row in rows:
+            self.total_rows += 1
+            for stats, value in zip(column_stats, row):
+                stats.update(value)
+
+    def summary(self) -> Dict[str, Any]:
+        """Summary analysis matching the batch DataAnalyzerTool output"""
+        return {
+            "total_rows": self.total_rows,
+            "columns": self.columns,
+            "data_types": {
+                column: stats.value_type or "unknown" for column, stats in self._columns.items()
+            },
+            "missing_values": {
+                column: stats.null_count for column, stats in self._columns.items()
+            },
+            "summary_stats": {
+                column: stats.describe() for column, stats in self._columns.items() if stats.is_numeric
+            }
+        }
+
+    def trends(self) -> Dict[str, Any]:
+        """Time span of every date/datetime column"""
+        time_columns = [column for column, stats in self._columns.items() if stats.is_temporal]
+
+        trends = {}
+        for column in time_columns:
+            stats = self._columns[column]
+            trends[column] = {
+                "start_date": str(stats.min),
+                "end_date": str(stats.max),
+                "time_span_days": (stats.max - stats.min).days
+            }
+
+        return {
+            "time_columns": time_columns,
+            "trends": trends
+        }
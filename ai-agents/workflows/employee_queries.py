@@ -5,13 +5,17 @@ Intelligent handling of employee queries with automated responses and escalation
 
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 import re
 import json
+import uuid
 
 from agents.core_agents import AGENTS
 from agents.specialized_agents import SPECIALIZED_AGENTS
 from tools.agent_tools import AGENT_TOOLS
+from src.scheduler import PRIORITY_LEVELS, normalize_priority
+from src.task_queue import submit_tasks
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +56,7 @@ class EmployeeQueryResolutionSystem:
             
             # Step 6: Route to appropriate specialist if needed
             specialist_routing = await self._route_to_specialist(
-                query_data, query_analysis, escalation_result
+                query_data, query_analysis, escalation_result, priority_assessment
             )
             
             # Step 7: Track query resolution progress
@@ -320,7 +324,8 @@ class EmployeeQueryResolutionSystem:
     
     async def _route_to_specialist(self, query_data: Dict[str, Any], 
                                  query_analysis: Dict[str, Any], 
-                                 escalation_result: Dict[str, Any]) -> Dict[str, Any]:
+                                 escalation_result: Dict[str, Any],
+                                 priority_assessment: Dict[str, Any]) -> Dict[str, Any]:
         """Route query to appropriate specialist agent"""
         try:
             if not escalation_result.get("escalated", False):
@@ -346,7 +351,10 @@ class EmployeeQueryResolutionSystem:
             )
             
             # Route to specialist
-            routing_result = await self._route_to_agent(specialist_agent, handover_data)
+            priority = self._scheduling_priority(query_analysis, priority_assessment)
+            routing_result = await self._route_to_agent(
+                specialist_agent, handover_data, priority, query_data.get("department")
+            )
             
             # Update tracking
             tracking_update = await self._update_specialist_tracking(
@@ -367,6 +375,41 @@ class EmployeeQueryResolutionSystem:
             logger.error(f"Error routing to specialist: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    def _scheduling_priority(self, query_analysis: Dict[str, Any], 
+                             priority_assessment: Dict[str, Any]) -> str:
+        """Queue priority for a specialist handover: the more urgent of the assessment and the category rule"""
+        if priority_assessment.get("requires_immediate_attention"):
+            return "urgent"
+        
+        rule = self.escalation_rules.get(query_analysis.get("category"), {})
+        candidates = [
+            normalize_priority(priority_assessment.get("priority")),
+            normalize_priority(rule.get("priority"))
+        ]
+        return min(candidates, key=PRIORITY_LEVELS.index)
+    
+    async def _route_to_agent(self, agent_type: str, handover_data: Dict[str, Any], 
+                              priority: str, department: Optional[str] = None) -> Dict[str, Any]:
+        """Queue the handover for the specialist agent's workers"""
+        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{agent_type}_{uuid.uuid4().hex[:8]}"
+        payload = {
+            "task_id": task_id,
+            "agent_type": agent_type,
+            "task": "resolve_employee_query",
+            "data": handover_data,
+            "priority": priority,
+            "tenant": department
+        }
+        
+        await asyncio.to_thread(submit_tasks, [payload])
+        
+        return {
+            "success": True,
+            "task_id": task_id,
+            "priority": priority,
+            "status": "queued"
+        }
+    
     def _initialize_knowledge_base(self) -> Dict[str, Any]:
         """Initialize knowledge base with common queries and responses"""
         return {
@@ -74,7 +74,7 @@ class WorkflowOrchestrator:
             })
             
             # Step 6: Workflow Engine coordinates final steps
-            workflow_completion = AGENT_TOOLS["workflow_engine"]._run("complete", {
+            workflow_completion = await AGENT_TOOLS["workflow_engine"]._arun("complete", {
                 "workflow_id": hr_result.get("workflow_id"),
                 "completion_status": "success",
                 "completion_summary": {
@@ -347,25 +347,8 @@ class WorkflowOrchestrator:
         """Find suitable coverage for employee leave"""
         try:
             # Query available team members
-            availability_query = """
-            SELECT e.id, e.name, e.email, e.department_id, e.skills,
-                   COUNT(lr.id) as concurrent_leaves
-            FROM employees e
-            LEFT JOIN leave_requests lr ON e.id = lr.employee_id 
-                AND lr.status = 'approved'
-                AND (lr.start_date <= :end_date AND lr.end_date >= :start_date)
-            WHERE e.department_id = (
-                SELECT department_id FROM employees WHERE id = :employee_id
-            )
-            AND e.id != :employee_id
-            AND e.active = true
-            GROUP BY e.id
-            HAVING COUNT(lr.id) = 0
-            ORDER BY e.experience_level DESC
-            """
-            
-            coverage_result = AGENT_TOOLS["database_query"]._run(
-                availability_query,
+            coverage_result = await AGENT_TOOLS["database_query"].arun_named(
+                "employees.available_in_department",
                 {
                     "employee_id": coverage_data.get("employee_id"),
                     "start_date": coverage_data.get("start_date"),
@@ -427,7 +410,7 @@ class WorkflowOrchestrator:
                     ]
                 }
                 
-                workflow_result = AGENT_TOOLS["workflow_engine"]._run("create", workflow_data)
+                workflow_result = await AGENT_TOOLS["workflow_engine"]._arun("create", workflow_data)
                 
                 return {
                     "success": True,
@@ -528,7 +511,7 @@ class WorkflowOrchestrator:
                 ]
             }
             
-            workflow_result = AGENT_TOOLS["workflow_engine"]._run("create", workflow_data)
+            workflow_result = await AGENT_TOOLS["workflow_engine"]._arun("create", workflow_data)
             
             # Assign reviewers
             assigned_reviewers = []
@@ -558,44 +541,20 @@ class WorkflowOrchestrator:
             review_period = review_data.get("review_period")
             
             # Get project participation data
-            project_query = """
-            SELECT p.name, t.status, t.completion_date, t.quality_score
-            FROM projects p
-            JOIN tasks t ON p.id = t.project_id
-            WHERE t.assigned_to = :employee_id
-            AND t.created_at >= :start_period
-            """
-            
-            project_data = AGENT_TOOLS["database_query"]._run(
-                project_query,
+            project_data = await AGENT_TOOLS["database_query"].arun_named(
+                "tasks.assigned_since",
                 {"employee_id": employee_id, "start_period": f"{review_period}-01-01"}
             )
             
             # Get attendance data
-            attendance_query = """
-            SELECT AVG(hours_worked) as avg_hours, 
-                   COUNT(*) as total_days,
-                   SUM(CASE WHEN hours_worked >= 8 THEN 1 ELSE 0 END) as full_days
-            FROM attendance
-            WHERE employee_id = :employee_id
-            AND date >= :start_period
-            """
-            
-            attendance_data = AGENT_TOOLS["database_query"]._run(
-                attendance_query,
+            attendance_data = await AGENT_TOOLS["database_query"].arun_named(
+                "attendance.summary_since",
                 {"employee_id": employee_id, "start_period": f"{review_period}-01-01"}
             )
             
             # Get goal achievement data
-            goals_query = """
-            SELECT goal_description, target_value, actual_value, achievement_percentage
-            FROM employee_goals
-            WHERE employee_id = :employee_id
-            AND goal_period = :review_period
-            """
-            
-            goals_data = AGENT_TOOLS["database_query"]._run(
-                goals_query,
+            goals_data = await AGENT_TOOLS["database_query"].arun_named(
+                "employee_goals.by_period",
                 {"employee_id": employee_id, "review_period": review_period}
             )
             
@@ -10,6 +10,7 @@ import logging
 from agents.core_agents import AGENTS
 from agents.specialized_agents import SPECIALIZED_AGENTS
 from tools.agent_tools import AGENT_TOOLS
+from src.progress import WorkflowProgress
 
 logger = logging.getLogger(__name__)
 
@@ -22,30 +23,37 @@ class LeaveManagementSystem:
     
     async def process_leave_request(self, leave_request: Dict[str, Any]) -> Dict[str, Any]:
         """Process complete leave request workflow"""
-        workflow_id = f"leave_{leave_request.get('leave_request_id')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Callers may choose the ID so they can subscribe to progress before starting
+        workflow_id = leave_request.get("workflow_id") or f"leave_{leave_request.get('leave_request_id')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        progress = WorkflowProgress(workflow_id, total_steps=6)
         
         try:
             logger.info(f"Starting leave management workflow: {workflow_id}")
+            await progress.started(workflow_type="leave_request")
             
             # Step 1: Validate leave request
             validation_result = await self._validate_leave_request(leave_request)
             if not validation_result.get("valid"):
+                await progress.failed("Leave request validation failed")
                 return {
                     "success": False,
                     "workflow_id": workflow_id,
                     "error": "Leave request validation failed",
                     "validation_details": validation_result
                 }
+            await progress.step("validation")
             
             # Step 2: Check leave balance and eligibility
             eligibility_result = await SPECIALIZED_AGENTS["leave_processing_agent"].process_leave_application(leave_request)
             if not eligibility_result.get("success"):
+                await progress.failed("Employee not eligible for leave")
                 return {
                     "success": False,
                     "workflow_id": workflow_id,
                     "error": "Employee not eligible for leave",
                     "eligibility_details": eligibility_result
                 }
+            await progress.step("eligibility_check")
             
             # Step 3: Find coverage for the leave period
             coverage_result = await SPECIALIZED_AGENTS["coverage_agent"].find_optimal_coverage({
@@ -55,6 +63,7 @@ class LeaveManagementSystem:
                 "required_skills": leave_request.get("required_skills", []),
                 "department": leave_request.get("department")
             })
+            await progress.step("coverage_planning")
             
             # Step 4: Create approval workflow
             approval_result = await self._create_approval_workflow({
@@ -63,6 +72,7 @@ class LeaveManagementSystem:
                 "eligibility": eligibility_result,
                 "coverage": coverage_result
             })
+            await progress.step("approval_workflow")
             
             # Step 5: Notify stakeholders
             notification_result = await self._notify_leave_stakeholders({
@@ -71,6 +81,7 @@ class LeaveManagementSystem:
                 "approval_workflow": approval_result,
                 "coverage_assignments": coverage_result.get("coverage_assignments", [])
             })
+            await progress.step("stakeholder_notification")
             
             # Step 6: Schedule calendar updates (pending approval)
             calendar_result = await self._schedule_calendar_updates({
@@ -78,6 +89,7 @@ class LeaveManagementSystem:
                 "workflow_id": workflow_id,
                 "approval_pending": True
             })
+            await progress.step("calendar_scheduling")
             
             # Store workflow state
             workflow_state = {
@@ -101,6 +113,7 @@ class LeaveManagementSystem:
             
             # Store in persistent memory
             AGENT_TOOLS["memory_store"]._run("set", workflow_id, workflow_state, ttl=2592000)  # 30 days
+            await progress.completed(status="pending_approval")
             
             return {
                 "success": True,
@@ -113,6 +126,7 @@ class LeaveManagementSystem:
             
         except Exception as e:
             logger.error(f"Error in leave management workflow: {str(e)}")
+            await progress.failed(str(e))
             return {
                 "success": False,
                 "workflow_id": workflow_id,
@@ -202,18 +216,8 @@ class LeaveManagementSystem:
             start_date = leave_request.get("start_date")
             end_date = leave_request.get("end_date")
             
-            overlap_query = """
-            SELECT id, start_date, end_date, leave_type, status
-            FROM leave_requests
-            WHERE employee_id = :employee_id
-            AND status IN ('pending', 'approved')
-            AND (
-                (start_date <= :end_date AND end_date >= :start_date)
-            )
-            """
-            
-            overlap_result = AGENT_TOOLS["database_query"]._run(
-                overlap_query,
+            overlap_result = await AGENT_TOOLS["database_query"].arun_named(
+                "leave_requests.overlapping",
                 {
                     "employee_id": employee_id,
                     "start_date": start_date,
@@ -221,7 +225,14 @@ class LeaveManagementSystem:
                 }
             )
             
-            if overlap_result.get("success") and overlap_result.get("data"):
+            # A failed lookup must not read as "no overlap"
+            if not overlap_result.get("success"):
+                return {
+                    "success": False,
+                    "errors": [f"Could not check for overlapping leave: {overlap_result.get('error', 'query failed')}"]
+                }
+
+            if overlap_result.get("data"):
                 overlapping_requests = overlap_result["data"]
                 return {
                     "success": False,
@@ -242,16 +253,8 @@ class LeaveManagementSystem:
             days_requested = workflow_data.get("days_requested", 0)
             
             # Get employee information for approval chain
-            employee_query = """
-            SELECT e.*, d.name as department_name, m.id as manager_id, m.name as manager_name
-            FROM employees e
-            LEFT JOIN departments d ON e.department_id = d.id
-            LEFT JOIN employees m ON e.manager_id = m.id
-            WHERE e.id = :employee_id
-            """
-            
-            employee_result = AGENT_TOOLS["database_query"]._run(
-                employee_query, {"employee_id": employee_id}
+            employee_result = await AGENT_TOOLS["database_query"].arun_named(
+                "employees.with_approval_chain", {"employee_id": employee_id}
             )
             
             if not employee_result.get("success") or not employee_result.get("data"):
@@ -310,7 +313,7 @@ class LeaveManagementSystem:
                 ]
             }
             
-            workflow_result = AGENT_TOOLS["workflow_engine"]._run("create", workflow_create_data)
+            workflow_result = await AGENT_TOOLS["workflow_engine"]._arun("create", workflow_create_data)
             
             return {
                 "success": True,
@@ -327,13 +330,15 @@ class LeaveManagementSystem:
     async def _notify_leave_stakeholders(self, notification_data: Dict[str, Any]) -> Dict[str, Any]:
         """Notify all stakeholders about leave request"""
         try:
-            notifications_sent = []
+            recipients = []
+            messages = []
             
             # Notify employee
-            employee_notification = AGENT_TOOLS["email_sender"]._run(
-                notification_data.get("employee_email"),
-                "Leave Request Submitted",
-                f"""
+            recipients.append("employee")
+            messages.append({
+                "to_email": notification_data.get("employee_email"),
+                "subject": "Leave Request Submitted",
+                "body": f"""
                 Your leave request has been submitted for approval.
                 
                 Leave Type: {notification_data.get('leave_type')}
@@ -342,19 +347,16 @@ class LeaveManagementSystem:
                 
                 You will be notified once the approval process is complete.
                 """
-            )
-            notifications_sent.append({
-                "recipient": "employee",
-                "success": employee_notification.get("success")
             })
             
             # Notify manager(s) in approval chain
             approval_workflow = notification_data.get("approval_workflow", {})
             for approver in approval_workflow.get("approval_chain", []):
-                manager_notification = AGENT_TOOLS["email_sender"]._run(
-                    f"{approver['approver_id']}@company.com",  # Simplified email
-                    "Leave Request Approval Required",
-                    f"""
+                recipients.append(approver["approver_name"])
+                messages.append({
+                    "to_email": f"{approver['approver_id']}@company.com",  # Simplified email
+                    "subject": "Leave Request Approval Required",
+                    "body": f"""
                     A leave request requires your approval:
                     
                     Employee: {notification_data.get('employee_name')}
@@ -364,18 +366,15 @@ class LeaveManagementSystem:
                     
                     Please review and approve/reject this request in the HR system.
                     """
-                )
-                notifications_sent.append({
-                    "recipient": approver["approver_name"],
-                    "success": manager_notification.get("success")
                 })
             
             # Notify coverage team
             for coverage in notification_data.get("coverage_assignments", []):
-                coverage_notification = AGENT_TOOLS["email_sender"]._run(
-                    coverage.get("email"),
-                    "Coverage Assignment Notification",
-                    f"""
+                recipients.append(coverage.get("name"))
+                messages.append({
+                    "to_email": coverage.get("email"),
+                    "subject": "Coverage Assignment Notification",
+                    "body": f"""
                     You have been assigned coverage duties:
                     
                     Covering for: {notification_data.get('employee_name')}
@@ -384,12 +383,16 @@ class LeaveManagementSystem:
                     
                     This is pending approval. You will be notified if the leave is approved.
                     """
-                )
-                notifications_sent.append({
-                    "recipient": coverage.get("name"),
-                    "success": coverage_notification.get("success")
                 })
             
+            # Deliver all notifications over one pooled SMTP session
+            send_result = await AGENT_TOOLS["email_sender"].asend_many(messages)
+            
+            notifications_sent = [
+                {"recipient": recipient, "success": outcome["success"]}
+                for recipient, outcome in zip(recipients, send_result["results"])
+            ]
+            
             return {
                 "success": True,
                 "notifications_sent": notifications_sent,
@@ -443,17 +446,8 @@ class LeaveManagementSystem:
             leave_request_id = workflow_state.get("leave_request_id")
             
             # Update leave request status
-            update_query = """
-            UPDATE leave_requests 
-            SET status = 'approved', 
-                approved_by = :approver_id,
-                approved_at = NOW(),
-                approval_comments = :comments
-            WHERE id = :leave_request_id
-            """
-            
-            update_result = AGENT_TOOLS["database_query"]._run(
-                update_query,
+            update_result = await AGENT_TOOLS["database_query"].arun_named(
+                "leave_requests.approve",
                 {
                     "approver_id": approver_id,
                     "comments": comments,
@@ -506,17 +500,8 @@ class LeaveManagementSystem:
             leave_request_id = workflow_state.get("leave_request_id")
             
             # Update leave request status
-            update_query = """
-            UPDATE leave_requests 
-            SET status = 'rejected', 
-                rejected_by = :approver_id,
-                rejected_at = NOW(),
-                rejection_comments = :comments
-            WHERE id = :leave_request_id
-            """
-            
-            update_result = AGENT_TOOLS["database_query"]._run(
-                update_query,
+            update_result = await AGENT_TOOLS["database_query"].arun_named(
+                "leave_requests.reject",
                 {
                     "approver_id": approver_id,
                     "comments": comments,
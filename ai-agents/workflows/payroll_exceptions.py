@@ -12,6 +12,8 @@ import json
 from agents.core_agents import AGENTS
 from agents.specialized_agents import SPECIALIZED_AGENTS
 from tools.agent_tools import AGENT_TOOLS
+from tools.resilience import get_dependency
+from src.progress import WorkflowProgress
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +27,20 @@ class PayrollExceptionHandler:
     
     async def process_payroll_exceptions(self, payroll_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process comprehensive payroll exception handling workflow"""
-        workflow_id = f"payroll_exceptions_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Callers may choose the ID so they can subscribe to progress before starting
+        workflow_id = payroll_data.get("workflow_id") or f"payroll_exceptions_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        progress = WorkflowProgress(workflow_id, total_steps=8)
         
         try:
             logger.info(f"Starting payroll exception handling workflow: {workflow_id}")
+            await progress.started(workflow_type="payroll_exceptions")
             
             # Step 1: Detect payroll exceptions
             detection_result = await SPECIALIZED_AGENTS["payroll_agent"].detect_payroll_exceptions(payroll_data)
+            await progress.step("exception_detection", exceptions_found=len(detection_result.get("exceptions", [])))
             
             if not detection_result.get("exceptions_found"):
+                await progress.completed(status="clean_payroll")
                 return {
                     "success": True,
                     "workflow_id": workflow_id,
@@ -44,28 +51,35 @@ class PayrollExceptionHandler:
             
             # Step 2: Categorize and prioritize exceptions
             categorization_result = await self._categorize_exceptions(detection_result.get("exceptions", []))
+            await progress.step("categorization")
             
             # Step 3: Analyze exception patterns
             pattern_analysis = await self._analyze_exception_patterns(detection_result, payroll_data)
+            await progress.step("pattern_analysis")
             
             # Step 4: Generate automatic resolutions
             auto_resolution_result = await self._generate_automatic_resolutions(categorization_result)
+            await progress.step("auto_resolution", auto_resolved=len(auto_resolution_result.get("resolved", [])))
             
             # Step 5: Handle complex exceptions requiring escalation
             escalation_result = await self._handle_exception_escalations(categorization_result)
+            await progress.step("escalation_handling", escalated=len(escalation_result.get("escalated", [])))
             
             # Step 6: Integrate with Frappe for payroll adjustments
             frappe_integration_result = await self._integrate_with_frappe(
                 auto_resolution_result, payroll_data
             )
+            await progress.step("frappe_integration")
             
             # Step 7: Create approval workflows for significant adjustments
             approval_workflow_result = await self._create_approval_workflows(escalation_result)
+            await progress.step("approval_workflows")
             
             # Step 8: Generate exception reports
             reporting_result = await self._generate_exception_reports(
                 detection_result, categorization_result, pattern_analysis
             )
+            await progress.step("reporting")
             
             # Create comprehensive workflow state
             workflow_state = {
@@ -93,6 +107,7 @@ class PayrollExceptionHandler:
             
             # Store in persistent memory
             AGENT_TOOLS["memory_store"]._run("set", workflow_id, workflow_state, ttl=2592000)  # 30 days
+            await progress.completed(status="processing", escalated=workflow_state["escalated"])
             
             return {
                 "success": True,
@@ -107,6 +122,7 @@ class PayrollExceptionHandler:
             
         except Exception as e:
             logger.error(f"Error in payroll exception handling workflow: {str(e)}")
+            await progress.failed(str(e))
             return {
                 "success": False,
                 "workflow_id": workflow_id,
@@ -489,21 +505,32 @@ class PayrollExceptionHandler:
             
             url = f"{self.frappe_config['base_url']}/api/resource/Salary Slip"
             
-            # Simulate Frappe API call
-            # response = requests.post(url, headers=headers, json=adjustment_data)
-            
-            # For demonstration
-            return {
-                "success": True,
-                "frappe_doc_id": f"SAL-SLIP-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                "adjustment_applied": True,
-                "message": "Adjustment applied successfully in Frappe"
-            }
+            # Bounded by the Frappe bulkhead and failing fast while its circuit is open
+            return await get_dependency("frappe").acall(
+                self._post_frappe_adjustment,
+                url,
+                headers,
+                adjustment_data,
+                is_failure=lambda result: not result.get("success")
+            )
             
         except Exception as e:
             logger.error(f"Error applying Frappe adjustment: {str(e)}")
             return {"success": False, "error": str(e)}
     
+    async def _post_frappe_adjustment(self, url: str, headers: Dict[str, str], adjustment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a salary slip adjustment to the Frappe API"""
+        # Simulate Frappe API call
+        # response = requests.post(url, headers=headers, json=adjustment_data)
+        
+        # For demonstration
+        return {
+            "success": True,
+            "frappe_doc_id": f"SAL-SLIP-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "adjustment_applied": True,
+            "message": "Adjustment applied successfully in Frappe"
+        }
+    
     # Additional helper methods would be implemented here...
     
     def _estimate_resolution_time(self, categorization_result: Dict[str, Any]) -> str:
@@ -67,7 +67,7 @@ class PerformanceReviewSystem:
                 ]
             }
             
-            workflow_result = AGENT_TOOLS["workflow_engine"]._run("create", workflow_data)
+            workflow_result = await AGENT_TOOLS["workflow_engine"]._arun("create", workflow_data)
             
             # Store review state
             review_state = {
@@ -6,10 +6,12 @@ use App\Services\LLM\LLMManager;
 use App\Services\LLM\Models\LLMRequest;
 use App\Services\LLM\Models\LLMResponse;
 use App\Services\LLM\Exceptions\LLMException;
+use Illuminate\Http\Client\ConnectionException;
 use Illuminate\Http\Client\RequestException;
 use Illuminate\Support\Facades\Http;
 use Illuminate\Support\Facades\Log;
 use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Str;
 
 class AIAgentService
 {
@@ -24,6 +26,19 @@ class AIAgentService
         $this->llmManager = $llmManager ?? new LLMManager();
     }
     
+    /**
+     * Request that retries timeouts under a single Idempotency-Key
+     *
+     * Each submission gets its own key, so only its retries are deduplicated.
+     * Queued jobs should pass a key stored with the job to cover job retries too.
+     */
+    protected function idempotentRequest(?string $idempotencyKey = null)
+    {
+        return Http::timeout($this->timeout)
+            ->withHeaders(['Idempotency-Key' => $idempotencyKey ?? (string) Str::uuid()])
+            ->retry(2, 500, fn ($exception) => $exception instanceof ConnectionException, throw: false);
+    }
+    
     /**
      * Check if AI agent system is healthy
      */
@@ -112,10 +127,10 @@ class AIAgentService
     /**
      * Process employee onboarding using HR agent
      */
-    public function processEmployeeOnboarding(array $employeeData): array
+    public function processEmployeeOnboarding(array $employeeData, ?string $idempotencyKey = null): array
     {
         try {
-            $response = Http::timeout($this->timeout)
+            $response = $this->idempotentRequest($idempotencyKey)
                 ->post("{$this->baseUrl}/hr/onboard-employee", $employeeData);
             
             $result = $response->json();
@@ -135,10 +150,10 @@ class AIAgentService
     /**
      * Process leave request using HR agent
      */
-    public function processLeaveRequest(array $leaveData): array
+    public function processLeaveRequest(array $leaveData, ?string $idempotencyKey = null): array
     {
         try {
-            $response = Http::timeout($this->timeout)
+            $response = $this->idempotentRequest($idempotencyKey)
                 ->post("{$this->baseUrl}/hr/process-leave-request", $leaveData);
             
             $result = $response->json();